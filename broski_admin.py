@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+BROski$ Economy - Admin CLI
+Bulk seeding, migration and recovery for broski_economy.db without going
+through bot commands.
+
+Usage:
+  python broski_admin.py import users users.csv          # Upsert users (CSV or JSONL)
+  python broski_admin.py import transactions log.jsonl --replay
+  python broski_admin.py export transactions - --format jsonl   # Stream to stdout
+  python broski_admin.py replay                          # Rebuild balances from the log
+  python broski_admin.py maintain --archive-days 90      # Archive, ANALYZE, VACUUM
+"""
+
+import csv
+import json
+import sys
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional
+
+from broski_economy import DATABASE, BroskiDB, default_username
+
+# Rows per executemany/transaction when importing, and per fetch when exporting
+BATCH_SIZE = 50_000
+
+COLUMNS = {
+    "users": ("id", "username", "broski_balance", "lifetime_earned", "level",
+              "hyperfocus_hours", "task_count", "created_at"),
+    "transactions": ("id", "user_id", "amount", "reason", "task_type", "timestamp"),
+    "streaks": ("user_id", "current_streak", "longest_streak", "last_login"),
+}
+
+UPSERT_USER = """INSERT INTO users (id, username, broski_balance, lifetime_earned, level,
+                                    hyperfocus_hours, task_count, created_at)
+                 VALUES (?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+                 ON CONFLICT (id) DO UPDATE SET
+                     username = excluded.username, broski_balance = excluded.broski_balance,
+                     lifetime_earned = excluded.lifetime_earned, level = excluded.level,
+                     hyperfocus_hours = excluded.hyperfocus_hours, task_count = excluded.task_count"""
+IMPORT_TRANSACTION = """INSERT INTO transactions (id, user_id, amount, reason, task_type, timestamp)
+                        VALUES (?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))"""
+
+# Replay: per-user totals of the live log plus archived summaries, then one pass over users
+REPLAY_TOTALS = """CREATE TEMP TABLE replay_totals AS
+                   SELECT user_id, SUM(total) AS total, SUM(tasks) AS tasks FROM (
+                       SELECT user_id, SUM(amount) AS total, COUNT(*) AS tasks FROM transactions GROUP BY user_id
+                       UNION ALL
+                       SELECT user_id, SUM(total), SUM(count) FROM transaction_summaries GROUP BY user_id
+                   ) GROUP BY user_id"""
+REPLAY_INDEX = "CREATE UNIQUE INDEX temp.idx_replay_totals ON replay_totals (user_id)"
+REPLAY_MISSING_USERS = "SELECT user_id FROM replay_totals WHERE user_id NOT IN (SELECT id FROM users)"
+REPLAY_UPDATE = """UPDATE users SET
+                       broski_balance = COALESCE((SELECT total FROM replay_totals WHERE user_id = users.id), 0),
+                       lifetime_earned = COALESCE((SELECT total FROM replay_totals WHERE user_id = users.id), 0),
+                       task_count = COALESCE((SELECT tasks FROM replay_totals WHERE user_id = users.id), 0)"""
+
+
+# ===== FILE FORMATS =====
+def detect_format(path: str, fmt: Optional[str] = None) -> str:
+    if fmt:
+        return fmt
+    return "csv" if Path(path).suffix.lower() == ".csv" else "jsonl"
+
+
+def read_records(source: IO[str], fmt: str) -> Iterator[Dict[str, Any]]:
+    """Stream dict records from a CSV (with header) or JSONL file"""
+    if fmt == "csv":
+        for row in csv.DictReader(source):
+            # Empty CSV cells mean "use the default"
+            yield {key: (value if value != "" else None) for key, value in row.items()}
+    else:
+        for line in source:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _batches(rows: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _int(value: Any, default: int = 0) -> int:
+    return default if value is None else int(float(value))
+
+
+# ===== IMPORT =====
+def user_row(record: Dict[str, Any]) -> tuple:
+    user_id = str(record["id"])
+    return (
+        user_id,
+        record.get("username") or default_username(user_id),
+        _int(record.get("broski_balance")),
+        _int(record.get("lifetime_earned")),
+        _int(record.get("level"), 1),
+        float(record.get("hyperfocus_hours") or 0),
+        _int(record.get("task_count")),
+        record.get("created_at"),
+    )
+
+
+def transaction_row(record: Dict[str, Any]) -> tuple:
+    return (
+        _int(record["id"]) if record.get("id") is not None else None,  # None: assign a new id
+        str(record["user_id"]),
+        _int(record["amount"]),
+        record.get("reason"),
+        record.get("task_type") or "general",
+        record.get("timestamp"),
+    )
+
+
+def import_users(db: BroskiDB, records: Iterable[Dict[str, Any]], batch_size: int = BATCH_SIZE) -> int:
+    """Upsert users, ``batch_size`` rows per transaction; returns how many were written"""
+    count = 0
+    for batch in _batches(map(user_row, records), batch_size):
+        with db.transaction(immediate=True) as conn:
+            conn.executemany(UPSERT_USER, batch)
+        count += len(batch)
+    db.reset_caches()
+    return count
+
+
+def import_transactions(db: BroskiDB, records: Iterable[Dict[str, Any]], batch_size: int = BATCH_SIZE) -> int:
+    """
+    Append transactions to the audit trail, ``batch_size`` rows per transaction.
+    Balances are not touched; run ``replay_transactions`` to rebuild them.
+    """
+    count = 0
+    for batch in _batches(map(transaction_row, records), batch_size):
+        with db.transaction(immediate=True) as conn:
+            conn.executemany(IMPORT_TRANSACTION, batch)
+        count += len(batch)
+    db.reset_caches()
+    return count
+
+
+def replay_transactions(db: BroskiDB) -> int:
+    """
+    Rebuild every user's broski_balance, lifetime_earned and task_count from
+    the transaction log (including archived summaries), creating users that
+    only appear in the log. Users with no transactions are reset to zero.
+    Returns the number of users rebuilt.
+    """
+    db.flush()
+    with db.transaction(immediate=True) as conn:
+        conn.execute("DROP TABLE IF EXISTS temp.replay_totals")
+        conn.execute(REPLAY_TOTALS)
+        conn.execute(REPLAY_INDEX)
+        missing = [(user_id, default_username(user_id)) for (user_id,) in conn.execute(REPLAY_MISSING_USERS)]
+        conn.executemany("INSERT INTO users (id, username) VALUES (?, ?)", missing)
+        rebuilt = conn.execute(REPLAY_UPDATE).rowcount
+        conn.execute("DROP TABLE temp.replay_totals")
+    db.reset_caches()
+    return rebuilt
+
+
+# ===== EXPORT =====
+def export_table(db: BroskiDB, table: str, out: IO[str], fmt: str = "jsonl", batch_size: int = BATCH_SIZE) -> int:
+    """Stream ``table`` to ``out`` as CSV or JSONL without loading it into memory"""
+    columns = COLUMNS[table]
+    db.flush()
+    # A separate read-only connection: WAL gives it a stable snapshot while the bot keeps writing
+    conn = db.reader()
+    try:
+        cursor = conn.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY rowid")
+        writer = csv.writer(out) if fmt == "csv" else None
+        if writer is not None:
+            writer.writerow(columns)
+        count = 0
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return count
+            if writer is not None:
+                writer.writerows(rows)
+            else:
+                out.writelines(json.dumps(dict(zip(columns, row))) + "\n" for row in rows)
+            count += len(rows)
+    finally:
+        conn.close()
+
+
+# ===== CLI =====
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="BROski$ economy admin tools")
+    parser.add_argument("--db", default=DATABASE, help=f"Database file (default: {DATABASE})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    imp = sub.add_parser("import", help="Bulk-load users or transactions from CSV/JSONL")
+    imp.add_argument("table", choices=["users", "transactions"])
+    imp.add_argument("path", help="Input file, or - for stdin")
+    imp.add_argument("--format", choices=["csv", "jsonl"], help="Default: from the file extension")
+    imp.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    imp.add_argument("--replay", action="store_true", help="Rebuild balances after importing transactions")
+
+    exp = sub.add_parser("export", help="Stream a table to CSV/JSONL")
+    exp.add_argument("table", choices=sorted(COLUMNS))
+    exp.add_argument("path", help="Output file, or - for stdout")
+    exp.add_argument("--format", choices=["csv", "jsonl"], help="Default: from the file extension")
+
+    sub.add_parser("replay", help="Rebuild balances and lifetime totals from the transaction log")
+
+    maint = sub.add_parser("maintain", help="Archive old transactions, then ANALYZE and VACUUM")
+    maint.add_argument("--archive-days", type=int, default=None, help="Archive transactions older than N days")
+    maint.add_argument("--no-vacuum", action="store_true")
+
+    args = parser.parse_args(argv)
+    db = BroskiDB(args.db)
+    try:
+        if args.command == "import":
+            fmt = detect_format(args.path, args.format)
+            source = sys.stdin if args.path == "-" else open(args.path, newline="", encoding="utf-8")
+            try:
+                load = import_users if args.table == "users" else import_transactions
+                count = load(db, read_records(source, fmt), args.batch_size)
+            finally:
+                if source is not sys.stdin:
+                    source.close()
+            print(f"✅ Imported {count} {args.table}", file=sys.stderr)
+            if args.replay:
+                print(f"✅ Rebuilt {replay_transactions(db)} balances", file=sys.stderr)
+        elif args.command == "export":
+            fmt = detect_format(args.path, args.format)
+            out = sys.stdout if args.path == "-" else open(args.path, "w", newline="", encoding="utf-8")
+            try:
+                count = export_table(db, args.table, out, fmt)
+            finally:
+                if out is not sys.stdout:
+                    out.close()
+            print(f"✅ Exported {count} {args.table}", file=sys.stderr)
+        elif args.command == "replay":
+            print(f"✅ Rebuilt {replay_transactions(db)} balances", file=sys.stderr)
+        elif args.command == "maintain":
+            if args.archive_days is not None:
+                print(f"📦 Archived {db.archive_transactions(args.archive_days)} transactions", file=sys.stderr)
+            pages = db.maintenance(vacuum=not args.no_vacuum)
+            print(f"🧹 Pages: {pages['pages_before']} → {pages['pages_after']}", file=sys.stderr)
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,873 @@
+"""
+BROski$ Economy - Data Access Layer
+SQLite storage for the BROski$ bot, safe to call from async Discord handlers.
+
+One long-lived connection per database (WAL mode, so /balance and
+/leaderboard reads never wait for a reward being written), SQL kept as
+module constants so sqlite3's statement cache re-uses the prepared
+statements, and an async facade that runs every query on one dedicated DB
+thread instead of blocking the event loop.
+
+Optionally (``batch_rows > 0``) reward writes are buffered write-behind:
+transactions and balance deltas are kept in memory, mirrored to an
+append-only journal, and committed in batches with ``executemany``.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from broski_stats import EconomyStats
+
+DATABASE = "broski_economy.db"
+
+# ===== SCHEMA =====
+# Migration N brings a database from PRAGMA user_version N-1 to N. Never edit
+# a released migration; append a new one. Version 1 uses IF NOT EXISTS so
+# databases created before versioning (user_version 0) migrate in place.
+MIGRATIONS: Tuple[Tuple[str, ...], ...] = (
+    # 1: Original tables
+    (
+        # Users table
+        '''CREATE TABLE IF NOT EXISTS users (
+            id TEXT PRIMARY KEY,
+            username TEXT,
+            broski_balance INTEGER DEFAULT 0,
+            lifetime_earned INTEGER DEFAULT 0,
+            level INTEGER DEFAULT 1,
+            hyperfocus_hours FLOAT DEFAULT 0,
+            task_count INTEGER DEFAULT 0,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )''',
+        # Transactions table (audit trail)
+        '''CREATE TABLE IF NOT EXISTS transactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT,
+            amount INTEGER,
+            reason TEXT,
+            task_type TEXT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )''',
+        # Streaks table
+        '''CREATE TABLE IF NOT EXISTS streaks (
+            user_id TEXT PRIMARY KEY,
+            current_streak INTEGER DEFAULT 0,
+            longest_streak INTEGER DEFAULT 0,
+            last_login DATETIME,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )''',
+    ),
+    # 2: Leaderboard indexes and the write-behind checkpoint
+    (
+        # Leaderboard sort keys
+        "CREATE INDEX IF NOT EXISTS idx_users_balance ON users (broski_balance DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_users_lifetime ON users (lifetime_earned DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_streaks_current ON streaks (current_streak DESC)",
+        # Last write-behind journal entry committed (one row)
+        '''CREATE TABLE IF NOT EXISTS journal_checkpoint (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            seq INTEGER NOT NULL
+        )''',
+    ),
+    # 3: Covering indexes for the audit trail, and monthly summaries of archived transactions
+    (
+        "CREATE INDEX IF NOT EXISTS idx_transactions_user_time ON transactions (user_id, timestamp, amount)",
+        "CREATE INDEX IF NOT EXISTS idx_transactions_time ON transactions (timestamp)",
+        '''CREATE TABLE IF NOT EXISTS transaction_summaries (
+            user_id TEXT,
+            period TEXT,
+            task_type TEXT,
+            count INTEGER NOT NULL,
+            total INTEGER NOT NULL,
+            PRIMARY KEY (user_id, period, task_type)
+        )''',
+    ),
+)
+SCHEMA_VERSION = len(MIGRATIONS)
+
+# ===== STATEMENTS =====
+# Kept as constants: sqlite3 caches prepared statements by SQL text
+SELECT_USER = "SELECT * FROM users WHERE id = ?"
+INSERT_USER = "INSERT OR IGNORE INTO users (id, username) VALUES (?, ?)"
+CREDIT_USER = ("UPDATE users SET broski_balance = broski_balance + ?, lifetime_earned = lifetime_earned + ?, "
+               "task_count = task_count + 1 WHERE id = ?")
+INSERT_TRANSACTION = "INSERT INTO transactions (user_id, amount, reason, task_type) VALUES (?, ?, ?, ?)"
+SELECT_STREAK_ROW = "SELECT * FROM streaks WHERE user_id = ?"
+INSERT_STREAK = "INSERT INTO streaks (user_id, current_streak, longest_streak, last_login) VALUES (?, 1, 1, ?)"
+UPDATE_STREAK = "UPDATE streaks SET current_streak = ?, longest_streak = ?, last_login = ? WHERE user_id = ?"
+UPSERT_STREAK = """INSERT INTO streaks (user_id, current_streak, longest_streak, last_login) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(user_id) DO UPDATE SET current_streak = excluded.current_streak,
+                   longest_streak = excluded.longest_streak, last_login = excluded.last_login"""
+APPLY_DELTA = ("UPDATE users SET broski_balance = broski_balance + ?, lifetime_earned = lifetime_earned + ?, "
+               "task_count = task_count + ? WHERE id = ?")
+INSERT_TRANSACTION_AT = "INSERT INTO transactions (user_id, amount, reason, task_type, timestamp) VALUES (?, ?, ?, ?, ?)"
+SELECT_CHECKPOINT = "SELECT seq FROM journal_checkpoint WHERE id = 0"
+SET_CHECKPOINT = "INSERT OR REPLACE INTO journal_checkpoint (id, seq) VALUES (0, ?)"
+SELECT_EARNED_SINCE = "SELECT COALESCE(SUM(amount), 0) FROM transactions WHERE user_id = ? AND timestamp >= ?"
+ARCHIVE_TRANSACTIONS = """INSERT INTO transaction_summaries (user_id, period, task_type, count, total)
+                          SELECT user_id, strftime('%Y-%m', timestamp), COALESCE(task_type, ''), COUNT(*), SUM(amount)
+                          FROM transactions WHERE timestamp < ?
+                          GROUP BY user_id, strftime('%Y-%m', timestamp), COALESCE(task_type, '')
+                          ON CONFLICT (user_id, period, task_type)
+                          DO UPDATE SET count = count + excluded.count, total = total + excluded.total"""
+DELETE_ARCHIVED = "DELETE FROM transactions WHERE timestamp < ?"
+SELECT_BALANCES = "SELECT id, broski_balance FROM users WHERE broski_balance != 0"
+SELECT_POSITIVE_BALANCES = "SELECT broski_balance FROM users WHERE broski_balance > 0"
+
+LEADERBOARDS = {
+    "balance": "SELECT id, username, broski_balance FROM users ORDER BY broski_balance DESC LIMIT ?",
+    "lifetime": "SELECT id, username, lifetime_earned FROM users ORDER BY lifetime_earned DESC LIMIT ?",
+    "streak": """SELECT users.id, users.username, streaks.current_streak
+                 FROM users JOIN streaks ON users.id = streaks.user_id
+                 ORDER BY streaks.current_streak DESC LIMIT ?""",
+}
+# Users strictly ahead of the given user, counted on the sort key's index
+RANKS = {
+    "balance": "SELECT COUNT(*) FROM users WHERE broski_balance > (SELECT broski_balance FROM users WHERE id = ?)",
+    "lifetime": "SELECT COUNT(*) FROM users WHERE lifetime_earned > (SELECT lifetime_earned FROM users WHERE id = ?)",
+    "streak": """SELECT COUNT(*) FROM streaks WHERE current_streak >
+                 COALESCE((SELECT current_streak FROM streaks WHERE user_id = ?), 0)""",
+}
+
+# Transactions older than this are folded into monthly summaries by ``archive_transactions``
+ARCHIVE_AFTER_DAYS = 90
+
+# User and streak records are cached (LRU) up to this many each, for this long (seconds)
+RECORD_CACHE_SIZE = 4096
+RECORD_CACHE_TTL = 60.0
+
+# A BEGIN slower than this (seconds) counts as waiting for another connection's write lock
+BUSY_WAIT_THRESHOLD = 0.001
+
+# Leaderboards are cached this long (seconds), unless a reward invalidates them first
+LEADERBOARD_TTL = 30.0
+LEADERBOARD_SIZE = 10
+
+# Write-behind defaults: flush every 50 ms or 200 buffered rewards
+FLUSH_INTERVAL = 0.05
+BATCH_ROWS = 200
+
+# Reward tuning (neurodivergent-tuned)
+VARIETY_TASKS = ("doc", "art", "community")
+
+
+# ===== PURE HELPERS =====
+def default_username(user_id: str) -> str:
+    return f"User{user_id[-4:]}"
+
+
+def compute_reward(base: int, quality: float, task_type: str, current_streak: int) -> Tuple[int, Dict[str, float]]:
+    """Calculate final reward with multipliers, given the user's current streak"""
+    # Streak multiplier (capped at 2x after 10 days)
+    streak_mult = min(1.0 + (current_streak * 0.1), 2.0)
+
+    # Quality multiplier (0.5 - 1.5)
+    quality_mult = max(0.5, min(1.5, quality))
+
+    # Task type bonus for variety
+    task_bonus = 1.1 if task_type in VARIETY_TASKS else 1.0  # Encourage diversity
+
+    final = int(base * quality_mult * streak_mult * task_bonus)
+
+    return final, {
+        'base': base,
+        'quality_mult': round(quality_mult, 2),
+        'streak_mult': round(streak_mult, 2),
+        'task_bonus': round(task_bonus, 2),
+    }
+
+
+def next_streak(row: Optional[tuple], now: datetime) -> Tuple[int, int]:
+    """(current, longest) streak after a login at ``now``, given the stored streaks row"""
+    if not row:
+        return 1, 1
+    last_login = datetime.fromisoformat(str(row[3])).date()
+    today = now.date()
+    if last_login == today:
+        # Already logged in today
+        current_streak = row[1]
+    elif last_login == today - timedelta(days=1):
+        # Consecutive day, increment
+        current_streak = row[1] + 1
+    else:
+        # Broken streak, reset (but keep "comeback bonus")
+        current_streak = 1
+    return current_streak, max(row[2], current_streak)
+
+
+def fairness_from_balances(balances: List[int]) -> Dict[str, Any]:
+    """Gini coefficient and fairness stats for a list of positive balances"""
+    if not balances:
+        return {'gini': 0, 'median': 0, 'avg': 0, 'users': 0, 'total_broski': 0}
+
+    # Gini coefficient calculation
+    balances = sorted(balances)
+    n = len(balances)
+    total = sum(balances)
+    cumsum = sum((i + 1) * x for i, x in enumerate(balances))
+    gini = (2 * cumsum) / (n * total) - (n + 1) / n if total > 0 else 0
+
+    return {
+        'gini': round(gini, 3),
+        'median': balances[n // 2],
+        'avg': total // n,
+        'users': n,
+        'total_broski': total,
+    }
+
+
+def credit_row(user: tuple, amount: int, tasks: int) -> tuple:
+    """A users row after crediting ``amount`` BROski$ for ``tasks`` tasks"""
+    return user[:2] + (user[2] + amount, user[3] + amount) + user[4:6] + (user[6] + tasks,) + user[7:]
+
+
+def _sql_time(moment: datetime) -> str:
+    """``moment`` in the format of SQLite's CURRENT_TIMESTAMP"""
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+# ===== CACHE =====
+_MISSING = object()
+
+
+class RecordCache:
+    """
+    Bounded LRU cache whose entries also expire ``ttl`` seconds after they
+    were stored, with hit/miss counters. ``None`` is a cacheable value.
+    """
+
+    def __init__(self, maxsize: int = RECORD_CACHE_SIZE, ttl: float = RECORD_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = self.misses = self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()  # key -> (expiry, value)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any:
+        """The cached value, or ``_MISSING`` (counted as a miss)"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        if entry is not None:
+            del self._entries[key]  # Expired
+        self.misses += 1
+        return _MISSING
+
+    def put(self, key: str, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def update(self, key: str, func: Callable[[Any], Any]) -> None:
+        """Write-through: replace a cached value with ``func(value)``, keeping its expiry"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries[key] = (entry[0], func(entry[1]))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# ===== WRITE-BEHIND =====
+class WriteBehindBuffer:
+    """
+    Reward writes waiting to be committed, mirrored to an append-only journal.
+
+    Each entry is one JSON line holding a sequence number, a user, and an
+    optional transaction (amount, reason, task_type, timestamp) and/or streak
+    update. The journal is truncated once its entries are committed; entries
+    left in it after a crash are replayed on the next start.
+    """
+
+    def __init__(self, journal_path: Optional[str] = None, fsync: bool = False):
+        self.journal_path = journal_path
+        self.fsync = fsync
+        self.seq = 0
+        self.entries: List[Dict[str, Any]] = []
+        self.deltas: Dict[str, List[int]] = {}  # user -> [balance, lifetime, tasks]
+        self.streaks: Dict[str, Tuple[int, int, str]] = {}  # user -> (current, longest, last_login)
+        self._journal = open(journal_path, "a", encoding="utf-8") if journal_path else None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, entry: Dict[str, Any], journal: bool = True) -> None:
+        """Buffer ``entry``, appending it to the journal first unless it came from there"""
+        if journal and self._journal is not None:
+            self._journal.write(json.dumps(entry) + "\n")
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+        self.seq = max(self.seq, entry["seq"])
+        self.entries.append(entry)
+        user_id = entry["user_id"]
+        if entry.get("amount") is not None:
+            delta = self.deltas.setdefault(user_id, [0, 0, 0])
+            delta[0] += entry["amount"]
+            delta[1] += entry["amount"]
+            delta[2] += 1
+        if entry.get("streak"):
+            self.streaks[user_id] = tuple(entry["streak"])
+
+    def clear(self) -> None:
+        """Forget buffered entries (after they are committed) and truncate the journal"""
+        self.entries, self.deltas, self.streaks = [], {}, {}
+        if self._journal is not None:
+            self._journal.truncate(0)
+            self._journal.flush()
+
+    def read_journal(self) -> List[Dict[str, Any]]:
+        """Entries left in the journal, up to the first torn (partially written) line"""
+        if not self.journal_path or not os.path.exists(self.journal_path):
+            return []
+        entries = []
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+        return entries
+
+    def close(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+
+# ===== DATABASE =====
+class BroskiDB:
+    """
+    Long-lived SQLite connection for the economy database.
+
+    The connection is opened lazily in WAL mode and shared; a lock keeps
+    calls from different threads from interleaving. Writes run in explicit
+    transactions (see ``transaction``), everything else in autocommit.
+
+    User and streak rows are cached (``cache_size``, ``cache_ttl``) and kept
+    current by write-through; writes from other connections show up once
+    the cached rows expire.
+
+    With ``batch_rows > 0`` rewards are written behind: they are journaled
+    to ``journal`` (default ``<path>.writebehind``) and buffered, then
+    committed every ``flush_interval`` seconds or ``batch_rows`` entries,
+    and on ``close``. Reads see buffered rewards (read-your-writes).
+    """
+
+    def __init__(self, path: str = DATABASE, timeout: float = 30.0, batch_rows: int = 0,
+                 flush_interval: float = FLUSH_INTERVAL, journal: Optional[str] = None,
+                 journal_fsync: bool = False, leaderboard_ttl: float = LEADERBOARD_TTL,
+                 cache_size: int = RECORD_CACHE_SIZE, cache_ttl: float = RECORD_CACHE_TTL):
+        self.path = path
+        self.timeout = timeout
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self.journal = journal or (f"{path}.writebehind" if batch_rows > 0 and path != ":memory:" else None)
+        self.journal_fsync = journal_fsync
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._buffer: Optional[WriteBehindBuffer] = None
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        # Waits for this object's lock (other threads) and SQLite's write lock (other connections)
+        self.contention: Dict[str, float] = {'lock_waits': 0, 'lock_wait_s': 0.0, 'busy_waits': 0, 'busy_wait_s': 0.0}
+        self._stats: Optional[EconomyStats] = None
+        self._stats_version: Optional[int] = None
+        self.leaderboard_ttl = leaderboard_ttl
+        self._users = RecordCache(cache_size, cache_ttl)  # id -> users row
+        self._streaks = RecordCache(cache_size, cache_ttl)  # id -> streaks row, or None if there is none
+        self._leaderboards: Dict[str, Tuple[float, int, List[tuple]]] = {}  # mode -> (expiry, limit, rows)
+        self._leaderboards_version: Optional[int] = None
+
+    def connect(self) -> sqlite3.Connection:
+        """Open (once) and return the shared connection"""
+        with self._lock:
+            if self._conn is None:
+                conn = sqlite3.connect(
+                    self.path,
+                    timeout=self.timeout,
+                    isolation_level=None,  # Autocommit; transactions are explicit
+                    check_same_thread=False,  # Guarded by self._lock
+                    cached_statements=256,
+                )
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, one fsync per checkpoint
+                conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+                self._conn = conn
+                self.init_db()
+                if self.batch_rows > 0:
+                    self._start_write_behind()
+            return self._conn
+
+    def reader(self) -> sqlite3.Connection:
+        """A new read-only connection for long scans such as exports; the caller closes it"""
+        self.connect()  # Make sure the database and schema exist
+        uri = Path(self.path).resolve().as_uri() + "?mode=ro"
+        return sqlite3.connect(uri, uri=True, timeout=self.timeout, check_same_thread=False)
+
+    def close(self) -> None:
+        """Flush buffered rewards and close the connection"""
+        if self._flusher is not None:
+            self._stop.set()
+            self._flusher.join()
+            self._flusher = None
+        with self._lock:
+            if self._buffer is not None:
+                if self._conn is not None:
+                    self.flush()
+                self._buffer.close()
+                self._buffer = None
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @contextmanager
+    def transaction(self, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        Run a block in one transaction; ``immediate`` takes the write lock up
+        front so read-then-write sequences cannot race other writers.
+        """
+        if not self._lock.acquire(blocking=False):
+            started = time.perf_counter()
+            self._lock.acquire()
+            self.contention['lock_waits'] += 1
+            self.contention['lock_wait_s'] += time.perf_counter() - started
+        try:
+            conn = self.connect()
+            started = time.perf_counter()
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            waited = time.perf_counter() - started
+            if waited > BUSY_WAIT_THRESHOLD:
+                # Another connection held SQLite's write lock
+                self.contention['busy_waits'] += 1
+                self.contention['busy_wait_s'] += waited
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            self._lock.release()
+
+    def init_db(self) -> int:
+        """Bring the schema up to date (see ``MIGRATIONS``); returns the schema version"""
+        with self.transaction(immediate=True) as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise RuntimeError(
+                    f"{self.path} has schema version {version}; this code only knows up to {SCHEMA_VERSION}"
+                )
+            for migration in MIGRATIONS[version:]:
+                for statement in migration:
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        return SCHEMA_VERSION
+
+    # ----- Write-behind -----
+    def _buffered(self) -> bool:
+        self.connect()
+        return self._buffer is not None
+
+    def _start_write_behind(self) -> None:
+        self._buffer = WriteBehindBuffer(self.journal, self.journal_fsync)
+        row = self._conn.execute(SELECT_CHECKPOINT).fetchone()
+        self._buffer.seq = row[0] if row else 0
+        # Replay entries journaled but not committed before a crash
+        committed = self._buffer.seq
+        for entry in self._buffer.read_journal():
+            if entry["seq"] > committed:
+                self._buffer.add(entry, journal=False)
+        self.flush()
+        self._buffer.clear()
+        self._stop.clear()
+        self._flusher = threading.Thread(target=self._flush_loop, name="broski-flush", daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self._try_flush()
+
+    def _try_flush(self) -> None:
+        """Flush, or leave the entries buffered and journaled for the next attempt"""
+        try:
+            self.flush()
+        except sqlite3.OperationalError:
+            pass  # Database busy; retried on the next tick
+        except Exception as e:
+            # Keep the flusher alive: close() still flushes, and the journal replays on restart
+            print(f"⚠️ BROski$ write-behind flush failed: {e!r}", file=sys.stderr)
+
+    def _enqueue(self, user_id: str, amount: Optional[int] = None, reason: Optional[str] = None,
+                 task_type: Optional[str] = None, streak: Optional[Tuple[int, int, datetime]] = None) -> None:
+        entry: Dict[str, Any] = {"seq": self._buffer.seq + 1, "user_id": user_id}
+        if amount is not None:
+            entry.update(amount=amount, reason=reason, task_type=task_type,
+                         timestamp=time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()))  # As CURRENT_TIMESTAMP
+        self._changed(user_id, amount or 0)
+        if streak is not None:
+            entry["streak"] = [streak[0], streak[1], str(streak[2])]
+        self._buffer.add(entry)
+        if len(self._buffer) >= self.batch_rows:
+            # The entry is journaled already: failing the command now would pay a retry twice
+            self._try_flush()
+
+    def flush(self) -> int:
+        """Commit buffered rewards with ``executemany``; returns how many entries were written"""
+        with self._lock:
+            buffer = self._buffer
+            if not buffer:
+                return 0
+            with self.transaction(immediate=True) as conn:
+                users = sorted({entry["user_id"] for entry in buffer.entries})
+                conn.executemany(INSERT_USER, [(user_id, default_username(user_id)) for user_id in users])
+                conn.executemany(APPLY_DELTA, [(balance, lifetime, tasks, user_id)
+                                               for user_id, (balance, lifetime, tasks) in buffer.deltas.items()])
+                conn.executemany(INSERT_TRANSACTION_AT, [
+                    (entry["user_id"], entry["amount"], entry["reason"], entry["task_type"], entry["timestamp"])
+                    for entry in buffer.entries if entry.get("amount") is not None
+                ])
+                conn.executemany(UPSERT_STREAK, [(user_id, current, longest, last_login)
+                                                 for user_id, (current, longest, last_login) in buffer.streaks.items()])
+                conn.execute(SET_CHECKPOINT, (buffer.seq,))
+            for user_id, (balance, _, tasks) in buffer.deltas.items():
+                self._users.update(user_id, lambda user: credit_row(user, balance, tasks))
+            for user_id, streak in buffer.streaks.items():
+                self._streaks.put(user_id, (user_id,) + streak)
+            written = len(buffer)
+            buffer.clear()
+            return written
+
+    def _streak_row(self, conn: sqlite3.Connection, user_id: str) -> Optional[tuple]:
+        """The user's streaks row, including a buffered (not yet committed) update"""
+        if self._buffer is not None and user_id in self._buffer.streaks:
+            return (user_id,) + self._buffer.streaks[user_id]
+        row = self._streaks.get(user_id)
+        if row is _MISSING:
+            row = conn.execute(SELECT_STREAK_ROW, (user_id,)).fetchone()
+            self._streaks.put(user_id, row)
+        return row
+
+    # ----- Users -----
+    def get_user(self, user_id: str) -> tuple:
+        """Get or create user in database"""
+        with self._lock:
+            conn = self.connect()
+            user = self._users.get(user_id)
+            if user is _MISSING:
+                user = conn.execute(SELECT_USER, (user_id,)).fetchone()
+                if user is None:
+                    conn.execute(INSERT_USER, (user_id, default_username(user_id)))
+                    user = conn.execute(SELECT_USER, (user_id,)).fetchone()
+                self._users.put(user_id, user)
+            if self._buffer is not None and user_id in self._buffer.deltas:
+                balance, _, tasks = self._buffer.deltas[user_id]
+                user = credit_row(user, balance, tasks)
+            return user
+
+    def add_broski(self, user_id: str, amount: int, reason: str, task_type: str = "general") -> None:
+        """Add BROski$ to user account with transaction logging"""
+        with self._lock:
+            if self._buffered():
+                self._enqueue(user_id, amount, reason, task_type)
+                return
+            with self.transaction() as conn:
+                conn.execute(INSERT_USER, (user_id, default_username(user_id)))
+                conn.execute(CREDIT_USER, (amount, amount, user_id))
+                conn.execute(INSERT_TRANSACTION, (user_id, amount, reason, task_type))
+            self._users.update(user_id, lambda user: credit_row(user, amount, 1))
+            self._changed(user_id, amount)
+
+    # ----- Streaks -----
+    def update_streak(self, user_id: str, now: Optional[datetime] = None) -> Tuple[int, int]:
+        """Update user's streak (called on daily login); returns (current, longest)"""
+        now = now or datetime.now()
+        with self._lock:
+            if self._buffered():
+                current, longest = next_streak(self._streak_row(self._conn, user_id), now)
+                self._enqueue(user_id, streak=(current, longest, now))
+                return current, longest
+        with self.transaction(immediate=True) as conn:
+            row = conn.execute(SELECT_STREAK_ROW, (user_id,)).fetchone()
+            current, longest = next_streak(row, now)
+            if row is None:
+                conn.execute(INSERT_STREAK, (user_id, now))
+            else:
+                conn.execute(UPDATE_STREAK, (current, longest, now, user_id))
+            self._streaks.put(user_id, (user_id, current, longest, str(now)))
+            self._changed(user_id)
+        return current, longest
+
+    def get_streak(self, user_id: str) -> tuple:
+        """Get user's streak info (current, longest)"""
+        with self._lock:
+            row = self._streak_row(self.connect(), user_id)
+        return row[1:3] if row else (0, 0)
+
+    def calculate_reward(self, base: int, quality: float, task_type: str, user_id: str) -> Tuple[int, Dict[str, float]]:
+        """Calculate final reward with multipliers (neurodivergent-tuned)"""
+        current_streak, _ = self.get_streak(user_id)
+        return compute_reward(base, quality, task_type, current_streak)
+
+    # ----- Rewards -----
+    def complete_task(self, user_id: str, base: int, quality: float, task_type: str,
+                      reason: Optional[str] = None, now: Optional[datetime] = None) -> Tuple[int, Dict[str, float], int]:
+        """
+        Reward a completed task atomically: read the streak, compute the
+        multipliers, credit the balance, log the transaction and record the
+        day's login in one ``BEGIN IMMEDIATE`` transaction (one commit), or
+        as one journaled write-behind entry.
+        Returns (final reward, breakdown, current streak after the login).
+        """
+        now = now or datetime.now()
+        reason = reason or f"Task completion: {task_type}"
+        with self._lock:
+            if self._buffered():
+                row = self._streak_row(self._conn, user_id)
+                final, breakdown = compute_reward(base, quality, task_type, row[1] if row else 0)
+                current, longest = next_streak(row, now)
+                self._enqueue(user_id, final, reason, task_type, streak=(current, longest, now))
+                return final, breakdown, current
+            with self.transaction(immediate=True) as conn:
+                conn.execute(INSERT_USER, (user_id, default_username(user_id)))
+                row = conn.execute(SELECT_STREAK_ROW, (user_id,)).fetchone()
+                # The multiplier uses the streak as it stood before this login
+                final, breakdown = compute_reward(base, quality, task_type, row[1] if row else 0)
+                current, longest = next_streak(row, now)
+                conn.execute(CREDIT_USER, (final, final, user_id))
+                conn.execute(INSERT_TRANSACTION, (user_id, final, reason, task_type))
+                conn.execute(UPSERT_STREAK, (user_id, current, longest, now))
+            self._users.update(user_id, lambda user: credit_row(user, final, 1))
+            self._streaks.put(user_id, (user_id, current, longest, str(now)))
+            self._changed(user_id, final)
+        return final, breakdown, current
+
+    # ----- Economy -----
+    def _changed(self, user_id: str, delta: int = 0) -> None:
+        # Called (under the lock) for every reward or streak change made through this connection
+        self._leaderboards.clear()
+        if self._stats is not None:
+            self._stats.apply(user_id, delta)
+
+    def economy_stats(self) -> EconomyStats:
+        """
+        Running fairness aggregates. Built from one scan, then kept current by
+        the reward pipeline; rebuilt only if another connection has written
+        to the database since (``PRAGMA data_version``).
+        """
+        with self._lock:
+            version = self.connect().execute("PRAGMA data_version").fetchone()[0]
+            if self._stats is None or version != self._stats_version:
+                balances = dict(self._conn.execute(SELECT_BALANCES).fetchall())
+                if self._buffer is not None:
+                    for user_id, (delta, _, _) in self._buffer.deltas.items():
+                        balances[user_id] = balances.get(user_id, 0) + delta
+                self._stats = EconomyStats(balances.items())
+                self._stats_version = version
+            return self._stats
+
+    def get_fairness_metrics(self) -> Dict[str, Any]:
+        """Gini coefficient and fairness stats, from the running aggregates"""
+        with self._lock:
+            return self.economy_stats().metrics()
+
+    def scan_fairness_metrics(self) -> Dict[str, Any]:
+        """Calculate Gini coefficient and fairness stats with a full table scan"""
+        with self._lock:
+            self.flush()
+            balances = [row[0] for row in self.connect().execute(SELECT_POSITIVE_BALANCES)]
+        return fairness_from_balances(balances)
+
+    # ----- Audit trail -----
+    def earned_since(self, user_id: str, since: datetime) -> int:
+        """BROski$ earned by ``user_id`` since ``since`` (UTC), answered from the covering index"""
+        with self._lock:
+            self.flush()
+            return self.connect().execute(SELECT_EARNED_SINCE, (user_id, _sql_time(since))).fetchone()[0]
+
+    def archive_transactions(self, older_than_days: int = ARCHIVE_AFTER_DAYS, now: Optional[datetime] = None) -> int:
+        """
+        Fold transactions older than ``older_than_days`` into per-user, per-month,
+        per-task-type summary rows and delete them; returns how many were archived.
+        Balances and lifetime totals are unaffected.
+        """
+        cutoff = _sql_time((now or datetime.now(timezone.utc)) - timedelta(days=older_than_days))
+        with self._lock:
+            self.flush()
+            with self.transaction(immediate=True) as conn:
+                conn.execute(ARCHIVE_TRANSACTIONS, (cutoff,))
+                return conn.execute(DELETE_ARCHIVED, (cutoff,)).rowcount
+
+    def maintenance(self, vacuum: bool = True) -> Dict[str, int]:
+        """
+        Refresh query planner statistics (ANALYZE), checkpoint the WAL and
+        optionally VACUUM to return archived space; returns page counts.
+        """
+        with self._lock:
+            self.flush()
+            conn = self.connect()
+            before = conn.execute("PRAGMA page_count").fetchone()[0]
+            conn.execute("ANALYZE")
+            if vacuum:
+                conn.execute("VACUUM")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            after = conn.execute("PRAGMA page_count").fetchone()[0]
+        return {'pages_before': before, 'pages_after': after}
+
+    def reset_caches(self) -> None:
+        """Drop cached records, leaderboards and stats after bulk changes to the database"""
+        with self._lock:
+            self._users.clear()
+            self._streaks.clear()
+            self._leaderboards.clear()
+            self._stats = None
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit-rate statistics of the user and streak record caches"""
+        with self._lock:
+            return {'users': self._users.stats(), 'streaks': self._streaks.stats()}
+
+    # ----- Leaderboards -----
+    def leaderboard(self, sort_by: str = "balance", limit: int = LEADERBOARD_SIZE) -> List[tuple]:
+        """
+        Top ``limit`` (id, username, value) rows for balance, lifetime or streak.
+        Served from a short-TTL cache, dropped on every reward made through this
+        connection and whenever another connection writes.
+        """
+        sort_by = sort_by if sort_by in LEADERBOARDS else "balance"
+        with self._lock:
+            version = self.connect().execute("PRAGMA data_version").fetchone()[0]
+            if version != self._leaderboards_version:
+                self._leaderboards.clear()
+                self._leaderboards_version = version
+            now = time.monotonic()
+            cached = self._leaderboards.get(sort_by)
+            if cached is not None and cached[0] > now and cached[1] >= limit:
+                return cached[2][:limit]
+            self.flush()
+            size = max(limit, LEADERBOARD_SIZE)
+            rows = self._conn.execute(LEADERBOARDS[sort_by], (size,)).fetchall()
+            self._leaderboards[sort_by] = (now + self.leaderboard_ttl, size, rows)
+            return rows[:limit]
+
+    def rank(self, user_id: str, sort_by: str = "balance") -> int:
+        """1-based leaderboard position of ``user_id`` (tied users share a rank)"""
+        sort_by = sort_by if sort_by in RANKS else "balance"
+        with self._lock:
+            if sort_by == "balance":
+                balance = self.get_user(user_id)[2]
+                if balance > 0:
+                    # O(log n) from the order-statistics tree, no query at all
+                    tree = self.economy_stats().tree
+                    return 1 + len(tree) - tree.prefix(balance, inclusive=True)[0]
+            self.flush()
+            return 1 + self.connect().execute(RANKS[sort_by], (user_id,)).fetchone()[0]
+
+
+class AsyncBroskiDB:
+    """
+    Async facade over ``BroskiDB`` for Discord command handlers.
+
+    Every call runs on a single dedicated DB thread, so the event loop never
+    blocks on SQLite and calls reach the database in the order they were made.
+    """
+
+    def __init__(self, db: Any = DATABASE):
+        self.db = db if isinstance(db, BroskiDB) else BroskiDB(db)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="broski-db")
+        # Time calls spent queued for the DB thread (updated on that thread)
+        self.calls = 0
+        self.queue_wait_s = 0.0
+        self.max_queue_wait_s = 0.0
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``func(*args, **kwargs)`` on the DB thread"""
+        submitted = time.perf_counter()
+
+        def call() -> Any:
+            waited = time.perf_counter() - submitted
+            self.calls += 1
+            self.queue_wait_s += waited
+            self.max_queue_wait_s = max(self.max_queue_wait_s, waited)
+            return func(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, call)
+
+    async def init_db(self) -> int:
+        return await self.run(self.db.init_db)
+
+    async def get_user(self, user_id: str) -> tuple:
+        return await self.run(self.db.get_user, user_id)
+
+    async def add_broski(self, user_id: str, amount: int, reason: str, task_type: str = "general") -> None:
+        await self.run(self.db.add_broski, user_id, amount, reason, task_type)
+
+    async def update_streak(self, user_id: str) -> Tuple[int, int]:
+        return await self.run(self.db.update_streak, user_id)
+
+    async def get_streak(self, user_id: str) -> tuple:
+        return await self.run(self.db.get_streak, user_id)
+
+    async def calculate_reward(self, base: int, quality: float, task_type: str, user_id: str) -> Tuple[int, Dict[str, float]]:
+        return await self.run(self.db.calculate_reward, base, quality, task_type, user_id)
+
+    async def complete_task(self, user_id: str, base: int, quality: float, task_type: str,
+                            reason: Optional[str] = None) -> Tuple[int, Dict[str, float], int]:
+        return await self.run(self.db.complete_task, user_id, base, quality, task_type, reason)
+
+    async def flush(self) -> int:
+        return await self.run(self.db.flush)
+
+    async def get_fairness_metrics(self) -> Dict[str, Any]:
+        return await self.run(self.db.get_fairness_metrics)
+
+    async def leaderboard(self, sort_by: str = "balance", limit: int = LEADERBOARD_SIZE) -> List[tuple]:
+        return await self.run(self.db.leaderboard, sort_by, limit)
+
+    async def archive_transactions(self, older_than_days: int = ARCHIVE_AFTER_DAYS) -> int:
+        return await self.run(self.db.archive_transactions, older_than_days)
+
+    async def maintenance(self, vacuum: bool = True) -> Dict[str, int]:
+        return await self.run(self.db.maintenance, vacuum)
+
+    async def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        return await self.run(self.db.cache_stats)
+
+    async def rank(self, user_id: str, sort_by: str = "balance") -> int:
+        return await self.run(self.db.rank, user_id, sort_by)
+
+    def close(self) -> None:
+        """Finish queued calls, stop the DB thread and close the connection"""
+        self._executor.shutdown(wait=True)
+        self.db.close()
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+BROski$ Bot - Load-Test Harness
+Drives the real bot commands against a temporary database, with a fake
+``commands.Context`` whose ``send`` collects embeds instead of calling
+Discord, and reports per-command latency percentiles and DB contention.
+
+If discord.py is not installed, a minimal stand-in module (Embed, Color,
+Intents, commands.Bot) is registered so ``broski_bot`` can be imported.
+
+Usage:
+  python broski_loadtest.py                              # 2000 ops, 50 concurrent
+  python broski_loadtest.py --ops 20000 --concurrency 200 --batch-rows 0
+  python broski_loadtest.py --writers 2 --json           # Add competing connections
+  python broski_loadtest.py --guilds 8                   # One database per guild
+  python broski_loadtest.py --max-p99-ms 50              # Exit 1 if any p99 is slower
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import types
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from broski_economy import BroskiDB
+from broski_shards import ShardRouter
+
+try:
+    import discord  # noqa: F401
+    DISCORD_AVAILABLE = True
+except ImportError:
+    DISCORD_AVAILABLE = False
+
+COMMANDS = ("balance", "complete", "leaderboard", "stats")
+DEFAULT_MIX = {"balance": 4, "complete": 4, "leaderboard": 1, "stats": 1}
+TASK_TYPES = ("code", "doc", "art", "community")
+
+
+# ===== DISCORD STAND-IN =====
+def install_discord_stand_in() -> None:
+    """Register minimal ``discord`` and ``discord.ext.commands`` modules"""
+    discord_module = types.ModuleType("discord")
+    ext = types.ModuleType("discord.ext")
+    commands = types.ModuleType("discord.ext.commands")
+
+    class Intents:
+        @classmethod
+        def default(cls) -> "Intents":
+            return cls()
+
+    class Color:
+        def __init__(self, value: int = 0):
+            self.value = value
+
+    for name, value in {"green": 0x2ECC71, "gold": 0xF1C40F, "blue": 0x3498DB, "purple": 0x9B59B6,
+                        "blurple": 0x5865F2, "dark_grey": 0x607D8B}.items():
+        setattr(Color, name, classmethod(lambda cls, value=value: cls(value)))
+
+    class Embed:
+        def __init__(self, title: Optional[str] = None, description: Optional[str] = None, color: Any = None):
+            self.title = title
+            self.description = description
+            self.color = color
+            self.fields: List[Dict[str, Any]] = []
+            self.footer: Optional[str] = None
+
+        def add_field(self, name: str, value: Any, inline: bool = True) -> "Embed":
+            self.fields.append({"name": name, "value": str(value), "inline": inline})
+            return self
+
+        def set_footer(self, text: str) -> "Embed":
+            self.footer = text
+            return self
+
+    class Bot:
+        def __init__(self, command_prefix: str = "/", intents: Any = None):
+            self.command_prefix = command_prefix
+            self.intents = intents
+            self.user = "BROski$ stand-in"
+            self.all_commands: Dict[str, Any] = {}
+
+        def command(self, name: Optional[str] = None):
+            def register(func):
+                self.all_commands[name or func.__name__] = func
+                return func
+            return register
+
+        def event(self, func):
+            return func
+
+        def run(self, token: str) -> None:
+            raise RuntimeError("The discord stand-in cannot connect to Discord")
+
+    def has_permissions(**perms):
+        return lambda func: func
+
+    def is_owner():
+        return lambda func: func
+
+    discord_module.Intents, discord_module.Color, discord_module.Embed = Intents, Color, Embed
+    commands.Bot, commands.has_permissions, commands.is_owner = Bot, has_permissions, is_owner
+    discord_module.ext, ext.commands = ext, commands
+    sys.modules.update({"discord": discord_module, "discord.ext": ext, "discord.ext.commands": commands})
+
+
+def load_bot() -> types.ModuleType:
+    """Import ``broski_bot``, with the stand-in when discord.py is missing"""
+    if not DISCORD_AVAILABLE and "discord" not in sys.modules:
+        install_discord_stand_in()
+    import broski_bot
+    return broski_bot
+
+
+# ===== FAKE CONTEXT =====
+@dataclass
+class FakeAuthor:
+    id: int
+    name: str
+
+
+@dataclass
+class FakeGuild:
+    id: int
+
+
+class EmbedSink:
+    """Everything the bot sent, counted by embed title (or plain message)"""
+
+    def __init__(self):
+        self.count = 0
+        self.titles: Counter = Counter()
+        self.last: Any = None
+
+    def send(self, content: Any = None, embed: Any = None) -> None:
+        self.count += 1
+        message = embed if embed is not None else content
+        self.titles[getattr(message, "title", None) or str(message)[:40]] += 1
+        self.last = message
+
+
+class FakeContext:
+    """The parts of ``commands.Context`` the bot commands use"""
+
+    def __init__(self, author: FakeAuthor, sink: EmbedSink, guild: Optional[FakeGuild] = None):
+        self.author = author
+        self.guild = guild
+        self.sink = sink
+
+    async def send(self, content: Any = None, *, embed: Any = None) -> None:
+        self.sink.send(content, embed)
+
+
+# ===== HARNESS =====
+def percentile(ordered: List[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * p // 100))  # ceil(n * p / 100)
+    return ordered[int(rank) - 1]
+
+
+@dataclass
+class LoadTestConfig:
+    ops: int = 2000
+    concurrency: int = 50
+    users: int = 200
+    mix: Dict[str, int] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    batch_rows: int = 200
+    writers: int = 0  # Extra connections rewarding users from other threads
+    guilds: int = 0  # Spread users over this many guilds, one database each (0: one shared database)
+    seed: int = 0
+    database: Optional[str] = None  # Default: a temporary file
+
+
+def _competing_writer(path: str, users: int, stop: threading.Event, seed: int) -> int:
+    db = BroskiDB(path, cache_size=0)
+    rng = random.Random(seed)
+    count = 0
+    try:
+        while not stop.is_set():
+            db.complete_task(str(rng.randrange(users)), 30, 1.0, "community")
+            count += 1
+    finally:
+        db.close()
+    return count
+
+
+async def _drive(bot: types.ModuleType, config: LoadTestConfig, sink: EmbedSink) -> Dict[str, List[float]]:
+    rng = random.Random(config.seed)
+    names = [name for name in COMMANDS if config.mix.get(name)]
+    weights = [config.mix[name] for name in names]
+    callbacks = {name: getattr(bot, attr) for name, attr in
+                 (("balance", "balance"), ("complete", "complete_task"),
+                  ("leaderboard", "leaderboard"), ("stats", "stats"))}
+    callbacks = {name: getattr(cb, "callback", cb) for name, cb in callbacks.items()}  # discord.py Command
+    plan = [(rng.choices(names, weights)[0], rng.randrange(config.users), rng.random()) for _ in range(config.ops)]
+    guilds = [FakeGuild(9_000 + i) for i in range(config.guilds)]
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    semaphore = asyncio.Semaphore(config.concurrency)
+
+    async def one(command: str, user: int, roll: float) -> None:
+        guild = guilds[user % len(guilds)] if guilds else None
+        ctx = FakeContext(FakeAuthor(10_000 + user, f"user{user}"), sink, guild)
+        if command == "complete":
+            args = (TASK_TYPES[int(roll * len(TASK_TYPES))], 0.5 + roll)
+        elif command == "leaderboard":
+            args = (("balance", "lifetime", "streak")[int(roll * 3)],)
+        else:
+            args = ()
+        async with semaphore:
+            started = time.perf_counter()
+            await callbacks[command](ctx, *args)
+            latencies[command].append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one(*op) for op in plan))
+    return latencies
+
+
+def run_load_test(config: LoadTestConfig) -> Dict[str, Any]:
+    """Run the configured mix once and return the report"""
+    bot = load_bot()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = config.database or os.path.join(tmp, "loadtest.db")
+        router = ShardRouter(os.path.join(tmp, "shards") if config.guilds else None, path,
+                             batch_rows=config.batch_rows)
+        previous = bot.router, bot.db
+        bot.router, bot.db = router, router.default
+        stop = threading.Event()
+        writers = [threading.Thread(target=_competing_writer, args=(path, config.users, stop, config.seed + i))
+                   for i in range(config.writers)]
+        sink = EmbedSink()
+        try:
+            bot.db.db.init_db()
+            for writer in writers:
+                writer.start()
+            started = time.perf_counter()
+            latencies = asyncio.run(_drive(bot, config, sink))
+            elapsed = time.perf_counter() - started
+        finally:
+            stop.set()
+            for writer in writers:
+                writer.join()
+            shards = list(router.open_shards().values())
+            bot.router, bot.db = previous
+            router.close()
+
+    report: Dict[str, Any] = {"ops": config.ops, "concurrency": config.concurrency,
+                              "elapsed_s": round(elapsed, 3), "ops_per_s": round(config.ops / elapsed, 1),
+                              "messages": sink.count, "commands": {}}
+    for name, samples in latencies.items():
+        ordered = sorted(samples)
+        report["commands"][name] = {
+            "count": len(ordered),
+            **{f"p{p}_ms": round(percentile(ordered, p) * 1000, 3) for p in (50, 95, 99)},
+            "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        }
+    # Summed over shards (one with --guilds 0)
+    contention = Counter()
+    for shard in shards:
+        contention.update(shard.db.contention)
+    calls = sum(shard.calls for shard in shards)
+    report["contention"] = {
+        **{key: round(value, 4) if isinstance(value, float) else value for key, value in contention.items()},
+        "shards": len(shards),
+        "db_calls": calls,
+        "queue_wait_avg_ms": round(sum(shard.queue_wait_s for shard in shards) / calls * 1000, 3) if calls else 0.0,
+        "queue_wait_max_ms": round(max((shard.max_queue_wait_s for shard in shards), default=0.0) * 1000, 3),
+    }
+    caches = [cache for shard in shards for cache in shard.db.cache_stats().values()]
+    hits = sum(cache["hits"] for cache in caches)
+    lookups = hits + sum(cache["misses"] for cache in caches)
+    report["cache_hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"🚀 {report['ops']} ops @ {report['concurrency']} concurrent: "
+          f"{report['elapsed_s']}s ({report['ops_per_s']} ops/s)")
+    print(f"{'command':<12}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, row in report["commands"].items():
+        print(f"{name:<12}{row['count']:>7}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}{row['max_ms']:>10}")
+    c = report["contention"]
+    print(f"🔒 Lock waits: {c['lock_waits']} ({c['lock_wait_s']}s), SQLite busy waits: {c['busy_waits']} "
+          f"({c['busy_wait_s']}s), DB queue wait avg/max: {c['queue_wait_avg_ms']}/{c['queue_wait_max_ms']} ms")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load-test the BROski$ bot commands locally")
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--mix", default=",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()),
+                        help="Command weights, e.g. balance=4,complete=4,leaderboard=1,stats=1")
+    parser.add_argument("--batch-rows", type=int, default=200, help="Write-behind batch (0 = commit every reward)")
+    parser.add_argument("--writers", type=int, default=0, help="Competing writer connections")
+    parser.add_argument("--guilds", type=int, default=0, help="Guilds, one database each (0 = shared database)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", default=None, help="Database file (default: a temporary file)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--max-p99-ms", type=float, default=None, help="Fail if any command's p99 is slower")
+    args = parser.parse_args(argv)
+
+    mix = {name: int(weight) for name, weight in (item.split("=") for item in args.mix.split(","))}
+    unknown = set(mix) - set(COMMANDS)
+    if unknown:
+        parser.error(f"unknown commands in --mix: {', '.join(sorted(unknown))}")
+    report = run_load_test(LoadTestConfig(
+        ops=args.ops, concurrency=args.concurrency, users=args.users, mix=mix,
+        batch_rows=args.batch_rows, writers=args.writers, guilds=args.guilds, seed=args.seed, database=args.db,
+    ))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    if args.max_p99_ms is not None:
+        slow = [name for name, row in report["commands"].items() if row["p99_ms"] > args.max_p99_ms]
+        if slow:
+            print(f"❌ p99 over {args.max_p99_ms} ms: {', '.join(slow)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+BROski$ Economy - Per-Guild Sharding
+Routes each guild to its own SQLite database file, so a busy guild only
+contends for its own write lock.
+
+Every open shard is a ``BroskiDB`` with its own connection, caches and DB
+thread (``AsyncBroskiDB``); at most ``max_open`` guild shards stay open,
+least recently used first to close, while the default database is never
+closed before the router. Cross-guild operator queries scan each shard file on a
+short-lived read-only connection, several shards at a time, without opening
+(or evicting) bot shards.
+"""
+
+import asyncio
+import heapq
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from broski_economy import DATABASE, LEADERBOARD_SIZE, LEADERBOARDS, AsyncBroskiDB, BroskiDB, fairness_from_balances
+
+# Open shards kept at once (each holds a connection and a DB thread)
+MAX_OPEN_SHARDS = 64
+# Shards scanned in parallel by cross-guild queries
+SCAN_CONCURRENCY = 4
+
+_SHARD_FILE = re.compile(r"^guild_(\d+)\.db$")
+
+SELECT_TOTALS = "SELECT COUNT(*), COALESCE(SUM(broski_balance), 0) FROM users WHERE broski_balance > 0"
+SELECT_POSITIVE_BALANCES = "SELECT broski_balance FROM users WHERE broski_balance > 0"
+SELECT_USER_TOTALS = "SELECT broski_balance, lifetime_earned, task_count FROM users WHERE id = ?"
+
+
+class ShardRouter:
+    """
+    Maps guild ids to economy databases.
+
+    With ``directory`` set, guild ``g`` lives in ``<directory>/guild_<g>.db``;
+    direct messages (guild ``None``) use ``database``. Without ``directory``
+    every guild shares ``database``, as before sharding. Extra keyword
+    arguments configure each shard's ``BroskiDB`` (e.g. ``batch_rows``).
+    """
+
+    def __init__(self, directory: Optional[str] = None, database: str = DATABASE,
+                 max_open: int = MAX_OPEN_SHARDS, **options: Any):
+        self.directory = directory
+        self.database = database
+        self.max_open = max_open
+        self.options = options
+        self._shards: "OrderedDict[str, AsyncBroskiDB]" = OrderedDict()
+        self._closing: Dict[str, threading.Thread] = {}  # Evicted shards still flushing, by path
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, guild_id: Optional[int]) -> str:
+        if self.directory is None or guild_id is None:
+            return self.database
+        return os.path.join(self.directory, f"guild_{int(guild_id)}.db")
+
+    @property
+    def default(self) -> AsyncBroskiDB:
+        """The default database (direct messages, or every guild when unsharded); never evicted"""
+        shard, _ = self._lookup(self.database)
+        return shard
+
+    async def shard(self, guild_id: Optional[int]) -> AsyncBroskiDB:
+        """The (lazily opened) economy database of ``guild_id``"""
+        path = self.path_for(guild_id)
+        while True:
+            shard, closing = self._lookup(path)
+            if shard is not None:
+                return shard
+            # The evicted instance still owns the file and its write-behind journal:
+            # reopening before it has flushed would credit its journaled rewards twice.
+            # Its close can wait on a VACUUM, so wait off the event loop.
+            await asyncio.to_thread(closing.join)
+
+    def _lookup(self, path: str) -> Tuple[Optional[AsyncBroskiDB], Optional[threading.Thread]]:
+        """The open shard for ``path`` (opened now if need be), or the thread still closing it"""
+        with self._lock:
+            shard = self._shards.get(path)
+            closing = self._closing.get(path)
+            if shard is None and closing is not None:
+                return None, closing
+            if shard is None:
+                shard = self._shards[path] = AsyncBroskiDB(BroskiDB(path, **self.options))
+                self._evict(path)
+            self._shards.move_to_end(path)
+            return shard, None
+
+    def _evict(self, opened: str) -> None:
+        # Caller holds the lock; the default database stays open (the bot keeps a handle to it)
+        evictable = [path for path in self._shards if path not in (self.database, opened)]
+        excess = len(evictable) + (opened != self.database) - self.max_open
+        for path in evictable[:max(0, excess)]:
+            evicted = self._shards.pop(path)
+            # Closing flushes write-behind rewards and waits for queued calls: keep it off the event loop
+            thread = self._closing[path] = threading.Thread(
+                target=self._close_evicted, args=(path, evicted), name="broski-shard-close", daemon=False)
+            thread.start()
+
+    def _close_evicted(self, path: str, shard: AsyncBroskiDB) -> None:
+        try:
+            shard.close()
+        finally:
+            with self._lock:
+                self._closing.pop(path, None)
+
+    def open_shards(self) -> Dict[str, AsyncBroskiDB]:
+        with self._lock:
+            return dict(self._shards)
+
+    def guild_ids(self) -> List[int]:
+        """Every guild with a shard file on disk"""
+        if self.directory is None:
+            return []
+        return sorted(int(m.group(1)) for m in map(_SHARD_FILE.match, os.listdir(self.directory)) if m)
+
+    def close(self) -> None:
+        """Flush and close every open shard"""
+        with self._lock:
+            shards, self._shards = list(self._shards.values()), OrderedDict()
+            closing = list(self._closing.values())
+        for shard in shards:
+            shard.close()
+        for thread in closing:
+            thread.join()
+
+    # ----- Cross-guild queries -----
+    def _paths(self) -> List[Tuple[Optional[int], str]]:
+        paths = [(None, self.database)] if os.path.exists(self.database) else []
+        return paths + [(guild_id, self.path_for(guild_id)) for guild_id in self.guild_ids()]
+
+    async def _scan(self, query: Callable[[sqlite3.Connection], Any]) -> Dict[Optional[int], Any]:
+        """Run ``query`` on a read-only connection to every shard, ``SCAN_CONCURRENCY`` at a time"""
+        # Commit write-behind rewards first so the scans see them
+        await asyncio.gather(*(shard.flush() for shard in self.open_shards().values()))
+        semaphore = asyncio.Semaphore(SCAN_CONCURRENCY)
+
+        def scan(path: str) -> Any:
+            conn = sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True)
+            try:
+                return query(conn)
+            finally:
+                conn.close()
+
+        async def one(path: str) -> Any:
+            async with semaphore:
+                return await asyncio.to_thread(scan, path)
+
+        paths = self._paths()
+        results = await asyncio.gather(*(one(path) for _, path in paths))
+        return {guild_id: result for (guild_id, _), result in zip(paths, results)}
+
+    async def global_stats(self) -> Dict[str, Any]:
+        """Fairness metrics over every user of every guild, plus the number of guild shards"""
+        balances = await self._scan(lambda conn: [row[0] for row in conn.execute(SELECT_POSITIVE_BALANCES)])
+        metrics = fairness_from_balances([b for shard in balances.values() for b in shard])
+        metrics['guilds'] = sum(guild_id is not None for guild_id in balances)  # Not the default database
+        return metrics
+
+    async def global_totals(self) -> Dict[Optional[int], Tuple[int, int]]:
+        """(users with a positive balance, BROski$ in circulation) per guild"""
+        return await self._scan(lambda conn: conn.execute(SELECT_TOTALS).fetchone())
+
+    async def global_leaderboard(self, sort_by: str = "balance", limit: int = LEADERBOARD_SIZE) -> List[tuple]:
+        """Top ``limit`` (guild id, user id, username, value) rows across every guild"""
+        sql = LEADERBOARDS.get(sort_by, LEADERBOARDS["balance"])
+        tops = await self._scan(lambda conn: conn.execute(sql, (limit,)).fetchall())
+        rows = [(guild_id,) + tuple(row) for guild_id, top in tops.items() for row in top]
+        return heapq.nlargest(limit, rows, key=lambda row: row[3])
+
+    async def user_totals(self, user_id: str) -> Dict[str, int]:
+        """One Discord user's balance, lifetime earnings and tasks summed over every guild"""
+        found = await self._scan(lambda conn: conn.execute(SELECT_USER_TOTALS, (user_id,)).fetchone())
+        rows = [row for row in found.values() if row]
+        guilds = [guild_id for guild_id, row in found.items() if row and guild_id is not None]
+        return {
+            'broski_balance': sum(row[0] for row in rows),
+            'lifetime_earned': sum(row[1] for row in rows),
+            'task_count': sum(row[2] for row in rows),
+            'guilds': len(guilds),
+        }
@@ -0,0 +1,211 @@
+"""
+BROski$ Economy - Incremental Statistics
+Running fairness aggregates, so /stats never re-reads or re-sorts balances.
+
+The Gini coefficient of ascending balances x_1..x_n is
+
+    G = 2 * sum(i * x_i) / (n * S) - (n + 1) / n
+
+so it only needs n, the total S and the rank-weighted sum W = sum(i * x_i).
+Inserting a balance v shifts every larger balance up one rank, adding
+v * (rank of v) + (sum of balances >= v) to W; removing one undoes that.
+An order-statistics treap (subtree counts and sums) answers those prefix
+queries and the median in O(log n).
+"""
+
+import random
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+class _Node:
+    __slots__ = ("key", "priority", "count", "size", "total", "left", "right")
+
+    def __init__(self, key: int, priority: float):
+        self.key = key
+        self.priority = priority
+        self.count = 1  # Copies of key held by this node
+        self.size = 1  # Copies in this subtree
+        self.total = key  # Sum of this subtree
+        self.left: Optional["_Node"] = None
+        self.right: Optional["_Node"] = None
+
+    def update(self) -> None:
+        self.size = self.count
+        self.total = self.key * self.count
+        for child in (self.left, self.right):
+            if child is not None:
+                self.size += child.size
+                self.total += child.total
+
+
+class OrderStatisticTree:
+    """Multiset of ints with O(log n) insert, remove, rank/prefix-sum and select"""
+
+    def __init__(self, values: Iterable[int] = (), seed: Optional[int] = None):
+        self._root: Optional[_Node] = None
+        self._random = random.Random(seed)
+        for value in values:
+            self.insert(value)
+
+    def __len__(self) -> int:
+        return self._root.size if self._root else 0
+
+    @property
+    def total(self) -> int:
+        return self._root.total if self._root else 0
+
+    # ----- Updates -----
+    def insert(self, key: int) -> None:
+        self._root = self._insert(self._root, key)
+
+    def _insert(self, node: Optional[_Node], key: int) -> _Node:
+        if node is None:
+            return _Node(key, self._random.random())
+        if key == node.key:
+            node.count += 1
+        elif key < node.key:
+            node.left = self._insert(node.left, key)
+            if node.left.priority > node.priority:
+                node = self._rotate_right(node)
+        else:
+            node.right = self._insert(node.right, key)
+            if node.right.priority > node.priority:
+                node = self._rotate_left(node)
+        node.update()
+        return node
+
+    def remove(self, key: int) -> None:
+        """Remove one copy of ``key``; raises KeyError if it is not present"""
+        self._root = self._remove(self._root, key)
+
+    def _remove(self, node: Optional[_Node], key: int) -> Optional[_Node]:
+        if node is None:
+            raise KeyError(key)
+        if key < node.key:
+            node.left = self._remove(node.left, key)
+        elif key > node.key:
+            node.right = self._remove(node.right, key)
+        elif node.count > 1:
+            node.count -= 1
+        else:
+            return self._merge(node.left, node.right)
+        node.update()
+        return node
+
+    @staticmethod
+    def _rotate_right(node: _Node) -> _Node:
+        pivot = node.left
+        node.left, pivot.right = pivot.right, node
+        node.update()
+        return pivot
+
+    @staticmethod
+    def _rotate_left(node: _Node) -> _Node:
+        pivot = node.right
+        node.right, pivot.left = pivot.left, node
+        node.update()
+        return pivot
+
+    def _merge(self, left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+        # Every key in ``left`` is smaller than every key in ``right``
+        if left is None or right is None:
+            return left or right
+        if left.priority > right.priority:
+            left.right = self._merge(left.right, right)
+            left.update()
+            return left
+        right.left = self._merge(left, right.left)
+        right.update()
+        return right
+
+    # ----- Queries -----
+    def prefix(self, key: int, inclusive: bool = False) -> Tuple[int, int]:
+        """(count, sum) of the values below ``key`` (or at most ``key`` if ``inclusive``)"""
+        count = total = 0
+        node = self._root
+        while node is not None:
+            if key < node.key or (key == node.key and not inclusive):
+                node = node.left
+                continue
+            left_size, left_total = (node.left.size, node.left.total) if node.left else (0, 0)
+            if key == node.key:
+                return count + left_size + node.count, total + left_total + node.key * node.count
+            count += left_size + node.count
+            total += left_total + node.key * node.count
+            node = node.right
+        return count, total
+
+    def select(self, index: int) -> int:
+        """The ``index``-th smallest value (0-based)"""
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        node = self._root
+        while True:
+            left_size = node.left.size if node.left else 0
+            if index < left_size:
+                node = node.left
+            elif index < left_size + node.count:
+                return node.key
+            else:
+                index -= left_size + node.count
+                node = node.right
+
+
+class EconomyStats:
+    """
+    Fairness metrics over positive balances, updated per balance change.
+
+    ``metrics()`` matches ``broski_economy.fairness_from_balances`` exactly,
+    in O(log n) (the median) instead of a full sort.
+    """
+
+    def __init__(self, balances: Iterable[Tuple[str, int]] = ()):
+        self.balances: Dict[str, int] = {}  # Every non-zero balance; only positive ones count
+        self.tree = OrderStatisticTree()
+        self.total = 0
+        self.weighted = 0  # sum(rank * balance), ranks ascending from 1
+        for user_id, balance in balances:
+            self.set(user_id, balance)
+
+    def apply(self, user_id: str, delta: int) -> None:
+        """Record a balance change of ``delta`` for ``user_id``"""
+        if delta:
+            self.set(user_id, self.balances.get(user_id, 0) + delta)
+
+    def set(self, user_id: str, balance: int) -> None:
+        old = self.balances.pop(user_id, 0)
+        if old > 0:
+            self._remove(old)
+        if balance:
+            self.balances[user_id] = balance
+        if balance > 0:
+            self._insert(balance)
+
+    def _insert(self, value: int) -> None:
+        below, below_total = self.tree.prefix(value)
+        # ``value`` takes rank below + 1; everything from there up moves one rank
+        self.weighted += value * (below + 1) + (self.total - below_total)
+        self.tree.insert(value)
+        self.total += value
+
+    def _remove(self, value: int) -> None:
+        # Remove the highest-ranked copy, so only strictly larger values move down
+        upto, upto_total = self.tree.prefix(value, inclusive=True)
+        self.weighted -= value * upto + (self.total - upto_total)
+        self.tree.remove(value)
+        self.total -= value
+
+    def metrics(self) -> Dict[str, Any]:
+        """Gini coefficient, median, average, user count and total"""
+        n = len(self.tree)
+        if not n:
+            return {'gini': 0, 'median': 0, 'avg': 0, 'users': 0, 'total_broski': 0}
+        total = self.total
+        gini = (2 * self.weighted) / (n * total) - (n + 1) / n if total > 0 else 0
+        return {
+            'gini': round(gini, 3),
+            'median': self.tree.select(n // 2),
+            'avg': total // n,
+            'users': n,
+            'total_broski': total,
+        }
@@ -0,0 +1,90 @@
+"""
+Benchmark: compile_flow on large generated HyperFlow graphs.
+
+Generates graphs made of independent lanes (sequence -> PCR -> CRISPR -> PCR)
+joined pairwise by Golden Gate nodes, with deliberately colliding labels, and
+times FlowGraph construction plus compile_flow at several sizes. Time per node
+should stay flat as the graph grows.
+
+Usage:
+    python benchmarks/bench_flow_compiler.py [--nodes 10000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hypercode.compiler import compile_flow  # noqa: E402
+from hypercode.flow_graph import FlowGraph  # noqa: E402
+
+LANE = ["sequence", "pcr", "crispr", "pcr"]
+
+
+def generate_flow(num_nodes: int) -> Dict[str, Any]:
+    """Builds a graph of roughly ``num_nodes`` nodes; nodes are listed in reverse dependency order."""
+    nodes: List[Dict[str, Any]] = []
+    edges: List[Dict[str, str]] = []
+    lane_tails: List[str] = []
+    lane = 0
+    while len(nodes) + len(LANE) + 1 <= num_nodes:
+        previous = None
+        for step, node_type in enumerate(LANE):
+            node_id = f"n{lane}_{step}"
+            data: Dict[str, Any] = {"label": node_type.upper()}  # Colliding labels on purpose
+            if node_type == "sequence":
+                data["sequence"] = "GGTCTCAGGAGATGCGTACGTTAGCTAGCTACTAGAGACC"
+            elif node_type == "pcr":
+                data.update(forwardPrimer="GGAG", reversePrimer="TACT")
+            else:
+                data.update(guideRNA="ATGCGTACGTTAGCTAGCTA", pam="NGG")
+            nodes.append({"id": node_id, "type": node_type, "data": data})
+            if previous is not None:
+                edges.append({"source": previous, "target": node_id})
+            previous = node_id
+        lane_tails.append(previous)
+        if lane % 2 == 1:
+            gg_id = f"gg{lane}"
+            nodes.append({"id": gg_id, "type": "goldengate", "data": {"label": "Plasmid", "enzyme": "BsaI"}})
+            edges.append({"source": lane_tails[-2], "target": gg_id})
+            edges.append({"source": lane_tails[-1], "target": gg_id})
+        lane += 1
+    # Worst case for type- or list-ordered emission: consumers listed before producers
+    nodes.reverse()
+    return {"nodes": nodes, "edges": edges}
+
+
+def bench(num_nodes: int, repeat: int) -> None:
+    flow = generate_flow(num_nodes)
+    best_graph = best_compile = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        graph = FlowGraph.from_dict(flow)
+        mid = time.perf_counter()
+        code = compile_flow(graph)
+        end = time.perf_counter()
+        best_graph = min(best_graph, mid - start)
+        best_compile = min(best_compile, end - mid)
+    per_node_us = (best_graph + best_compile) / len(flow["nodes"]) * 1e6
+    print(
+        f"{len(flow['nodes']):>7} nodes {len(flow['edges']):>7} edges | "
+        f"graph {best_graph * 1e3:8.2f} ms | compile {best_compile * 1e3:8.2f} ms | "
+        f"{per_node_us:6.2f} us/node | {len(code.splitlines())} lines"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=10_000, help="Largest graph size (default: 10000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per size; best time is reported")
+    args = parser.parse_args()
+
+    for size in (args.nodes // 100, args.nodes // 10, args.nodes):
+        bench(size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
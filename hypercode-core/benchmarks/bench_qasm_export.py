@@ -0,0 +1,90 @@
+"""
+Benchmark: OpenQASM export/import of large QModules.
+
+Builds a Trotter-style circuit (RZ layers and CX ladders) and times
+hypercode.ir.qasm against qiskit.qasm3.dumps, which also needs the
+QuantumCircuit built by QiskitBackend.compile. The qiskit rows are skipped
+when qiskit is not installed.
+
+Usage:
+    python benchmarks/bench_qasm_export.py [--qubits 20] [--steps 500] [--repeat 3]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from typing import Callable
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from hypercode.ir.columnar import InstructionTable  # noqa: E402
+from hypercode.ir.qasm import dump_qasm, dumps_qasm, parse_qasm  # noqa: E402
+from hypercode.ir.qir_nodes import QModule  # noqa: E402
+
+try:
+    from qiskit import qasm3
+    from hypercode.backends.qiskit_backend import QiskitBackend
+    QISKIT_AVAILABLE = True
+except ImportError:
+    QISKIT_AVAILABLE = False
+
+
+def trotter_module(num_qubits: int, steps: int) -> QModule:
+    table = InstructionTable()
+    table.append_alloc(0, num_qubits)
+    for step in range(steps):
+        for q in range(num_qubits):
+            table.append_gate("RZ", [q], [0.01 * (step + 1)])
+        for q in range(num_qubits - 1):
+            table.append_gate("CX", [q, q + 1])
+        for q in range(num_qubits):
+            table.append_gate("RX", [q], [0.02])
+    for q in range(num_qubits):
+        table.append_measure(q, f"c{q}")
+    table.append_end()
+    return QModule(name="Trotter", instructions=table)
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--qubits", type=int, default=20)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    module = trotter_module(args.qubits, args.steps)
+    gates = module.instructions.gate_count()
+    text = dumps_qasm(module)
+    print(f"{gates} gates, {len(text) / 1e6:.1f} MB of OpenQASM 3")
+
+    rows = [
+        ("hypercode dumps_qasm", lambda: dumps_qasm(module)),
+        ("hypercode dump_qasm (stream)", lambda: dump_qasm(module, io.StringIO())),
+        ("hypercode parse_qasm (columnar)", lambda: parse_qasm(io.StringIO(text), columnar=True)),
+    ]
+    if QISKIT_AVAILABLE:
+        backend = QiskitBackend()
+        circuit, _ = backend.compile(module)
+        rows.append(("qiskit compile + qasm3.dumps", lambda: qasm3.dumps(backend.compile(module)[0])))
+        rows.append(("qiskit qasm3.dumps (prebuilt)", lambda: qasm3.dumps(circuit)))
+    else:
+        print("qiskit not installed: skipping qiskit.qasm3 comparison")
+
+    for label, func in rows:
+        seconds = best_of(args.repeat, func)
+        print(f"{label:<34} {seconds * 1e3:9.1f} ms  {seconds / gates * 1e6:6.2f} us/gate")
+
+
+if __name__ == "__main__":
+    main()
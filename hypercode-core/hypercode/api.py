@@ -14,6 +14,7 @@ def execute(
     backend_name: str = "qiskit",
     shots: int = 1024,
     seed: Optional[int] = None,
+    exact: bool = False,
 ) -> ExecutionResult:
     """
     Parses, evaluates, and executes a string of HyperCode.
@@ -22,9 +23,12 @@ def execute(
 
     Args:
         code_string: A string containing the HyperCode program.
-        backend_name: The name of the backend to use for execution (e.g., "qiskit").
+        backend_name: The name of the backend to use for execution (e.g., "qiskit",
+            or "auto" to pick the fastest backend per circuit).
         shots: The number of shots to use in the quantum simulation.
         seed: The random seed for the quantum simulator.
+        exact: Return exact outcome probabilities in ``<circuit>_results`` instead of
+            sampled counts.
 
     Returns:
         An ExecutionResult object containing the results, AST, QIR, and any errors.
@@ -38,6 +42,7 @@ def execute(
             backend_name=backend_name,
             shots=shots,
             seed=seed,
+            exact=exact,
         )
         evaluator.evaluate(program_ast)
 
@@ -47,6 +52,7 @@ def execute(
             result=evaluator.variables,
             ast=program_ast,
             qir=evaluator.qir,
+            metadata=evaluator.metadata,
         )
 
     except Exception as e:
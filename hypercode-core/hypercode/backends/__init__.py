@@ -8,12 +8,20 @@ from .base import BaseBackend
 Backend = BaseBackend
 
 from .qiskit_backend import QiskitBackend
+from .sharding import ShardedBackend
+from .stabilizer_backend import StabilizerBackend
+from .statevector_backend import StatevectorBackend
+from .auto_backend import AutoBackend
+from .probabilities import sample_counts
 # Import other backends here as they are created
 # from .classical_backend import ClassicalBackend
 
 # A registry of available backend classes
 BACKEND_REGISTRY: Dict[str, Type[BaseBackend]] = {
     "qiskit": QiskitBackend,
+    "stabilizer": StabilizerBackend,
+    "statevector": StatevectorBackend,
+    "auto": AutoBackend,
     # "classical": ClassicalBackend,
 }
 
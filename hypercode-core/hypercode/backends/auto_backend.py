@@ -0,0 +1,219 @@
+"""
+Per-circuit backend selection.
+
+``AutoBackend`` analyses every ``QModule`` it is given and routes it to the
+engine expected to be fastest:
+
+1. a cached result, for a seeded (or ``exact``) circuit that has already been run,
+2. the stabilizer tableau, for Clifford-only circuits of any size,
+3. the built-in statevector, for circuits small enough that simulating them
+   in Python is cheaper than starting a Qiskit job,
+4. Qiskit (Aer when installed), for everything else,
+5. the statevector again, up to its qubit limit, when Qiskit is missing.
+
+The decision for each module is kept in ``last_decisions`` so callers can
+report it (``Evaluator`` copies it into ``ExecutionResult.metadata``).
+"""
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .base import BaseBackend
+from .stabilizer_backend import is_clifford
+from .statevector_backend import MAX_QUBITS, has_terminal_measurements
+from hypercode.ir.qir_nodes import QAlloc, QGate, QMeasure, QModule
+
+# Below this many amplitude updates (2**qubits * gates) the Python statevector beats a Qiskit job
+STATEVECTOR_WORK_LIMIT = 1 << 20
+
+
+@dataclass
+class CircuitProfile:
+    """What the router looks at when choosing a backend for a module."""
+    num_qubits: int = 0
+    num_gates: int = 0
+    depth: int = 0
+    num_measurements: int = 0
+    clifford: bool = True
+    terminal_measurements: bool = True
+    gate_counts: Dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "num_qubits": self.num_qubits,
+            "num_gates": self.num_gates,
+            "depth": self.depth,
+            "num_measurements": self.num_measurements,
+            "clifford": self.clifford,
+            "terminal_measurements": self.terminal_measurements,
+            "gate_counts": dict(self.gate_counts),
+        }
+
+
+@dataclass
+class RoutingDecision:
+    """The backend chosen for one module, and why."""
+    module: str
+    backend: str
+    reason: str
+    profile: CircuitProfile
+    cached: bool = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "reason": self.reason,
+            "cached": self.cached,
+            "profile": self.profile.as_dict(),
+        }
+
+
+def analyze_module(module: QModule) -> CircuitProfile:
+    """Collects qubit count, gate set, depth and measurement placement of ``module``."""
+    profile = CircuitProfile()
+    layer: Dict[int, int] = {}  # qubit -> depth of the last operation on it
+    for instr in module.instructions:
+        if isinstance(instr, QAlloc):
+            profile.num_qubits += instr.count
+        elif isinstance(instr, QGate):
+            profile.num_gates += 1
+            name = instr.name.upper()
+            profile.gate_counts[name] = profile.gate_counts.get(name, 0) + 1
+            depth = 1 + max((layer.get(q, 0) for q in instr.qubits), default=0)
+            for q in instr.qubits:
+                layer[q] = depth
+        elif isinstance(instr, QMeasure):
+            profile.num_measurements += 1
+            layer[instr.qubit] = layer.get(instr.qubit, 0) + 1
+    profile.depth = max(layer.values(), default=0)
+    profile.clifford = is_clifford(module)
+    profile.terminal_measurements = has_terminal_measurements(module)
+    return profile
+
+
+def fingerprint(module: QModule) -> str:
+    """A digest of the instructions of ``module`` (its name is ignored)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for instr in module.instructions:
+        digest.update(str(instr).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def _qiskit_available() -> bool:
+    from . import qiskit_backend
+    return qiskit_backend.QISKIT_AVAILABLE and qiskit_backend.SIMULATOR_BACKEND is not None
+
+
+class AutoBackend(BaseBackend):
+    """
+    Routes each circuit to the fastest available backend.
+
+    Args:
+        cache_size: Number of seeded results to keep; a circuit run again with
+            the same seed, shots and parameters returns the cached counts.
+            Unseeded runs are never cached, since they should differ.
+    """
+
+    def __init__(self, cache_size: int = 128):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[Any, ...], Dict[str, Any]]" = OrderedDict()
+        self._backends: Dict[str, BaseBackend] = {}
+        self.last_decisions: List[RoutingDecision] = []
+
+    def _backend(self, name: str) -> BaseBackend:
+        backend = self._backends.get(name)
+        if backend is None:
+            from hypercode.backends import get_backend
+            backend = self._backends[name] = get_backend(name)
+        return backend
+
+    def route(self, module: QModule, exact: bool = False) -> RoutingDecision:
+        """Chooses a backend for ``module`` without running it."""
+        profile = analyze_module(module)
+        if profile.clifford:
+            return RoutingDecision(module.name, "stabilizer", "Clifford-only circuit", profile)
+        if exact and not profile.terminal_measurements:
+            # Only the statevector can follow both branches of a mid-circuit measurement
+            return RoutingDecision(module.name, "statevector", "exact mid-circuit measurement", profile)
+        work = (1 << profile.num_qubits) * max(profile.num_gates, 1)
+        # Mid-circuit measurement makes the statevector re-simulate every shot
+        if profile.terminal_measurements and work <= STATEVECTOR_WORK_LIMIT:
+            return RoutingDecision(module.name, "statevector", "small circuit", profile)
+        if _qiskit_available():
+            return RoutingDecision(module.name, "qiskit", "large or mid-circuit-measured circuit", profile)
+        if profile.num_qubits <= MAX_QUBITS:
+            return RoutingDecision(module.name, "statevector", "qiskit unavailable", profile)
+        raise ValueError(
+            f"No available backend can simulate module '{module.name}' "
+            f"({profile.num_qubits} qubits, not Clifford, qiskit not installed)"
+        )
+
+    def _cache_key(self, module: QModule, shots: int, seed: Optional[int], exact: bool) -> Optional[Tuple[Any, ...]]:
+        # ``module`` is already bound, so parameter values are part of its fingerprint
+        if exact:
+            # Exact results depend on neither seed nor shots, so they are always reusable
+            return (fingerprint(module), "exact") if self.cache_size > 0 else None
+        if seed is None or self.cache_size <= 0:
+            return None
+        return (fingerprint(module), shots, seed)
+
+    def _store(self, key: Optional[Tuple[Any, ...]], counts: Dict[str, Any]) -> None:
+        if key is None:
+            return
+        self._cache[key] = counts
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def execute(
+        self,
+        ir_module: QModule,
+        shots: int = 1024,
+        seed: Optional[int] = None,
+        parameters: Optional[Mapping[str, float]] = None,
+        exact: bool = False,
+    ) -> Dict[str, Any]:
+        """Routes and runs ``ir_module``; ``last_decisions`` holds the routing decision."""
+        return self.execute_batch([ir_module], shots=shots, seed=seed, parameters=parameters, exact=exact)[0]
+
+    def execute_batch(
+        self,
+        ir_modules: Sequence[QModule],
+        shots: int = 1024,
+        seed: Optional[int] = None,
+        parameters: Optional[Mapping[str, float]] = None,
+        exact: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Routes every module, then runs each backend's share as one batch."""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(ir_modules)
+        decisions: List[RoutingDecision] = []
+        groups: Dict[str, List[int]] = {}
+        keys: List[Optional[Tuple[Any, ...]]] = []
+        # Bind up front so the analysis sees numeric angles and every backend gets plain circuits
+        modules = [self.bind_parameters(module, parameters) for module in ir_modules]
+        for i, module in enumerate(modules):
+            key = self._cache_key(module, shots, seed, exact)
+            keys.append(key)
+            decision = self.route(module, exact)
+            if key is not None and key in self._cache:
+                self._cache.move_to_end(key)
+                results[i] = dict(self._cache[key])
+                decision.cached = True
+            else:
+                groups.setdefault(decision.backend, []).append(i)
+            decisions.append(decision)
+
+        for name, indices in groups.items():
+            batch = [modules[i] for i in indices]
+            backend = self._backend(name)
+            if exact:
+                outputs = backend.execute_batch(batch, shots=shots, seed=seed, exact=True)
+            else:
+                outputs = backend.execute_batch(batch, shots=shots, seed=seed)
+            for i, counts in zip(indices, outputs):
+                results[i] = counts
+                self._store(keys[i], dict(counts))
+
+        self.last_decisions = decisions
+        return [counts if counts is not None else {} for counts in results]
@@ -2,7 +2,7 @@
 Defines the base interface for all execution backends.
 """
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Dict, List, Mapping, Optional, Sequence
 
 from hypercode.ir.qir_nodes import QModule
 
@@ -20,7 +20,9 @@ class BaseBackend(ABC):
         self,
         ir_module: QModule,
         shots: int = 1024,
-        seed: Optional[int] = None
+        seed: Optional[int] = None,
+        parameters: Optional[Mapping[str, float]] = None,
+        exact: bool = False,
     ) -> Any:
         """
         Executes the given IR module and returns the result.
@@ -29,9 +31,72 @@ class BaseBackend(ABC):
             ir_module: The Quantum Intermediate Representation (QIR) module to execute.
             shots: The number of times to run the circuit (for probabilistic results).
             seed: The random seed for simulators.
+            parameters: Values for the module's symbolic parameters, if any
+                (see :meth:`bind_parameters`).
+            exact: Return the exact outcome probabilities ({bitstring: probability})
+                instead of sampling ``shots``; see ``hypercode.backends.probabilities``.
 
         Returns:
             The result of the execution, which can be of any type depending on the
             backend's nature (e.g., a dictionary of counts, a classical value).
         """
         raise NotImplementedError
+
+    def execute_batch(
+        self,
+        ir_modules: Sequence[QModule],
+        shots: int = 1024,
+        seed: Optional[int] = None,
+        parameters: Optional[Mapping[str, float]] = None,
+        exact: bool = False,
+    ) -> List[Any]:
+        """
+        Executes several independent IR modules and returns their results in order.
+
+        The default implementation calls :meth:`execute` once per module;
+        backends that can submit many circuits as one job should override it.
+
+        Args:
+            ir_modules: The modules to execute.
+            shots: The number of shots per module.
+            seed: The random seed for simulators.
+            parameters: Values for the modules' symbolic parameters, shared by all modules.
+            exact: Return exact outcome probabilities instead of counts.
+
+        Returns:
+            One result per module, in the same order as ``ir_modules``.
+        """
+        options: Dict[str, Any] = {}
+        if parameters is not None:
+            options["parameters"] = parameters
+        if exact:
+            options["exact"] = True
+        return [self.execute(module, shots=shots, seed=seed, **options) for module in ir_modules]
+
+    @staticmethod
+    def bind_parameters(ir_module: QModule, parameters: Optional[Mapping[str, float]]) -> QModule:
+        """
+        Returns ``ir_module`` with its symbolic parameters bound to ``parameters``
+        (the module itself if it has none). Backends without native parameter
+        support call this before compiling.
+
+        Raises:
+            ValueError: If the module has a parameter with no value.
+        """
+        if not BaseBackend.check_parameters(ir_module, parameters):
+            return ir_module
+        return ir_module.bind(parameters)
+
+    @staticmethod
+    def check_parameters(ir_module: QModule, parameters: Optional[Mapping[str, float]]) -> List[str]:
+        """
+        Returns the names of ``ir_module``'s symbolic parameters (empty for fixed circuits).
+
+        Raises:
+            ValueError: If ``parameters`` lacks a value for any of them.
+        """
+        names = ir_module.parameters()
+        missing = [name for name in names if parameters is None or name not in parameters]
+        if missing:
+            raise ValueError(f"Module '{ir_module.name}' has unbound parameters: {missing}")
+        return names
@@ -0,0 +1,58 @@
+"""
+Helpers for exact (``exact=True``) execution.
+
+Backends that can compute a circuit's outcome distribution directly return
+``{bitstring: probability}`` instead of sampled counts, using the same keys
+as counts: one classical bit per measurement target, in order of first
+measurement, with bit 0 rightmost. :func:`sample_counts` turns such a
+distribution into counts for any number of shots without re-simulating.
+"""
+import random
+from collections import Counter
+from itertools import accumulate
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from hypercode.ir.qir_nodes import QMeasure, QModule
+
+# Outcomes less likely than this are dropped from exact distributions
+PROBABILITY_CUTOFF = 1e-15
+
+
+def measurement_sources(module: QModule) -> Tuple[Dict[str, int], Dict[int, int]]:
+    """
+    Returns the clbit map (target -> classical bit) and, for each classical
+    bit, the qubit of the last measurement into it.
+    """
+    clbit_map: Dict[str, int] = {}
+    sources: Dict[int, int] = {}
+    for instr in module.instructions:
+        if isinstance(instr, QMeasure):
+            sources[clbit_map.setdefault(instr.target, len(clbit_map))] = instr.qubit
+    return clbit_map, sources
+
+
+def marginalize(probabilities: Iterable[float], sources: Mapping[int, int], width: int) -> Dict[str, float]:
+    """
+    Sums basis-state probabilities (indexed by qubit bits, qubit 0 least
+    significant) into probabilities of the measured classical bits.
+    """
+    result: Dict[str, float] = {}
+    for index, p in enumerate(probabilities):
+        if p < PROBABILITY_CUTOFF:
+            continue
+        bits = 0
+        for clbit, qubit in sources.items():
+            bits |= (index >> qubit & 1) << clbit
+        key = format(bits, f"0{width}b")
+        result[key] = result.get(key, 0.0) + p
+    return result
+
+
+def sample_counts(probabilities: Mapping[str, float], shots: int, seed: Optional[int] = None) -> Dict[str, int]:
+    """Draws ``shots`` outcomes from an exact distribution and returns counts."""
+    if not probabilities or shots <= 0:
+        return {}
+    keys = list(probabilities)
+    cumulative = list(accumulate(probabilities[k] for k in keys))
+    rng = random.Random(seed)
+    return dict(Counter(rng.choices(keys, cum_weights=cumulative, k=shots)))
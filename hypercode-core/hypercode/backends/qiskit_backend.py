@@ -1,13 +1,18 @@
-from typing import Optional, Any, Dict, List, Tuple
+from typing import Optional, Any, Dict, List, Mapping, Sequence, Tuple
 import sys
+import weakref
+from collections import OrderedDict
 from typing import cast
 
 from .base import BaseBackend
+from .probabilities import marginalize, measurement_sources
+from hypercode.ir.params import ParamExpr, ParamValue, map_param
 from hypercode.ir.qir_nodes import QModule, QAlloc, QGate, QMeasure
 
 # Optional import
 try:
     from qiskit import QuantumCircuit, transpile
+    from qiskit.circuit import Parameter
     QISKIT_AVAILABLE = True
 except ImportError:
     QISKIT_AVAILABLE = False
@@ -39,9 +44,14 @@ if QISKIT_AVAILABLE:
                 SIMULATOR_BACKEND = None
 
 class QiskitBackend(BaseBackend):
+    # Transpiled circuits kept for parametric modules, so re-running with new values skips transpilation
+    TRANSPILE_CACHE_SIZE = 32
+
     def __init__(self):
         if not QISKIT_AVAILABLE:
             pass # Silent fail until usage
+        # id(module) -> (weakref to module, transpiled circuit); the weakref guards against id reuse
+        self._transpiled: "OrderedDict[int, Tuple[weakref.ref, Any]]" = OrderedDict()
 
     def compile(self, module: QModule) -> Tuple[Any, Dict[str, int]]:
         if not QISKIT_AVAILABLE:
@@ -71,7 +81,14 @@ class QiskitBackend(BaseBackend):
         num_clbits = clbit_counter
         
         qc = QuantumCircuit(num_qubits, num_clbits)
-        
+        # One qiskit Parameter per name: a circuit may not hold two Parameters with the same name
+        parameters: Dict[str, Any] = {}
+
+        def param(value: ParamValue) -> Any:
+            if isinstance(value, ParamExpr):
+                return map_param(value, lambda name: parameters.setdefault(name, Parameter(name)))
+            return value
+
         for instr in module.instructions:
             if isinstance(instr, QGate):
                 name = instr.name.lower()
@@ -89,11 +106,11 @@ class QiskitBackend(BaseBackend):
                     elif name == 'cz':
                         qc.cz(instr.qubits[0], instr.qubits[1])
                     elif name == 'rz':
-                        qc.rz(instr.params[0], instr.qubits[0])
+                        qc.rz(param(instr.params[0]), instr.qubits[0])
                     elif name == 'rx':
-                        qc.rx(instr.params[0], instr.qubits[0])
+                        qc.rx(param(instr.params[0]), instr.qubits[0])
                     elif name == 'ry':
-                        qc.ry(instr.params[0], instr.qubits[0])
+                        qc.ry(param(instr.params[0]), instr.qubits[0])
                     else:
                         print(f"Warning: Unknown gate {name}", file=sys.stderr)
                 except IndexError:
@@ -104,24 +121,79 @@ class QiskitBackend(BaseBackend):
                 
         return qc, clbit_map
 
-    def execute(self, ir_module: QModule, shots: int = 1024, seed: Optional[int] = None) -> Dict[str, int]:
+    def _transpile_parametric(self, ir_module: QModule) -> Any:
+        """Compiles and transpiles a module with symbolic parameters once, then reuses the result."""
+        key = id(ir_module)
+        entry = self._transpiled.get(key)
+        if entry is not None and entry[0]() is ir_module:
+            self._transpiled.move_to_end(key)
+            return entry[1]
+        qc, _ = self.compile(ir_module)
+        tqc = transpile(qc, SIMULATOR_BACKEND)
+        self._transpiled[key] = (weakref.ref(ir_module), tqc)
+        if len(self._transpiled) > self.TRANSPILE_CACHE_SIZE:
+            self._transpiled.popitem(last=False)
+        return tqc
+
+    def _bound_circuit(self, ir_module: QModule, parameters: Mapping[str, float]) -> Any:
+        """Returns the cached transpiled circuit for a parametric module with ``parameters`` assigned."""
+        tqc = self._transpile_parametric(ir_module)
+        return tqc.assign_parameters({p: float(parameters[p.name]) for p in tqc.parameters})
+
+    def probabilities(self, ir_module: QModule, parameters: Optional[Mapping[str, float]] = None) -> Dict[str, float]:
+        """
+        Exact outcome probabilities from a single statevector pass (no sampling).
+
+        Raises:
+            ValueError: If a qubit is used again after being measured.
+        """
+        from qiskit.quantum_info import Statevector
+        from .statevector_backend import has_terminal_measurements
+
+        ir_module = self.bind_parameters(ir_module, parameters)
+        if not has_terminal_measurements(ir_module):
+            raise ValueError(f"Exact mode needs every measurement of module '{ir_module.name}' to be final")
+        qc, clbit_map = self.compile(ir_module)
+        if not clbit_map:
+            return {}
+        _, sources = measurement_sources(ir_module)
+        state = Statevector.from_instruction(qc.remove_final_measurements(inplace=False))
+        return marginalize(state.probabilities(), sources, len(clbit_map))
+
+    def execute(
+        self,
+        ir_module: QModule,
+        shots: int = 1024,
+        seed: Optional[int] = None,
+        parameters: Optional[Mapping[str, float]] = None,
+        exact: bool = False,
+    ) -> Dict[str, Any]:
         """
         Compile and run the circuit on the detected simulator.
-        Returns a dictionary of counts (e.g., {'00': 500, '11': 524}).
+        Returns a dictionary of counts (e.g., {'00': 500, '11': 524}), or with
+        ``exact`` the outcome probabilities (e.g., {'00': 0.5, '11': 0.5}).
+
+        Symbolic parameters become qiskit ``Parameter`` objects; the transpiled
+        circuit is cached per module and only ``parameters`` are assigned per call.
         """
         if not QISKIT_AVAILABLE:
             print("Warning: Qiskit not found. Returning empty results.", file=sys.stderr)
             return {}
-            
-        qc, _ = self.compile(ir_module)
-        
+        if exact:
+            return self.probabilities(ir_module, parameters)
+
         if not SIMULATOR_BACKEND:
             print("Warning: No Qiskit simulator found (Aer/BasicProvider/BasicAer missing).", file=sys.stderr)
             return {}
+        # Unbound parameters are a caller error, not a run failure, so check outside the try
+        parametric = bool(self.check_parameters(ir_module, parameters))
 
         try:
-            # Transpile for the specific backend
-            tqc = transpile(qc, SIMULATOR_BACKEND)
+            # Transpile for the specific backend (cached for parametric modules)
+            if parametric:
+                tqc = self._bound_circuit(ir_module, cast(Mapping[str, float], parameters))
+            else:
+                tqc = transpile(self.compile(ir_module)[0], SIMULATOR_BACKEND)
             
             # Run options
             run_options = {'shots': shots}
@@ -137,3 +209,62 @@ class QiskitBackend(BaseBackend):
         except Exception as e:
             print(f"Execution Error ({SIMULATOR_NAME}): {e}", file=sys.stderr)
             return {}
+
+    def execute_batch(
+        self,
+        ir_modules: Sequence[QModule],
+        shots: int = 1024,
+        seed: Optional[int] = None,
+        parameters: Optional[Mapping[str, float]] = None,
+        exact: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Compile all modules, transpile them together and run them as a single job.
+        Returns one counts dictionary per module, in order (probabilities with ``exact``).
+
+        A module without counts (e.g. no measurements) gets ``{}`` without affecting
+        the others; if the joint transpile or run fails, each module runs on its own.
+        """
+        if not QISKIT_AVAILABLE:
+            print("Warning: Qiskit not found. Returning empty results.", file=sys.stderr)
+            return [{} for _ in ir_modules]
+        if exact:
+            return [self.probabilities(module, parameters) for module in ir_modules]
+        if not ir_modules:
+            return []
+
+        if not SIMULATOR_BACKEND:
+            print("Warning: No Qiskit simulator found (Aer/BasicProvider/BasicAer missing).", file=sys.stderr)
+            return [{} for _ in ir_modules]
+        parametric = [bool(self.check_parameters(module, parameters)) for module in ir_modules]
+
+        try:
+            if any(parametric):
+                tqcs = [
+                    self._bound_circuit(module, cast(Mapping[str, float], parameters)) if is_parametric
+                    else transpile(self.compile(module)[0], SIMULATOR_BACKEND)
+                    for module, is_parametric in zip(ir_modules, parametric)
+                ]
+            else:
+                tqcs = transpile([self.compile(module)[0] for module in ir_modules], SIMULATOR_BACKEND)
+
+            run_options = {'shots': shots}
+            if seed is not None:
+                run_options['seed_simulator'] = seed
+
+            job = SIMULATOR_BACKEND.run(tqcs, **run_options)
+            result = job.result()
+
+        except Exception as e:
+            # One bad module must not empty the whole batch
+            print(f"Batch Execution Error ({SIMULATOR_NAME}): {e}; running modules one by one", file=sys.stderr)
+            return [self.execute(module, shots=shots, seed=seed, parameters=parameters) for module in ir_modules]
+
+        batch_counts: List[Dict[str, Any]] = []
+        for i, module in enumerate(ir_modules):
+            try:
+                batch_counts.append(cast(Dict[str, int], result.get_counts(i)))
+            except Exception as e:
+                print(f"Execution Error ({SIMULATOR_NAME}) in module '{module.name}': {e}", file=sys.stderr)
+                batch_counts.append({})
+        return batch_counts
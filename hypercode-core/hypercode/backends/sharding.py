@@ -0,0 +1,179 @@
+"""
+Shot-sharded execution across a process pool.
+
+``ShardedBackend`` wraps any registered backend: the requested shots are
+split into ``shards`` chunks, each chunk runs in a worker process with its
+own seed derived from the top-level seed, and the count dictionaries are
+summed. Each shard's seed depends only on the top-level seed and the shard
+index, so for a fixed ``seed`` and ``shards`` the merged counts are the same
+whatever the number of workers.
+
+Backends that choose an engine per circuit (those with a ``route`` method,
+e.g. "auto") are routed once, in-process, before sharding; the workers run
+the chosen engine and the decisions are kept in ``last_decisions``.
+"""
+import hashlib
+import os
+import secrets
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .base import BaseBackend
+from hypercode.ir.qir_nodes import QModule
+
+
+def derive_seed(seed: int, shard: int) -> int:
+    """Returns an independent 31-bit seed for one shard of a seeded run."""
+    digest = hashlib.blake2b(f"{seed}:{shard}".encode("ascii"), digest_size=4).digest()
+    return int.from_bytes(digest, "little") & 0x7FFFFFFF
+
+
+def split_shots(shots: int, shards: int) -> List[int]:
+    """Splits ``shots`` into at most ``shards`` near-equal, non-empty chunks."""
+    if shots <= 0:
+        return []
+    shards = max(1, min(shards, shots))
+    base, extra = divmod(shots, shards)
+    return [base + (1 if i < extra else 0) for i in range(shards)]
+
+
+def merge_counts(results: Iterable[Dict[str, int]]) -> Dict[str, int]:
+    """Sums per-shard count dictionaries."""
+    total: Counter = Counter()
+    for counts in results:
+        total.update(counts)
+    return dict(total)
+
+
+def _run_shard(
+    backend_name: str, module: QModule, shots: int, seed: int, parameters: Optional[Mapping[str, float]] = None
+) -> Dict[str, int]:
+    # Runs in a worker process; backends are cheap to construct
+    from hypercode.backends import get_backend
+    backend = get_backend(backend_name)
+    if parameters is None:
+        return backend.execute(module, shots=shots, seed=seed)
+    return backend.execute(module, shots=shots, seed=seed, parameters=parameters)
+
+
+class ShardedBackend(BaseBackend):
+    """
+    Runs a backend's shots in parallel worker processes and merges the counts.
+
+    Args:
+        backend_name: Registered backend that executes each shard (e.g. "qiskit").
+        workers: Number of worker processes (default: CPU count).
+        shards: Number of shot chunks per circuit (default: ``workers``). Fix
+            this, rather than ``workers``, to reproduce seeded results on
+            machines with different core counts.
+    """
+
+    def __init__(self, backend_name: str = "qiskit", workers: Optional[int] = None, shards: Optional[int] = None):
+        from hypercode.backends import BACKEND_REGISTRY
+        if backend_name not in BACKEND_REGISTRY:
+            raise ValueError(f"Unknown backend: '{backend_name}'. Available backends are: {list(BACKEND_REGISTRY.keys())}")
+        self.backend_name = backend_name
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.shards = max(1, shards or self.workers)
+        self._executor: Optional[Executor] = None
+        # In-process instance of a routing backend, which picks the engine the workers run
+        self._router: Optional[Any] = None
+        if callable(getattr(BACKEND_REGISTRY[backend_name], "route", None)):
+            self._router = BACKEND_REGISTRY[backend_name]()
+        self.last_decisions: List[Any] = []
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _resolve(
+        self, ir_modules: Sequence[QModule], parameters: Optional[Mapping[str, float]], exact: bool
+    ) -> Tuple[List[QModule], List[str], Optional[Mapping[str, float]]]:
+        """Returns the modules to run, the backend for each, and the parameters still to pass on."""
+        if self._router is None:
+            self.last_decisions = []
+            return list(ir_modules), [self.backend_name] * len(ir_modules), parameters
+        # Bind first so the router sees numeric angles; the workers then get plain circuits
+        modules = [self.bind_parameters(module, parameters) for module in ir_modules]
+        self.last_decisions = [self._router.route(module, exact) for module in modules]
+        return modules, [decision.backend for decision in self.last_decisions], None
+
+    def execute(
+        self,
+        ir_module: QModule,
+        shots: int = 1024,
+        seed: Optional[int] = None,
+        parameters: Optional[Mapping[str, float]] = None,
+        exact: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Executes ``ir_module`` as ``shards`` independent runs and returns merged counts.
+        Without a seed, a random base seed is drawn so shards still differ.
+        ``exact`` runs need no shots, so they run once, in-process.
+        """
+        (ir_module,), (backend_name,), parameters = self._resolve([ir_module], parameters, exact)
+        if exact:
+            from hypercode.backends import get_backend
+            return get_backend(backend_name).execute(
+                ir_module, shots=shots, seed=seed, parameters=parameters, exact=True
+            )
+        self.check_parameters(ir_module, parameters)
+        base_seed = seed if seed is not None else secrets.randbits(31)
+        chunks = split_shots(shots, self.shards)
+        seeds = [derive_seed(base_seed, i) for i in range(len(chunks))]
+
+        if self.workers == 1 or len(chunks) <= 1:
+            return merge_counts(
+                _run_shard(backend_name, ir_module, n, s, parameters) for n, s in zip(chunks, seeds)
+            )
+        executor = self._get_executor()
+        futures = [
+            executor.submit(_run_shard, backend_name, ir_module, n, s, parameters) for n, s in zip(chunks, seeds)
+        ]
+        # Merge in shard order so the result dict is deterministic too
+        return merge_counts(future.result() for future in futures)
+
+    def execute_batch(
+        self,
+        ir_modules: Sequence[QModule],
+        shots: int = 1024,
+        seed: Optional[int] = None,
+        parameters: Optional[Mapping[str, float]] = None,
+        exact: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Submits the shards of every module to the pool at once, so circuits run concurrently."""
+        if self.workers == 1 or exact:
+            results, decisions = [], []
+            for module in ir_modules:
+                results.append(self.execute(module, shots=shots, seed=seed, parameters=parameters, exact=exact))
+                decisions.extend(self.last_decisions)
+            self.last_decisions = decisions
+            return results
+        modules, backend_names, parameters = self._resolve(ir_modules, parameters, exact)
+        for module in modules:
+            self.check_parameters(module, parameters)
+        base_seed = seed if seed is not None else secrets.randbits(31)
+        chunks = split_shots(shots, self.shards)
+        executor = self._get_executor()
+        futures = [
+            [
+                executor.submit(_run_shard, name, module, n, derive_seed(base_seed, i), parameters)
+                for i, n in enumerate(chunks)
+            ]
+            for module, name in zip(modules, backend_names)
+        ]
+        return [merge_counts(f.result() for f in module_futures) for module_futures in futures]
+
+    def close(self) -> None:
+        """Shuts down the worker pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "ShardedBackend":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
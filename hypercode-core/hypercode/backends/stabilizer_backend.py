@@ -0,0 +1,343 @@
+"""
+Stabilizer (CHP tableau) simulation for Clifford-only circuits.
+
+Circuits built only from H, X, Y, Z, CX, CZ, measurement and rotations by
+multiples of pi/2 can be simulated in polynomial time with the
+Aaronson-Gottesman tableau, which handles thousands of qubits where a
+statevector cannot. The tableau is bit-packed column-wise: ``x[j]`` and
+``z[j]`` are Python ints whose bit ``i`` is the X/Z component of row ``i``
+on qubit ``j``, so every gate is a handful of big-int operations and the
+row sums of a random measurement are done for all affected rows at once.
+
+The X/Z part of the tableau evolves the same way whatever the measurement
+outcomes are; only the signs depend on them. Signs are therefore kept as
+affine functions of the random measurement outcomes, so the circuit is
+simulated once and every measured bit is a known XOR of independent fair
+coins: sampling a shot is drawing those coins, not re-running the circuit.
+"""
+import math
+import random
+from collections import Counter
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .base import BaseBackend
+from hypercode.ir.params import ParamExpr
+from hypercode.ir.qir_nodes import QAlloc, QGate, QMeasure, QModule
+
+CLIFFORD_GATES = {"h", "x", "y", "z", "cx", "cz"}
+ROTATION_GATES = {"rx", "ry", "rz"}
+
+# exact=True enumerates at most 2**MAX_EXACT_RANK outcomes
+MAX_EXACT_RANK = 20
+
+
+def _popcount(value: int) -> int:
+    # int.bit_count needs Python 3.10
+    return bin(value).count("1")
+
+
+def _quarter_turns(angle: object) -> Optional[int]:
+    """Returns k if ``angle`` is k * pi/2 (mod 2 pi), else None."""
+    if isinstance(angle, ParamExpr):
+        return None
+    k = round(float(angle) / (math.pi / 2))
+    if abs(float(angle) - k * math.pi / 2) > 1e-9:
+        return None
+    return k % 4
+
+
+def is_clifford(module: QModule) -> bool:
+    """True if every gate of ``module`` can run on the stabilizer simulator."""
+    for instr in module.instructions:
+        if isinstance(instr, QGate):
+            name = instr.name.lower()
+            if name in ROTATION_GATES:
+                if _quarter_turns(instr.params[0]) is None:
+                    return False
+            elif name not in CLIFFORD_GATES:
+                return False
+    return True
+
+
+class Tableau:
+    """
+    A CHP stabilizer tableau over ``num_qubits`` qubits.
+
+    Rows ``0..n-1`` are destabilizers and ``n..2n-1`` stabilizers. The sign
+    column is split into planes: ``signs[0]`` holds the constant part and
+    ``signs[k]`` the rows whose sign also flips with random outcome ``k``.
+    Measured bits are recorded the same way, as ints whose bit 0 is the
+    constant and bit ``k`` the dependence on outcome ``k``.
+    """
+
+    def __init__(self, num_qubits: int):
+        n = self.num_qubits = num_qubits
+        self.x = [1 << j for j in range(n)]  # Destabilizer j is X_j
+        self.z = [1 << (n + j) for j in range(n)]  # Stabilizer j is Z_j
+        self.signs: List[int] = [0]
+        self.outcomes: Dict[int, int] = {}  # clbit -> affine form of its last measurement
+
+    @property
+    def num_random(self) -> int:
+        """Number of measurements so far whose outcome was a fair coin."""
+        return len(self.signs) - 1
+
+    # --- Gates ---
+
+    def h(self, a: int) -> None:
+        x, z = self.x, self.z
+        self.signs[0] ^= x[a] & z[a]
+        x[a], z[a] = z[a], x[a]
+
+    def s(self, a: int) -> None:
+        x, z = self.x, self.z
+        self.signs[0] ^= x[a] & z[a]
+        z[a] ^= x[a]
+
+    def pauli_x(self, a: int) -> None:
+        self.signs[0] ^= self.z[a]
+
+    def pauli_y(self, a: int) -> None:
+        self.signs[0] ^= self.x[a] ^ self.z[a]
+
+    def pauli_z(self, a: int) -> None:
+        self.signs[0] ^= self.x[a]
+
+    def cx(self, a: int, b: int) -> None:
+        x, z = self.x, self.z
+        self.signs[0] ^= x[a] & z[b] & ~(x[b] ^ z[a])
+        x[b] ^= x[a]
+        z[a] ^= z[b]
+
+    def cz(self, a: int, b: int) -> None:
+        self.h(b)
+        self.cx(a, b)
+        self.h(b)
+
+    def rz(self, a: int, quarter_turns: int) -> None:
+        if quarter_turns == 2:
+            self.pauli_z(a)
+        elif quarter_turns:
+            self.s(a)
+            if quarter_turns == 3:
+                self.pauli_z(a)
+
+    def rx(self, a: int, quarter_turns: int) -> None:
+        self.h(a)
+        self.rz(a, quarter_turns)
+        self.h(a)
+
+    def ry(self, a: int, quarter_turns: int) -> None:
+        # RY = S . RX . S^dagger
+        self.rz(a, 3)
+        self.rx(a, quarter_turns)
+        self.s(a)
+
+    # --- Measurement ---
+
+    def measure(self, a: int, clbit: int) -> int:
+        """Measures qubit ``a`` in the Z basis into ``clbit``; returns the outcome's affine form."""
+        column = self.x[a]
+        stabilizers = column >> self.num_qubits
+        if not stabilizers:
+            form = self._determined(column)
+        else:
+            form = self._random(a, column, stabilizers)
+        self.outcomes[clbit] = form
+        return form
+
+    def _random(self, a: int, column: int, stabilizers: int) -> int:
+        # Multiply row p into every other row that anticommutes with Z_a, move
+        # row p to its destabilizer d and replace it with +-Z_a (a new coin)
+        n, x, z = self.num_qubits, self.x, self.z
+        p = (stabilizers & -stabilizers).bit_length() - 1 + n
+        d = p - n
+        p_bit, d_bit = 1 << p, 1 << d
+        rows = column & ~p_bit
+        # Per-row phase exponent (mod 4) of the row sums, bit-sliced into lo/hi
+        lo = hi = 0
+        keep = ~(p_bit | d_bit)
+        for j in range(n):
+            xj, zj = x[j], z[j]
+            xp, zp = xj & p_bit, zj & p_bit
+            if xp or zp:
+                x2, z2 = xj & rows, zj & rows
+                if xp and zp:  # Y
+                    plus, minus = z2 & ~x2, x2 & ~z2
+                elif xp:  # X
+                    plus, minus = z2 & x2, z2 & ~x2
+                else:  # Z
+                    plus, minus = x2 & ~z2, x2 & z2
+                carry = lo & plus
+                lo ^= plus
+                hi ^= carry
+                borrow = ~lo & minus
+                lo ^= minus
+                hi ^= borrow
+                if xp:
+                    xj ^= rows
+                if zp:
+                    zj ^= rows
+            x[j] = (xj & keep) | (d_bit if xp else 0)
+            z[j] = (zj & keep) | (d_bit if zp else 0)
+        z[a] |= p_bit
+
+        signs = self.signs
+        signs[0] ^= hi
+        for k, plane in enumerate(signs):
+            if plane & p_bit:
+                plane ^= rows
+            signs[k] = (plane & keep) | (d_bit if plane & p_bit else 0)
+        signs.append(p_bit)
+        return 1 << self.num_random
+
+    def _determined(self, column: int) -> int:
+        # The outcome is the sign of the product of the stabilizers paired with
+        # the destabilizers that anticommute with Z_a
+        n, x, z = self.num_qubits, self.x, self.z
+        rows = (column & ((1 << n) - 1)) << n
+        # Writing each Pauli as i^(xz) X^x Z^z, the product's phase is i^e with
+        # e = sum(x.z) - X.Z + 2 * #(Z before X), summed per qubit
+        exponent = 0
+        for j in range(n):
+            xs, zs = x[j] & rows, z[j] & rows
+            if xs and zs:
+                exponent += _popcount(xs & zs) - ((_popcount(xs) & 1) & (_popcount(zs) & 1))
+                prefix, shift, length = zs, 1, zs.bit_length()
+                while shift < length:
+                    prefix ^= prefix << shift
+                    shift <<= 1
+                exponent += 2 * (_popcount(xs & (prefix << 1)) & 1)
+        form = (exponent % 4) // 2
+        for k, plane in enumerate(self.signs):
+            form ^= (_popcount(plane & rows) & 1) << k
+        return form
+
+    # --- Sampling ---
+
+    def _clbit_dependence(self) -> Tuple[int, List[int]]:
+        """Returns the constant clbit values and, per random outcome, the clbits it flips."""
+        constant = 0
+        dependence = [0] * self.num_random
+        for clbit, form in self.outcomes.items():
+            constant |= (form & 1) << clbit
+            form >>= 1
+            while form:
+                low = form & -form
+                dependence[low.bit_length() - 1] |= 1 << clbit
+                form ^= low
+        return constant, dependence
+
+    def probabilities(self, num_clbits: int) -> Dict[str, float]:
+        """
+        Exact outcome probabilities: the outcomes are uniform over an affine
+        subspace, so each of its ``2**rank`` points has probability ``2**-rank``.
+
+        Raises:
+            ValueError: If the subspace has more than ``2**MAX_EXACT_RANK`` points.
+        """
+        constant, dependence = self._clbit_dependence()
+        basis: List[int] = []  # XOR basis, one vector per leading bit
+        for vector in dependence:
+            for b in basis:
+                vector = min(vector, vector ^ b)
+            if vector:
+                basis.append(vector)
+        if len(basis) > MAX_EXACT_RANK:
+            raise ValueError(f"Exact distribution has 2**{len(basis)} outcomes; sample instead")
+        outcomes = [constant]
+        for b in basis:
+            outcomes += [bits ^ b for bits in outcomes]
+        p = 1.0 / len(outcomes)
+        return {format(bits, f"0{num_clbits}b"): p for bits in outcomes}
+
+    def sample(self, shots: int, num_clbits: int, seed: Optional[int] = None) -> Dict[str, int]:
+        """Draws the random outcomes ``shots`` times and returns Qiskit-style counts."""
+        constant, dependence = self._clbit_dependence()
+        rng = random.Random(seed)
+        m = self.num_random
+        draws = Counter(rng.getrandbits(m) for _ in range(shots)) if m else Counter({0: shots})
+        counts: Dict[str, int] = {}
+        for coins, count in draws.items():
+            bits = constant
+            while coins:
+                low = coins & -coins
+                bits ^= dependence[low.bit_length() - 1]
+                coins ^= low
+            key = format(bits, f"0{num_clbits}b")
+            counts[key] = counts.get(key, 0) + count
+        return counts
+
+
+class StabilizerBackend(BaseBackend):
+    """
+    Executes Clifford-only circuits on a stabilizer tableau.
+
+    Circuits that are not Clifford (e.g. ``RZ(0.3)``) are handed to the
+    ``fallback`` backend, so ``get_backend("stabilizer")`` can run any
+    program; pass ``fallback=None`` to raise instead.
+
+    Counts use Qiskit's conventions: one classical bit per measurement target,
+    in order of first measurement, with bit 0 rightmost.
+    """
+
+    def __init__(self, fallback: Optional[str] = "qiskit"):
+        self.fallback = fallback
+
+    def compile(self, module: QModule) -> Tuple[Tableau, Dict[str, int]]:
+        """Simulates ``module`` once and returns the tableau and the clbit map."""
+        num_qubits = sum(instr.count for instr in module.instructions if isinstance(instr, QAlloc))
+        tableau = Tableau(num_qubits)
+        clbit_map: Dict[str, int] = {}
+        single = {"h": tableau.h, "x": tableau.pauli_x, "y": tableau.pauli_y, "z": tableau.pauli_z}
+        rotations = {"rx": tableau.rx, "ry": tableau.ry, "rz": tableau.rz}
+        for instr in module.instructions:
+            if isinstance(instr, QGate):
+                name = instr.name.lower()
+                if name in single:
+                    single[name](instr.qubits[0])
+                elif name == "cx":
+                    tableau.cx(instr.qubits[0], instr.qubits[1])
+                elif name == "cz":
+                    tableau.cz(instr.qubits[0], instr.qubits[1])
+                elif name in rotations:
+                    turns = _quarter_turns(instr.params[0])
+                    if turns is None:
+                        raise ValueError(f"{instr.name}({instr.params[0]}) is not a Clifford gate")
+                    rotations[name](instr.qubits[0], turns)
+                else:
+                    raise ValueError(f"Gate '{instr.name}' is not supported by the stabilizer backend")
+            elif isinstance(instr, QMeasure):
+                clbit = clbit_map.setdefault(instr.target, len(clbit_map))
+                tableau.measure(instr.qubit, clbit)
+        return tableau, clbit_map
+
+    def execute(
+        self,
+        ir_module: QModule,
+        shots: int = 1024,
+        seed: Optional[int] = None,
+        parameters: Optional[Mapping[str, float]] = None,
+        exact: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Runs the circuit and returns a dictionary of counts (e.g. {'00': 500, '11': 524}),
+        or with ``exact`` the outcome probabilities (e.g. {'00': 0.5, '11': 0.5}).
+
+        Raises:
+            ValueError: If the circuit is not Clifford and there is no fallback.
+        """
+        ir_module = self.bind_parameters(ir_module, parameters)
+        if not is_clifford(ir_module):
+            if self.fallback is None:
+                raise ValueError(f"Module '{ir_module.name}' is not a Clifford circuit")
+            from hypercode.backends import get_backend
+            if exact:
+                return get_backend(self.fallback).execute(ir_module, shots=shots, seed=seed, exact=True)
+            return get_backend(self.fallback).execute(ir_module, shots=shots, seed=seed)
+        tableau, clbit_map = self.compile(ir_module)
+        if not clbit_map:
+            return {}
+        if exact:
+            return tableau.probabilities(len(clbit_map))
+        return tableau.sample(shots, len(clbit_map), seed=seed)
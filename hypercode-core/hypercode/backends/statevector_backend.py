@@ -0,0 +1,215 @@
+"""
+Dependency-free statevector simulation for small circuits.
+
+Holds the full ``2**n`` complex amplitude vector in a Python list, so it is
+meant for circuits of up to about 16 qubits, where starting a Qiskit job
+costs more than the simulation itself. Single-qubit gates update the two
+halves of each amplitude pair with slice assignments rather than per-index
+loops.
+
+When every measurement comes after the last gate on its qubit, the state is
+computed once and all shots are sampled from its probabilities. Circuits
+with mid-circuit measurement are simulated one shot at a time, or, with
+``exact=True``, by following both branches of every measurement.
+"""
+import cmath
+import math
+import random
+from collections import Counter
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .base import BaseBackend
+from .probabilities import PROBABILITY_CUTOFF, marginalize, measurement_sources, sample_counts
+from hypercode.ir.qir_nodes import QAlloc, QGate, QMeasure, QModule
+
+MAX_QUBITS = 24
+
+_SQRT_HALF = math.sqrt(0.5)
+
+# 2x2 unitaries as (m00, m01, m10, m11)
+_FIXED_GATES: Dict[str, Tuple[complex, complex, complex, complex]] = {
+    "h": (_SQRT_HALF, _SQRT_HALF, _SQRT_HALF, -_SQRT_HALF),
+    "x": (0, 1, 1, 0),
+    "y": (0, -1j, 1j, 0),
+    "z": (1, 0, 0, -1),
+}
+
+
+def _rotation(name: str, theta: float) -> Tuple[complex, complex, complex, complex]:
+    c, s = math.cos(theta / 2), math.sin(theta / 2)
+    if name == "rx":
+        return (c, -1j * s, -1j * s, c)
+    if name == "ry":
+        return (c, -s, s, c)
+    return (cmath.exp(-0.5j * theta), 0, 0, cmath.exp(0.5j * theta))
+
+
+def has_terminal_measurements(module: QModule) -> bool:
+    """True if no gate acts on a qubit after that qubit has been measured."""
+    measured = set()
+    for instr in module.instructions:
+        if isinstance(instr, QMeasure):
+            measured.add(instr.qubit)
+        elif isinstance(instr, QGate) and measured.intersection(instr.qubits):
+            return False
+    return True
+
+
+class StatevectorBackend(BaseBackend):
+    """
+    Simulates circuits exactly on a dense statevector.
+
+    Counts use Qiskit's conventions: one classical bit per measurement target,
+    in order of first measurement, with bit 0 rightmost.
+    """
+
+    def __init__(self, max_qubits: int = MAX_QUBITS):
+        self.max_qubits = max_qubits
+
+    # --- State evolution ---
+
+    @staticmethod
+    def _apply_1q(state: List[complex], a: int, m: Tuple[complex, complex, complex, complex]) -> None:
+        m00, m01, m10, m11 = m
+        stride = 1 << a
+        step = stride << 1
+        size = len(state)
+        if stride >= size // step:
+            # Few, long runs: each block holds a contiguous lower and upper half
+            for base in range(0, size, step):
+                lower = state[base:base + stride]
+                upper = state[base + stride:base + step]
+                state[base:base + stride] = [m00 * u + m01 * v for u, v in zip(lower, upper)]
+                state[base + stride:base + step] = [m10 * u + m11 * v for u, v in zip(lower, upper)]
+        else:
+            # Many, short runs: stride through the vector once per offset instead
+            for offset in range(stride):
+                lower = state[offset::step]
+                upper = state[offset + stride::step]
+                state[offset::step] = [m00 * u + m01 * v for u, v in zip(lower, upper)]
+                state[offset + stride::step] = [m10 * u + m11 * v for u, v in zip(lower, upper)]
+
+    @staticmethod
+    def _apply_2q(state: List[complex], name: str, control: int, target: int) -> None:
+        c_bit, t_bit = 1 << control, 1 << target
+        for i in range(len(state)):
+            if i & c_bit and not i & t_bit:
+                if name == "cx":
+                    j = i | t_bit
+                    state[i], state[j] = state[j], state[i]
+                else:  # cz
+                    state[i | t_bit] = -state[i | t_bit]
+
+    def _apply(self, state: List[complex], gate: QGate) -> None:
+        name = gate.name.lower()
+        if name in _FIXED_GATES:
+            self._apply_1q(state, gate.qubits[0], _FIXED_GATES[name])
+        elif name in ("rx", "ry", "rz"):
+            self._apply_1q(state, gate.qubits[0], _rotation(name, float(gate.params[0])))
+        elif name in ("cx", "cz"):
+            self._apply_2q(state, name, gate.qubits[0], gate.qubits[1])
+        else:
+            raise ValueError(f"Gate '{gate.name}' is not supported by the statevector backend")
+
+    def _prepare(self, module: QModule) -> Tuple[int, Dict[str, int]]:
+        num_qubits = sum(instr.count for instr in module.instructions if isinstance(instr, QAlloc))
+        if num_qubits > self.max_qubits:
+            raise ValueError(
+                f"Module '{module.name}' needs {num_qubits} qubits; the statevector backend is limited to {self.max_qubits}"
+            )
+        clbit_map, _ = measurement_sources(module)
+        return num_qubits, clbit_map
+
+    def final_state(self, module: QModule) -> List[complex]:
+        """Applies every gate of ``module`` (measurements are ignored) to |0...0>."""
+        num_qubits, _ = self._prepare(module)
+        state: List[complex] = [0j] * (1 << num_qubits)
+        state[0] = 1 + 0j
+        for instr in module.instructions:
+            if isinstance(instr, QGate):
+                self._apply(state, instr)
+        return state
+
+    # --- Execution ---
+
+    def execute(
+        self,
+        ir_module: QModule,
+        shots: int = 1024,
+        seed: Optional[int] = None,
+        parameters: Optional[Mapping[str, float]] = None,
+        exact: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Runs the circuit and returns a dictionary of counts (e.g. {'00': 500, '11': 524}),
+        or with ``exact`` the outcome probabilities (e.g. {'00': 0.5, '11': 0.5}).
+        """
+        ir_module = self.bind_parameters(ir_module, parameters)
+        if exact:
+            return self.probabilities(ir_module)
+        num_qubits, clbit_map = self._prepare(ir_module)
+        if not clbit_map:
+            return {}
+        if has_terminal_measurements(ir_module):
+            return sample_counts(self.probabilities(ir_module), shots, seed)
+        return self._sample_trajectories(ir_module, num_qubits, clbit_map, shots, random.Random(seed))
+
+    def probabilities(self, module: QModule) -> Dict[str, float]:
+        """Exact probabilities of the measured classical bits."""
+        num_qubits, clbit_map = self._prepare(module)
+        if not clbit_map:
+            return {}
+        if not has_terminal_measurements(module):
+            return self._branch_probabilities(module, num_qubits, clbit_map)
+        _, sources = measurement_sources(module)
+        state = self.final_state(module)
+        return marginalize((a.real * a.real + a.imag * a.imag for a in state), sources, len(clbit_map))
+
+    def _branch_probabilities(self, module: QModule, num_qubits: int, clbit_map: Dict[str, int]) -> Dict[str, float]:
+        # Each branch is (unnormalised state, classical bits); its weight is the state's squared norm
+        initial: List[complex] = [0j] * (1 << num_qubits)
+        initial[0] = 1 + 0j
+        branches: List[Tuple[List[complex], int]] = [(initial, 0)]
+        for instr in module.instructions:
+            if isinstance(instr, QGate):
+                for state, _ in branches:
+                    self._apply(state, instr)
+            elif isinstance(instr, QMeasure):
+                mask, clbit = 1 << instr.qubit, clbit_map[instr.target]
+                split: List[Tuple[List[complex], int]] = []
+                for state, bits in branches:
+                    for outcome in (0, 1):
+                        projected = [a if bool(i & mask) == bool(outcome) else 0j for i, a in enumerate(state)]
+                        if sum(abs(a) ** 2 for a in projected) >= PROBABILITY_CUTOFF:
+                            split.append((projected, (bits & ~(1 << clbit)) | (outcome << clbit)))
+                branches = split
+        width = len(clbit_map)
+        result: Dict[str, float] = {}
+        for state, bits in branches:
+            key = format(bits, f"0{width}b")
+            result[key] = result.get(key, 0.0) + sum(abs(a) ** 2 for a in state)
+        return result
+
+    def _sample_trajectories(
+        self, module: QModule, num_qubits: int, clbit_map: Dict[str, int], shots: int, rng: random.Random
+    ) -> Dict[str, int]:
+        width = len(clbit_map)
+        counts: Counter = Counter()
+        for _ in range(shots):
+            state: List[complex] = [0j] * (1 << num_qubits)
+            state[0] = 1 + 0j
+            bits = 0
+            for instr in module.instructions:
+                if isinstance(instr, QGate):
+                    self._apply(state, instr)
+                elif isinstance(instr, QMeasure):
+                    mask = 1 << instr.qubit
+                    p1 = sum(abs(a) ** 2 for i, a in enumerate(state) if i & mask)
+                    outcome = 1 if rng.random() < p1 else 0
+                    norm = math.sqrt(p1 if outcome else 1.0 - p1)
+                    for i in range(len(state)):
+                        state[i] = state[i] / norm if bool(i & mask) == bool(outcome) else 0j
+                    clbit = clbit_map[instr.target]
+                    bits = (bits & ~(1 << clbit)) | (outcome << clbit)
+            counts[format(bits, f"0{width}b")] += 1
+        return dict(counts)
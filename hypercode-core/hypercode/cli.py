@@ -8,6 +8,8 @@ from typing import Optional
 from hypercode.parser.parser import parse
 from hypercode.ast.nodes import QuantumCircuitDecl, DataDecl, Statement
 from hypercode.ir.lower_quantum import lower_circuit
+from hypercode.ir.optimize import optimize_module
+from hypercode.ir.qir_nodes import QIR
 from hypercode.interpreter.evaluator import Evaluator
 
 # ANSI color codes for better output
@@ -44,6 +46,8 @@ def run_command(args: argparse.Namespace) -> None:
     backend = args.backend
     shots = getattr(args, 'shots', 1024)
     seed = getattr(args, 'seed', None)
+    workers = getattr(args, 'workers', 1)
+    exact = getattr(args, 'exact', False)
     
     print_header(f"RUNNING HYPERCODE PROGRAM: {file_path}")
     
@@ -52,8 +56,12 @@ def run_command(args: argparse.Namespace) -> None:
             source = f.read()
             
             print_info(f"Backend: {backend}")
-            if backend == "qiskit":
+            if backend in ("qiskit", "stabilizer", "statevector", "auto"):
                 print_info(f"Shots: {shots}, Seed: {seed}")
+                if workers > 1:
+                    print_info(f"Workers: {workers}")
+                if exact:
+                    print_info("Exact probabilities (no sampling)")
             
             # Parse
             try:
@@ -69,9 +77,14 @@ def run_command(args: argparse.Namespace) -> None:
             evaluator = Evaluator(
                 backend_name=backend,
                 shots=shots,
-                seed=seed
+                seed=seed,
+                workers=workers,
+                exact=exact
             )
-            evaluator.evaluate(program)
+            try:
+                evaluator.evaluate(program)
+            finally:
+                evaluator.close()
             
             print_success("Execution completed successfully")
             
@@ -129,20 +142,32 @@ def qir_command(args: argparse.Namespace) -> None:
             
             # Find and Lower Quantum Circuits
             found_quantum = False
+            qir = QIR()
             for stmt in program.statements:
                 if isinstance(stmt, QuantumCircuitDecl):
                     found_quantum = True
                     print_info(f"Lowering Circuit: {stmt.name}")
                     try:
                         ir_module = lower_circuit(stmt, constants)
+                        if args.optimize:
+                            ir_module, stats = optimize_module(ir_module)
+                            print_info(
+                                f"Optimized: {stats.gates_before} -> {stats.gates_after} gates "
+                                f"({stats.cancelled} cancelled, {stats.merged} merged, {stats.dropped} dropped)"
+                            )
                         print(str(ir_module))
                         print("-" * 40)
+                        qir.add_module(ir_module)
                     except Exception as e:
                         print_error(f"Failed to lower circuit {stmt.name}: {e}")
             
             if not found_quantum:
                 print_info("No quantum circuits found in file.")
             else:
+                if args.emit_binary is not None:
+                    output = args.emit_binary or str(Path(file_path).with_suffix(".hqir"))
+                    qir.save(output)
+                    print_info(f"Wrote binary QIR ({len(qir.modules)} modules) to {output}")
                 print_success("QIR generation completed")
 
     except FileNotFoundError:
@@ -182,12 +207,17 @@ def main() -> None:
     # qir command
     qir_parser = subparsers.add_parser("qir", help="Generate Quantum IR from HyperCode file")
     qir_parser.add_argument("file", help="Input .hc file")
+    qir_parser.add_argument("--optimize", action="store_true", help="Run the peephole gate optimiser")
+    qir_parser.add_argument(
+        "--emit-binary", nargs="?", const="", default=None, metavar="PATH",
+        help="Also write the QIR in binary .hqir format (default: <file>.hqir)"
+    )
     qir_parser.set_defaults(func=qir_command)
     
     # run command
     run_parser = subparsers.add_parser("run", help="Run HyperCode program")
     run_parser.add_argument("file", help="Input .hc file")
-    run_parser.add_argument("--backend", choices=["qiskit", "classical", "molecular"], default="qiskit", help="Backend to use for execution")
+    run_parser.add_argument("--backend", choices=["qiskit", "stabilizer", "statevector", "auto", "classical", "molecular"], default="qiskit", help="Backend to use for execution")
     run_parser.set_defaults(func=run_command)
     
     # quantum subcommand
@@ -199,7 +229,14 @@ def main() -> None:
     q_run_parser.add_argument("file", help="Input .hc file")
     q_run_parser.add_argument("--shots", type=int, default=1024, help="Number of shots (default: 1024)")
     q_run_parser.add_argument("--seed", type=int, default=None, help="Simulator seed")
-    q_run_parser.set_defaults(func=run_command, backend="qiskit")
+    q_run_parser.add_argument("--workers", type=int, default=1, help="Split shots across N worker processes (default: 1)")
+    q_run_parser.add_argument("--exact", action="store_true", help="Report exact outcome probabilities instead of sampled counts")
+    q_run_parser.add_argument(
+        "--backend", choices=["qiskit", "stabilizer", "statevector", "auto"], default="qiskit",
+        help="Simulator: 'stabilizer' runs Clifford-only circuits on a tableau, "
+             "'auto' picks the fastest backend per circuit (default: qiskit)"
+    )
+    q_run_parser.set_defaults(func=run_command)
 
     # version command
     version_parser = subparsers.add_parser("version", help="Show version information")
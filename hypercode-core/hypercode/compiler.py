@@ -1,113 +1,141 @@
-from typing import Dict, List, Any
+import re
+from typing import Callable, Dict, List, Any, Set, Tuple, Union
 
-def compile_flow(flow_data: Dict[str, Any]) -> str:
+from hypercode.flow_graph import FlowGraph, as_flow_graph
+
+def compile_flow(flow_data: Union[FlowGraph, Dict[str, Any]]) -> str:
     """
     Compiles a React Flow JSON object into HyperCode source code.
-    
+
+    Nodes are emitted in a single topological pass, so every statement only
+    references variables declared above it (e.g. PCR -> CRISPR -> PCR chains).
+    Sequence declarations are hoisted to the top of the program.
+
     Args:
-        flow_data: The JSON representation of the flow graph.
-        
+        flow_data: The JSON representation of the flow graph, or an already
+            validated FlowGraph.
+
     Returns:
         A string containing the generated HyperCode program.
+
+    Raises:
+        ValueError: If the graph is malformed or contains a cycle.
     """
-    nodes = flow_data.get("nodes", [])
-    edges = flow_data.get("edges", [])
-    
-    # Simple mapping of node IDs to variable names for reference
-    id_to_var = {}
-    
+    graph = as_flow_graph(flow_data)
+    order = graph.topological_order()
+    if len(order) != len(graph.nodes):
+        emitted = set(order)
+        stuck = [node["id"] for node in graph.nodes if node["id"] not in emitted]
+        raise ValueError(f"Flow graph contains a cycle through nodes: {', '.join(stuck)}")
+
+    # Node IDs -> variable names, and every name handed out so far
+    id_to_var: Dict[str, str] = {}
+    used_names: Set[str] = set()
+    next_suffix: Dict[str, int] = {}
+
+    declarations: List[str] = []
+    operations: List[str] = []
+
+    for node_id in order:
+        node = graph.nodes_by_id[node_id]
+        emitter = _EMITTERS.get(node["type"])
+        if emitter is None:
+            continue
+        data = node["data"]
+        default_name, emit = emitter
+        base_name = _sanitize_name(data.get("label", default_name)) or default_name
+        var_name = _unique_name(base_name, used_names, next_suffix)
+        id_to_var[node_id] = var_name
+        target = declarations if node["type"] == "sequence" else operations
+        target.extend(emit(node_id, data, var_name, graph, id_to_var))
+
     code_lines = []
     code_lines.append("# HyperCode Generated from HyperFlow")
     code_lines.append("# ----------------------------------")
     code_lines.append("")
+    code_lines.extend(declarations)
+    code_lines.append("")
+    code_lines.extend(operations)
+    return "\n".join(code_lines)
 
-    # 1. First Pass: Identify Sources (Sequence Nodes)
-    # In a real compiler, we would topologically sort. 
-    # For MVP, we process by type priority: Sequence -> PCR -> CRISPR
-    
-    # Process Sequence Nodes
-    for node in nodes:
-        if node["type"] == "sequence":
-            var_name = _sanitize_name(node["data"].get("label", "seq"))
-            id_to_var[node["id"]] = var_name
-            sequence = node["data"].get("sequence", "")
-            code_lines.append(f'dna {var_name} = "{sequence}"')
+# --- Per-node-type emitters ---
+# Each returns the HyperCode lines for one node, given its unique variable name.
 
-    code_lines.append("")
+def _emit_sequence(node_id: str, data: Dict, var_name: str, graph: FlowGraph, id_to_var: Dict) -> List[str]:
+    sequence = data.get("sequence", "")
+    return [f'dna {var_name} = "{sequence}"']
 
-    # Process Enzyme/Restriction Nodes
-    for node in nodes:
-        if node["type"] == "enzyme":
-            # Find input source
-            input_var = _find_input_var(node["id"], edges, id_to_var)
-            var_name = _sanitize_name(node["data"].get("label", "fragments"))
-            id_to_var[node["id"]] = var_name
-            
-            enzyme_name = node["data"].get("enzyme", "EcoRI")
-            code_lines.append('# Restriction Digest')
-            code_lines.append(f'list {var_name} = digest({input_var}, "{enzyme_name}")')
-
-    # Process PCR Nodes
-    for node in nodes:
-        if node["type"] == "pcr":
-            input_var = _find_input_var(node["id"], edges, id_to_var)
-            var_name = _sanitize_name(node["data"].get("label", "amplicon"))
-            id_to_var[node["id"]] = var_name
-            
-            fwd = node["data"].get("forwardPrimer", "")
-            rev = node["data"].get("reversePrimer", "")
-            
-            code_lines.append('# PCR Amplification')
-            code_lines.append(f'dna {var_name} = pcr({input_var}, fwd="{fwd}", rev="{rev}")')
-
-    # Process CRISPR Nodes
-    for node in nodes:
-        if node["type"] == "crispr":
-            input_var = _find_input_var(node["id"], edges, id_to_var)
-            var_name = _sanitize_name(node["data"].get("label", "edited_dna"))
-            id_to_var[node["id"]] = var_name
-            
-            guide = node["data"].get("guideRNA", "")
-            pam = node["data"].get("pam", "")
-            
-            code_lines.append('# CRISPR/Cas9 Editing')
-            code_lines.append(f'dna {var_name} = crispr({input_var}, gRNA="{guide}", pam="{pam}")')
-
-    # Process Golden Gate Nodes
-    for node in nodes:
-        if node["type"] == "goldengate":
-            # Golden Gate accepts multiple inputs
-            input_vars = _find_input_vars(node["id"], edges, id_to_var)
-            var_name = _sanitize_name(node["data"].get("label", "plasmid"))
-            id_to_var[node["id"]] = var_name
-            
-            enzyme = node["data"].get("enzyme", "BsaI")
-            parts_str = ", ".join(input_vars)
-            
-            code_lines.append('# Golden Gate Assembly')
-            code_lines.append(f'dna {var_name} = assembly([{parts_str}], method="GoldenGate", enzyme="{enzyme}")')
+def _emit_enzyme(node_id: str, data: Dict, var_name: str, graph: FlowGraph, id_to_var: Dict) -> List[str]:
+    input_var = _find_input_var(node_id, graph, id_to_var)
+    enzyme_name = data.get("enzyme", "EcoRI")
+    return [
+        '# Restriction Digest',
+        f'list {var_name} = digest({input_var}, "{enzyme_name}")',
+    ]
 
-    return "\n".join(code_lines)
+def _emit_pcr(node_id: str, data: Dict, var_name: str, graph: FlowGraph, id_to_var: Dict) -> List[str]:
+    input_var = _find_input_var(node_id, graph, id_to_var)
+    fwd = data.get("forwardPrimer", "")
+    rev = data.get("reversePrimer", "")
+    return [
+        '# PCR Amplification',
+        f'dna {var_name} = pcr({input_var}, fwd="{fwd}", rev="{rev}")',
+    ]
+
+def _emit_crispr(node_id: str, data: Dict, var_name: str, graph: FlowGraph, id_to_var: Dict) -> List[str]:
+    input_var = _find_input_var(node_id, graph, id_to_var)
+    guide = data.get("guideRNA", "")
+    pam = data.get("pam", "")
+    return [
+        '# CRISPR/Cas9 Editing',
+        f'dna {var_name} = crispr({input_var}, gRNA="{guide}", pam="{pam}")',
+    ]
+
+def _emit_goldengate(node_id: str, data: Dict, var_name: str, graph: FlowGraph, id_to_var: Dict) -> List[str]:
+    # Golden Gate accepts multiple inputs
+    parts_str = ", ".join(_find_input_vars(node_id, graph, id_to_var))
+    enzyme = data.get("enzyme", "BsaI")
+    return [
+        '# Golden Gate Assembly',
+        f'dna {var_name} = assembly([{parts_str}], method="GoldenGate", enzyme="{enzyme}")',
+    ]
+
+# node type -> (default variable name, emitter)
+_EMITTERS: Dict[str, Tuple[str, Callable[..., List[str]]]] = {
+    "sequence": ("seq", _emit_sequence),
+    "enzyme": ("fragments", _emit_enzyme),
+    "pcr": ("amplicon", _emit_pcr),
+    "crispr": ("edited_dna", _emit_crispr),
+    "goldengate": ("plasmid", _emit_goldengate),
+}
 
 def _sanitize_name(label: str) -> str:
     """Converts a label into a valid variable name."""
-    return label.lower().replace(" ", "_").replace("-", "_").replace("+", "_").replace("(", "").replace(")", "")
+    name = label.lower().replace(" ", "_").replace("-", "_").replace("+", "_").replace("(", "").replace(")", "")
+    name = re.sub(r"[^0-9a-z_]", "", name)
+    if name[:1].isdigit():
+        name = f"_{name}"
+    return name
+
+def _unique_name(base: str, used_names: Set[str], next_suffix: Dict[str, int]) -> str:
+    """Returns ``base``, or ``base_2``, ``base_3``... if it is already taken, and records it."""
+    name = base
+    suffix = next_suffix.get(base, 2)
+    while name in used_names:
+        name = f"{base}_{suffix}"
+        suffix += 1
+    next_suffix[base] = suffix
+    used_names.add(name)
+    return name
 
-def _find_input_var(node_id: str, edges: List[Dict], id_to_var: Dict) -> str:
+def _find_input_var(node_id: str, graph: FlowGraph, id_to_var: Dict) -> str:
     """Finds the variable name of the node connected to the input of this node."""
-    for edge in edges:
-        if edge["target"] == node_id:
-            source_id = edge["source"]
-            return id_to_var.get(source_id, "unknown_source")
-    return "null"
+    source_id = graph.source(node_id)
+    if source_id is None:
+        return "null"
+    return id_to_var.get(source_id, "unknown_source")
 
-def _find_input_vars(node_id: str, edges: List[Dict], id_to_var: Dict) -> List[str]:
+def _find_input_vars(node_id: str, graph: FlowGraph, id_to_var: Dict) -> List[str]:
     """Finds all variable names connected to the input of this node."""
-    input_vars = []
-    # Find edges targeting this node
-    target_edges = [e for e in edges if e["target"] == node_id]
-    # Sort edges if needed? (For now rely on order in list, or source Y pos if we had it)
-    for edge in target_edges:
-        source_id = edge["source"]
-        input_vars.append(id_to_var.get(source_id, "unknown_source"))
-    return input_vars
+    # Inputs keep edge order (we don't have the source Y position to sort by)
+    return [id_to_var.get(source_id, "unknown_source") for source_id in graph.sources(node_id)]
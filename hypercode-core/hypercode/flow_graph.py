@@ -0,0 +1,127 @@
+"""
+Validated, indexed representation of a HyperFlow (React Flow) graph.
+
+Both the compiler and the simulator consume a ``FlowGraph`` so that the
+raw editor JSON is checked and indexed exactly once per request.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+
+@dataclass
+class FlowGraph:
+    """
+    A HyperFlow graph with node and edge lookups precomputed.
+
+    Attributes:
+        nodes: Nodes in the order they were received from the editor.
+        edges: Edges in the order they were received from the editor.
+        nodes_by_id: Node ID -> node dictionary.
+        in_edges: Node ID -> edges targeting that node (in edge order).
+        out_edges: Node ID -> edges leaving that node (in edge order).
+    """
+    nodes: List[Dict[str, Any]]
+    edges: List[Dict[str, Any]]
+    nodes_by_id: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    in_edges: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    out_edges: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, flow_data: Dict[str, Any]) -> "FlowGraph":
+        """
+        Validates a flow dictionary and builds its indexes.
+
+        Args:
+            flow_data: The JSON representation of the flow graph.
+
+        Returns:
+            A FlowGraph ready to be compiled or simulated.
+
+        Raises:
+            ValueError: If a node or edge is malformed, a node ID is duplicated,
+                or an edge references a node that does not exist.
+        """
+        nodes = flow_data.get("nodes") or []
+        edges = flow_data.get("edges") or []
+
+        nodes_by_id: Dict[str, Dict[str, Any]] = {}
+        in_edges: Dict[str, List[Dict[str, Any]]] = {}
+        out_edges: Dict[str, List[Dict[str, Any]]] = {}
+
+        for index, node in enumerate(nodes):
+            if not isinstance(node, dict) or "id" not in node or "type" not in node:
+                raise ValueError(f"Node {index} must be an object with 'id' and 'type'")
+            if not isinstance(node.get("data", {}), dict):
+                raise ValueError(f"Node '{node['id']}' has non-object 'data'")
+            node_id = node["id"]
+            if node_id in nodes_by_id:
+                raise ValueError(f"Duplicate node id '{node_id}'")
+            nodes_by_id[node_id] = node
+            in_edges[node_id] = []
+            out_edges[node_id] = []
+
+        for index, edge in enumerate(edges):
+            if not isinstance(edge, dict) or "source" not in edge or "target" not in edge:
+                raise ValueError(f"Edge {index} must be an object with 'source' and 'target'")
+            source, target = edge["source"], edge["target"]
+            if source not in nodes_by_id:
+                raise ValueError(f"Edge {index} references unknown source node '{source}'")
+            if target not in nodes_by_id:
+                raise ValueError(f"Edge {index} references unknown target node '{target}'")
+            out_edges[source].append(edge)
+            in_edges[target].append(edge)
+
+        return cls(
+            nodes=list(nodes),
+            edges=list(edges),
+            nodes_by_id=nodes_by_id,
+            in_edges=in_edges,
+            out_edges=out_edges,
+        )
+
+    def sources(self, node_id: str) -> List[str]:
+        """Returns the IDs of all nodes feeding into ``node_id``, in edge order."""
+        return [edge["source"] for edge in self.in_edges.get(node_id, ())]
+
+    def source(self, node_id: str) -> Optional[str]:
+        """Returns the ID of the first node feeding into ``node_id``, if any."""
+        incoming = self.in_edges.get(node_id)
+        return incoming[0]["source"] if incoming else None
+
+    def targets(self, node_id: str) -> List[str]:
+        """Returns the IDs of all nodes fed by ``node_id``, in edge order."""
+        return [edge["target"] for edge in self.out_edges.get(node_id, ())]
+
+    def topological_order(self) -> List[str]:
+        """
+        Orders node IDs so every node comes after all of its inputs (Kahn's algorithm).
+
+        Ties are broken by the order nodes were received, so independent
+        nodes keep their editor order. Runs in O(N + E).
+
+        Returns:
+            Node IDs in dependency order. Nodes that sit on a cycle, or
+            downstream of one, are omitted; compare the length with
+            ``len(self.nodes)`` to detect that case.
+        """
+        in_degree = {node_id: len(edges) for node_id, edges in self.in_edges.items()}
+        ready = deque(node["id"] for node in self.nodes if in_degree[node["id"]] == 0)
+        order: List[str] = []
+        while ready:
+            node_id = ready.popleft()
+            order.append(node_id)
+            for edge in self.out_edges[node_id]:
+                target = edge["target"]
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    ready.append(target)
+        return order
+
+
+def as_flow_graph(flow: Union[FlowGraph, Dict[str, Any]]) -> FlowGraph:
+    """Returns ``flow`` unchanged if it is already a FlowGraph, else validates and indexes it."""
+    if isinstance(flow, FlowGraph):
+        return flow
+    return FlowGraph.from_dict(flow)
@@ -5,7 +5,7 @@ This module provides the core evaluation logic for the HyperCode language,
 including quantum circuit execution and classical program evaluation.
 """
 
-from typing import Dict, Any, Optional, Union, List, cast
+from typing import Dict, Any, Iterable, Optional, Tuple, Union, List, cast
 
 from hypercode.ast.nodes import (
     Program, Statement, DataDecl, SetStmt, PrintStmt, CheckStmt, Block,
@@ -13,8 +13,9 @@ from hypercode.ast.nodes import (
     QuantumCircuitDecl, QGate, QMeasure, Node
 )
 from hypercode.ir.lower_quantum import lower_circuit
+from hypercode.ir.optimize import optimize_module
 from hypercode.ir.qir_nodes import QModule, QIR, QInstr
-from hypercode.backends import get_backend, Backend
+from hypercode.backends import get_backend, Backend, ShardedBackend
 from hypercode.results import ExecutionResult
 
 
@@ -44,13 +45,27 @@ def run_qiskit(module: Union[QModule, QIR], shots: int = 1024, seed: Optional[in
     backend = QiskitBackend()
     return backend.execute(module, shots=shots, seed=seed)
 
+def _merge_parameters(bindings: Iterable[Optional[Dict[str, float]]]) -> Optional[Dict[str, float]]:
+    """Merges per-circuit parameter values into one mapping, or returns None if any conflict."""
+    merged: Dict[str, float] = {}
+    for values in bindings:
+        for name, value in (values or {}).items():
+            if merged.setdefault(name, value) != value:
+                return None
+    return merged
+
 class Evaluator:
     def __init__(
         self, 
         backend_name: str = "qiskit", 
         shots: int = 1024, 
         seed: Optional[int] = None, 
-        use_quantum_sim: bool = True
+        use_quantum_sim: bool = True,
+        optimize: bool = True,
+        workers: int = 1,
+        batch: bool = True,
+        symbolic_params: bool = False,
+        exact: bool = False
     ) -> None:
         """Initialize the HyperCode evaluator with the specified backend and configuration.
         
@@ -58,10 +73,22 @@ class Evaluator:
         and quantum operations based on the provided backend.
 
         Args:
-            backend_name: Name of the backend to use ("qiskit", "molecular", etc.)
+            backend_name: Name of the backend to use ("qiskit", "stabilizer", "auto", etc.)
             shots: Number of shots to run quantum circuits for
             seed: Optional random seed for reproducibility
             use_quantum_sim: Whether to use a quantum simulator (for backward compatibility with tests)
+            optimize: Whether to run the peephole gate optimiser on lowered circuits
+            workers: Number of processes to split each circuit's shots across (1 runs in-process)
+            batch: Defer circuit execution and submit all pending circuits as one batch,
+                either when a ``<name>_results`` variable is first needed, before the next
+                ``@print`` or ``@check``, or at the end of ``evaluate``; with ``False`` each
+                circuit runs as soon as it is declared. Output is the same either way
+            symbolic_params: Lower gate parameters that reference variables as symbolic
+                parameters and bind the variables' current values at execution time, so a
+                circuit declared repeatedly (e.g. in a parameter sweep) is lowered,
+                optimised and transpiled only once
+            exact: Store exact outcome probabilities in ``<name>_results`` instead of
+                sampled counts (``shots`` is then ignored)
             
         Example:
             >>> evaluator = Evaluator(backend_name="qiskit", shots=1000)
@@ -69,10 +96,20 @@ class Evaluator:
         """
         self.variables: Dict[str, Any] = {}
         self.output: List[str] = []
-        self.qir: Optional[QIR] = None  # To store the last generated QIR
+        self.qir: Optional[QIR] = None  # Every circuit lowered so far
+        self.metadata: Dict[str, Any] = {}  # Execution details, e.g. per-circuit routing decisions
         self.backend: Optional[Backend] = None
         self.shots = shots
         self.seed = seed
+        self.optimize = optimize
+        self.batch = batch
+        self.symbolic_params = symbolic_params
+        self.exact = exact
+        # Lowered circuits waiting to be submitted to the backend, with their parameter values
+        # and their "QuantumCircuit ..." line (printed together with the results)
+        self._pending: List[Tuple[QModule, Optional[Dict[str, float]], str]] = []
+        # id(circuit statement) -> (statement, lowered module), for symbolic_params
+        self._lowered: Dict[int, Tuple[QuantumCircuitDecl, QModule]] = {}
         
         # For backward compatibility with tests
         if not use_quantum_sim:
@@ -81,10 +118,19 @@ class Evaluator:
         # Instantiate the backend if not in classical mode
         if backend_name != "classical":
             try:
-                self.backend = get_backend(backend_name)
+                if workers > 1:
+                    self.backend = ShardedBackend(backend_name, workers=workers)
+                else:
+                    self.backend = get_backend(backend_name)
             except ValueError as e:
                 print(f"Warning: {e}")
 
+    def close(self) -> None:
+        """Release backend resources such as worker processes."""
+        close = getattr(self.backend, "close", None)
+        if callable(close):
+            close()
+
     def evaluate(self, node: Program) -> None:
         """Evaluate a complete program by executing each statement in sequence.
         
@@ -97,6 +143,7 @@ class Evaluator:
         try:
             for stmt in node.statements:
                 self.execute(stmt)
+            self.flush_quantum()
         except Exception as e:
             raise RuntimeError(f"Error during evaluation: {e}") from e
 
@@ -116,6 +163,8 @@ class Evaluator:
                 self.variables[stmt.name] = value
                 
             elif isinstance(stmt, SetStmt):
+                if stmt.name not in self.variables and self._pending:
+                    self.flush_quantum()
                 if stmt.name not in self.variables:
                     raise NameError(
                         f"Variable '{stmt.name}' not defined. Use @data to define it first."
@@ -124,12 +173,13 @@ class Evaluator:
                 self.variables[stmt.name] = value
                 
             elif isinstance(stmt, PrintStmt):
+                # Keep output in program order: earlier circuits print their results first
+                self.flush_quantum()
                 value = self.evaluate_expr(stmt.expr)
-                output = str(value)
-                print(output)
-                self.output.append(output)
+                self._emit(str(value))
                 
             elif isinstance(stmt, CheckStmt):
+                self.flush_quantum()
                 condition = self.evaluate_expr(stmt.condition)
                 if condition:
                     self.execute_block(stmt.true_block)
@@ -151,8 +201,10 @@ class Evaluator:
     def _execute_quantum_circuit(self, stmt: QuantumCircuitDecl) -> None:
         """Execute a quantum circuit declaration.
         
-        This internal method handles the execution of quantum circuits,
-        including lowering to QIR and backend execution.
+        This internal method lowers the circuit to QIR, adds it to ``self.qir``
+        and queues it for the backend. Queued circuits are submitted together by
+        :meth:`flush_quantum` (immediately when batching is disabled), which also
+        prints each circuit's summary line followed by its results.
         
         Args:
             stmt: The quantum circuit statement to execute
@@ -161,44 +213,144 @@ class Evaluator:
             RuntimeError: If there's an error during quantum execution
         """
         msg = f"QuantumCircuit {stmt.name}: {stmt.qubits} qubits, {len(stmt.ops)} ops"
-        print(msg)
-        self.output.append(msg)
         
+        parameters: Optional[Dict[str, float]] = None
         try:
-            # Collect constants for lowering
-            constants = {
-                k: v for k, v in self.variables.items() 
-                if isinstance(v, (int, float))
-            }
+            optimization = None
+            cached = self._lowered.get(id(stmt)) if self.symbolic_params else None
+            if cached is not None and cached[0] is stmt:
+                module = cached[1]
+            else:
+                if self.symbolic_params:
+                    # Every variable stays a parameter, so the module is valid for any values
+                    module = lower_circuit(stmt, symbolic=True)
+                else:
+                    # Collect constants for lowering
+                    constants = {
+                        k: v for k, v in self.variables.items() 
+                        if isinstance(v, (int, float))
+                    }
+                    
+                    # Lower the quantum circuit to QModule
+                    module = lower_circuit(stmt, constants=constants)
+                
+                # Cancel/merge redundant gates before any backend sees the circuit
+                if self.optimize:
+                    module, optimization = optimize_module(module)
+                if self.symbolic_params:
+                    self._lowered[id(stmt)] = (stmt, module)
             
-            # Lower the quantum circuit to QModule
-            module = lower_circuit(stmt, constants=constants)
+            names = module.parameters()
+            if names:
+                parameters = {}
+                for name in names:
+                    value = self.variables.get(name)
+                    if not isinstance(value, (int, float)):
+                        raise ValueError(f"Gate parameter '{name}' is not a numeric variable")
+                    parameters[name] = float(value)
             
             # Store the module in variables for reference
             self.variables[stmt.name] = module
             
-            # Wrap in QIR for consistency/storage
-            qir = QIR(modules={module.name: module})
-            self.qir = qir
+            # Keep every circuit of the program in one QIR
+            qir_name = self._add_to_qir(module)
+            if optimization is not None:
+                self.qir.metadata.setdefault("optimization", {})[qir_name] = optimization.as_dict()
             
-            # Execute using the backend if available
-            if self.backend is not None:
-                # Execute using the backend directly
-                result = self.backend.execute(module, shots=self.shots, seed=self.seed)
-                
-                # Store results in variables
-                self.variables[f"{stmt.name}_results"] = result
-                
-                # Print and store the results
-                result_str = ", ".join(f"{k}: {v}" for k, v in result.items())
-                print(f"Results: {result_str}")
-                self.output.append(f"Results: {result_str}")
+        except Exception as e:
+            self._emit(msg)
+            self._report_quantum_error(e)
+        
+        if self.backend is None:
+            self._emit(msg)
+            return
+        # Results of an earlier circuit with the same name are now stale
+        self.variables.pop(f"{module.name}_results", None)
+        self._pending.append((module, parameters, msg))
+        if not self.batch:
+            self.flush_quantum()
+
+    def _add_to_qir(self, module: QModule) -> str:
+        """Adds ``module`` to ``self.qir`` and returns its name there.
+        
+        A circuit declared again under the same name (e.g. in a loop) is kept as
+        ``<name>#2``, ``<name>#3``, ... instead of replacing the earlier one; the
+        module the backend runs, and ``<name>_results``, keep the declared name.
+        """
+        if self.qir is None:
+            self.qir = QIR()
+        name, copy = module.name, 1
+        while name in self.qir.modules:
+            copy += 1
+            name = f"{module.name}#{copy}"
+        self.qir.add_module(module if name == module.name else QModule(name=name, instructions=module.instructions))
+        return name
+
+    def flush_quantum(self) -> None:
+        """Submit all pending circuits to the backend and store their ``<name>_results``.
+        
+        A single pending circuit goes through ``backend.execute``; several are sent
+        through ``backend.execute_batch`` so the backend can run them as one job.
+        
+        Raises:
+            RuntimeError: If there's an error during quantum execution
+        """
+        if not self._pending or self.backend is None:
+            return
+        pending, self._pending = self._pending, []
+        modules = [module for module, _, _ in pending]
+        try:
+            parameters = _merge_parameters(values for _, values, _ in pending)
+            if parameters is None:
+                # Two circuits bound the same parameter to different values
+                results = [self._execute_one(module, values) for module, values, _ in pending]
+            elif len(modules) == 1:
+                results = [self._execute_one(modules[0], parameters or None)]
+            else:
+                results = self.backend.execute_batch(
+                    modules, shots=self.shots, seed=self.seed, **self._options(parameters or None)
+                )
+            
+            # Backends that choose an engine per circuit (e.g. "auto") report their decisions
+            for decision in getattr(self.backend, "last_decisions", None) or []:
+                self.metadata.setdefault("routing", {})[decision.module] = decision.as_dict()
                 
         except Exception as e:
-            error_msg = f"Error executing quantum circuit: {e}"
-            print(error_msg)
-            self.output.append(f"ERROR: {error_msg}")
-            raise RuntimeError(error_msg) from e
+            for _, _, msg in pending:
+                self._emit(msg)
+            self._report_quantum_error(e)
+        
+        for (module, _, msg), result in zip(pending, results):
+            # Store results in variables
+            self.variables[f"{module.name}_results"] = result
+            
+            # Print and store the circuit line and its results
+            self._emit(msg)
+            result_str = ", ".join(f"{k}: {v}" for k, v in result.items())
+            self._emit(f"Results: {result_str}")
+
+    def _options(self, parameters: Optional[Dict[str, float]]) -> Dict[str, Any]:
+        # Only pass the optional backend arguments that are in use
+        options: Dict[str, Any] = {}
+        if parameters is not None:
+            options["parameters"] = parameters
+        if self.exact:
+            options["exact"] = True
+        return options
+
+    def _execute_one(self, module: QModule, parameters: Optional[Dict[str, float]]) -> Any:
+        assert self.backend is not None
+        return self.backend.execute(module, shots=self.shots, seed=self.seed, **self._options(parameters))
+
+    def _emit(self, line: str) -> None:
+        print(line)
+        self.output.append(line)
+
+    def _report_quantum_error(self, e: Exception) -> None:
+        error_msg = f"Error executing quantum circuit: {e}"
+        print(error_msg)
+        self.output.append(f"ERROR: {error_msg}")
+        raise RuntimeError(error_msg) from e
 
     def execute_block(self, block: Block) -> None:
         """Execute a block of statements in sequence.
@@ -227,6 +379,9 @@ class Evaluator:
             return expr.value
             
         elif isinstance(expr, Variable):
+            if expr.name not in self.variables and self._pending:
+                # e.g. '<circuit>_results' of a circuit that has not been submitted yet
+                self.flush_quantum()
             if expr.name not in self.variables:
                 raise NameError(f"Variable '{expr.name}' not defined")
             return self.variables[expr.name]
@@ -0,0 +1,227 @@
+"""
+Binary serialization of QIR (``.hqir`` files).
+
+Lets a program be lowered once and executed many times, across processes,
+without re-parsing. The layout mirrors ``InstructionTable`` so loading is
+zero-copy: with ``mmap`` the instruction columns are ``memoryview`` casts
+straight over the mapped file.
+
+Layout (little-endian, every section padded to 8 bytes):
+
+    header        magic "HQIR", u16 version, u16 flags, u32 modules, u32 strings
+    strings       u32 offsets[strings + 1], then the UTF-8 blob (each padded)
+    metadata      u32 length, then JSON
+    per module    u32 name (string id), u32 instructions, u32 qubits, u32 params,
+                  then the columns: opcodes u8[n], args i32[n],
+                  qubit_offsets i32[n + 1], qubits i32[...],
+                  param_offsets i32[n + 1], params f64[...],
+                  then (version >= 2) u32 symbolic count, param indices u32[...],
+                  expression string ids u32[...]
+
+Gate names and measurement targets share the string table, and ``args``
+holds string IDs, so a loaded module is a read-only ``InstructionTable``.
+Symbolic parameters are stored as NaN in ``params`` plus their expression
+text (see ``hypercode.ir.params.format_param``) in the string table.
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+
+from hypercode.ir.columnar import OP_GATE, OP_MEASURE, InstructionTable, StringTable
+from hypercode.ir.params import ParamExpr, format_param, parse_param
+from hypercode.ir.qir_nodes import QIR, QModule
+
+MAGIC = b"HQIR"
+FORMAT_VERSION = 2
+# Version 1 files (no symbolic parameter section) are still readable
+_READABLE_VERSIONS = (1, 2)
+
+_HEADER = struct.Struct("<4sHHII")
+_MODULE_HEADER = struct.Struct("<IIII")
+_U32 = struct.Struct("<I")
+
+# Column name -> array typecode, in file order
+_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("opcodes", "B"),
+    ("args", "i"),
+    ("qubit_offsets", "i"),
+    ("qubits", "i"),
+    ("param_offsets", "i"),
+    ("params", "d"),
+)
+
+
+def _pad(out: bytearray) -> None:
+    out.extend(b"\0" * (-len(out) % 8))
+
+
+def _aligned(offset: int) -> int:
+    return offset + (-offset % 8)
+
+
+def _as_table(module: QModule) -> InstructionTable:
+    if isinstance(module.instructions, InstructionTable):
+        return module.instructions
+    return InstructionTable(module.instructions)
+
+
+def dumps_qir(qir: QIR) -> bytes:
+    """Serializes a QIR to bytes."""
+    strings = StringTable()
+    encoded_modules: List[Tuple[int, InstructionTable, array, array, array]] = []
+    for module in qir.modules.values():
+        table = _as_table(module)
+        # Remap per-table name/target indices to shared string IDs
+        args = array("i", table.args)
+        for i, opcode in enumerate(table.opcodes):
+            if opcode == OP_GATE:
+                args[i] = strings.intern(table.gate_names[args[i]])
+            elif opcode == OP_MEASURE:
+                args[i] = strings.intern(table.targets[args[i]])
+        symbolic_items = sorted(table.symbolic.items())
+        symbolic_index = array("I", (index for index, _ in symbolic_items))
+        symbolic_text = array("I", (strings.intern(format_param(expr)) for _, expr in symbolic_items))
+        encoded_modules.append((strings.intern(module.name), table, args, symbolic_index, symbolic_text))
+
+    out = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(encoded_modules), len(strings)))
+    _pad(out)
+
+    blobs = [s.encode("utf-8") for s in strings.strings]
+    offsets = array("I", [0])
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    out.extend(_to_le_bytes(offsets))
+    _pad(out)
+    out.extend(b"".join(blobs))
+    _pad(out)
+
+    metadata = json.dumps(qir.metadata, sort_keys=True, default=str).encode("utf-8")
+    out.extend(_U32.pack(len(metadata)))
+    out.extend(metadata)
+    _pad(out)
+
+    for name_id, table, args, symbolic_index, symbolic_text in encoded_modules:
+        out.extend(_MODULE_HEADER.pack(name_id, len(table), len(table.qubits), len(table.params)))
+        _pad(out)
+        for column_name, typecode in _COLUMNS:
+            column = args if column_name == "args" else getattr(table, column_name)
+            if not isinstance(column, array):  # memoryview columns of a loaded table
+                column = array(typecode, column)
+            out.extend(_to_le_bytes(column))
+            _pad(out)
+        out.extend(_U32.pack(len(symbolic_index)))
+        _pad(out)
+        for column in (symbolic_index, symbolic_text):
+            out.extend(_to_le_bytes(column))
+            _pad(out)
+    return bytes(out)
+
+
+def _to_le_bytes(column: array) -> bytes:
+    if sys.byteorder == "big" and column.itemsize > 1:
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _column(buffer: memoryview, offset: int, typecode: str, count: int) -> Tuple[Any, int]:
+    """Returns a typed view of ``count`` items at ``offset`` and the next aligned offset."""
+    size = struct.calcsize(typecode) * count
+    if offset + size > len(buffer):
+        raise ValueError("Corrupt HyperCode QIR file: column extends past end of data")
+    raw = buffer[offset:offset + size]
+    if sys.byteorder == "big" and typecode != "B":
+        column = array(typecode, raw.tobytes())
+        column.byteswap()
+    else:
+        column = raw.cast(typecode)
+    return column, _aligned(offset + size)
+
+
+def loads_qir(data: Union[bytes, bytearray, memoryview, mmap.mmap]) -> QIR:
+    """
+    Deserializes a QIR from a bytes-like object, without copying the columns.
+
+    Raises:
+        ValueError: If the data is not a supported HQIR file.
+    """
+    buffer = memoryview(data)
+    if len(buffer) < _HEADER.size:
+        raise ValueError("Not a HyperCode QIR file (truncated header)")
+    magic, version, _flags, num_modules, num_strings = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a HyperCode QIR file (bad magic)")
+    if version not in _READABLE_VERSIONS:
+        raise ValueError(f"Unsupported QIR format version {version} (expected {FORMAT_VERSION})")
+
+    try:
+        offset = _aligned(_HEADER.size)
+        offsets, offset = _column(buffer, offset, "I", num_strings + 1)
+        blob_start = offset
+        strings = StringTable(
+            bytes(buffer[blob_start + offsets[i]:blob_start + offsets[i + 1]]).decode("utf-8")
+            for i in range(num_strings)
+        )
+        offset = _aligned(blob_start + offsets[num_strings])
+
+        (metadata_len,) = _U32.unpack_from(buffer, offset)
+        offset += _U32.size
+        metadata: Dict[str, Any] = json.loads(bytes(buffer[offset:offset + metadata_len]).decode("utf-8"))
+        offset = _aligned(offset + metadata_len)
+
+        qir = QIR(metadata=metadata)
+        for _ in range(num_modules):
+            name_id, count, num_qubits, num_params = _MODULE_HEADER.unpack_from(buffer, offset)
+            offset = _aligned(offset + _MODULE_HEADER.size)
+            sizes = {
+                "opcodes": count, "args": count, "qubit_offsets": count + 1,
+                "qubits": num_qubits, "param_offsets": count + 1, "params": num_params,
+            }
+            columns: Dict[str, Any] = {}
+            for column_name, typecode in _COLUMNS:
+                columns[column_name], offset = _column(buffer, offset, typecode, sizes[column_name])
+            symbolic: Dict[int, ParamExpr] = {}
+            if version >= 2:
+                (num_symbolic,) = _U32.unpack_from(buffer, offset)
+                offset = _aligned(offset + _U32.size)
+                indices, offset = _column(buffer, offset, "I", num_symbolic)
+                texts, offset = _column(buffer, offset, "I", num_symbolic)
+                for index, text_id in zip(indices, texts):
+                    expr = parse_param(strings[text_id])
+                    if not isinstance(expr, ParamExpr):
+                        raise ValueError(f"Corrupt HyperCode QIR file: '{strings[text_id]}' is not symbolic")
+                    symbolic[index] = expr
+            table = InstructionTable.from_columns(gate_names=strings, targets=strings, symbolic=symbolic, **columns)
+            qir.add_module(QModule(name=strings[name_id], instructions=table))
+    except (struct.error, IndexError, TypeError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Corrupt HyperCode QIR file: {e}") from e
+    return qir
+
+
+def save_qir(qir: QIR, path: Union[str, Path]) -> None:
+    """Writes a QIR to ``path`` in the binary format."""
+    Path(path).write_bytes(dumps_qir(qir))
+
+
+def load_qir(path: Union[str, Path], use_mmap: bool = True) -> QIR:
+    """
+    Loads a QIR written by :func:`save_qir`.
+
+    With ``use_mmap`` (the default) the file is memory-mapped and the
+    instruction columns are views over the mapping, so only the pages that
+    are actually read are loaded. The mapping stays open as long as any
+    loaded module references it.
+    """
+    with open(path, "rb") as f:
+        if not use_mmap:
+            return loads_qir(f.read())
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty files cannot be mapped
+            return loads_qir(b"")
+    return loads_qir(mapped)
@@ -0,0 +1,254 @@
+"""
+Columnar, array-backed storage for quantum IR instructions.
+
+A ``QGate`` object with its own qubit and parameter lists costs a few hundred
+bytes; for generated circuits with millions of gates that dominates memory
+and traversal time. ``InstructionTable`` keeps the same instructions in
+parallel ``array`` columns instead (roughly 20-30 bytes per gate):
+
+- ``opcodes``: one byte per instruction (see the ``OP_*`` constants),
+- ``args``: gate name / measurement target index into the string tables,
+  or the qubit count for ``QAlloc``,
+- ``qubit_offsets`` / ``qubits``: CSR-style operand lists,
+- ``param_offsets`` / ``params``: CSR-style float parameter lists; symbolic
+  parameters (``ParamExpr``) are stored as NaN with the expression kept in
+  the ``symbolic`` side table, keyed by position in ``params``.
+
+The table is a read-mostly ``Sequence[QInstr]``: iterating or indexing it
+yields ordinary ``QAlloc``/``QGate``/``QMeasure``/``QEnd`` objects built on
+the fly, so existing consumers (``QModule.__str__``, ``QiskitBackend.compile``,
+the optimiser) work unchanged on ``QModule(instructions=InstructionTable(...))``.
+"""
+
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union, overload
+
+from hypercode.ir.params import ParamExpr, ParamValue
+from hypercode.ir.qir_nodes import QAlloc, QEnd, QGate, QInstr, QMeasure
+
+OP_ALLOC = 0
+OP_GATE = 1
+OP_MEASURE = 2
+OP_END = 3
+
+
+class StringTable:
+    """Interns strings to dense integer IDs."""
+
+    def __init__(self, strings: Iterable[str] = ()):
+        self.strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+        for s in strings:
+            self.intern(s)
+
+    def intern(self, s: str) -> int:
+        index = self._ids.get(s)
+        if index is None:
+            index = self._ids[s] = len(self.strings)
+            self.strings.append(s)
+        return index
+
+    def __getitem__(self, index: int) -> str:
+        return self.strings[index]
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+class InstructionTable(Sequence[QInstr]):
+    """A list-like view of IR instructions stored in parallel typed arrays."""
+
+    def __init__(self, instructions: Iterable[QInstr] = ()):
+        self.opcodes = array("B")
+        self.args = array("i")
+        self.qubit_offsets = array("i", [0])
+        self.qubits = array("i")
+        self.param_offsets = array("i", [0])
+        self.params = array("d")
+        self.gate_names = StringTable()
+        self.targets = StringTable()
+        self.symbolic: Dict[int, ParamExpr] = {}
+        self.extend(instructions)
+
+    @classmethod
+    def from_columns(
+        cls,
+        opcodes: Any,
+        args: Any,
+        qubit_offsets: Any,
+        qubits: Any,
+        param_offsets: Any,
+        params: Any,
+        gate_names: StringTable,
+        targets: StringTable,
+        symbolic: Optional[Dict[int, ParamExpr]] = None,
+    ) -> "InstructionTable":
+        """
+        Wraps existing columns without copying them.
+
+        Columns may be ``array`` objects or read-only ``memoryview`` casts
+        (as produced by ``hypercode.ir.binary``); a table over memoryviews
+        cannot be appended to.
+        """
+        table = cls.__new__(cls)
+        table.opcodes = opcodes
+        table.args = args
+        table.qubit_offsets = qubit_offsets
+        table.qubits = qubits
+        table.param_offsets = param_offsets
+        table.params = params
+        table.gate_names = gate_names
+        table.targets = targets
+        table.symbolic = symbolic if symbolic is not None else {}
+        return table
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # memoryview columns (from an mmap-loaded file) cannot be pickled; copy them into arrays
+        columns = tuple(
+            column if isinstance(column, array) else array(typecode, column)
+            for column, typecode in (
+                (self.opcodes, "B"), (self.args, "i"), (self.qubit_offsets, "i"),
+                (self.qubits, "i"), (self.param_offsets, "i"), (self.params, "d"),
+            )
+        )
+        return (InstructionTable.from_columns, columns + (self.gate_names, self.targets, self.symbolic))
+
+    # --- Building ---
+
+    def _push(self, opcode: int, arg: int, qubits: Sequence[int], params: Sequence[ParamValue] = ()) -> None:
+        self.opcodes.append(opcode)
+        self.args.append(arg)
+        self.qubits.extend(qubits)
+        self.qubit_offsets.append(len(self.qubits))
+        if params:
+            if any(isinstance(p, ParamExpr) for p in params):
+                for p in params:
+                    if isinstance(p, ParamExpr):
+                        self.symbolic[len(self.params)] = p
+                        self.params.append(float("nan"))
+                    else:
+                        self.params.append(p)
+            else:
+                self.params.extend(params)
+        self.param_offsets.append(len(self.params))
+
+    def append_gate(self, name: str, qubits: Sequence[int], params: Sequence[ParamValue] = ()) -> None:
+        """Appends a gate without building an intermediate ``QGate``."""
+        self._push(OP_GATE, self.gate_names.intern(name), qubits, params)
+
+    def append_measure(self, qubit: int, target: str) -> None:
+        self._push(OP_MEASURE, self.targets.intern(target), (qubit,))
+
+    def append_alloc(self, start_index: int, count: int) -> None:
+        self._push(OP_ALLOC, count, (start_index,))
+
+    def append_end(self) -> None:
+        self._push(OP_END, 0, ())
+
+    def append(self, instr: QInstr) -> None:
+        if isinstance(instr, QGate):
+            self.append_gate(instr.name, instr.qubits, instr.params)
+        elif isinstance(instr, QMeasure):
+            self.append_measure(instr.qubit, instr.target)
+        elif isinstance(instr, QAlloc):
+            self.append_alloc(instr.start_index, instr.count)
+        elif isinstance(instr, QEnd):
+            self.append_end()
+        else:
+            raise TypeError(f"Unsupported instruction type '{type(instr).__name__}' for InstructionTable")
+
+    def extend(self, instructions: Iterable[QInstr]) -> None:
+        for instr in instructions:
+            self.append(instr)
+
+    # --- Reading ---
+
+    def _materialize(self, i: int) -> QInstr:
+        opcode = self.opcodes[i]
+        q_start, q_end = self.qubit_offsets[i], self.qubit_offsets[i + 1]
+        if opcode == OP_GATE:
+            return QGate(
+                name=self.gate_names[self.args[i]],
+                qubits=self.qubits[q_start:q_end].tolist(),
+                params=self.gate_params(i),
+            )
+        if opcode == OP_MEASURE:
+            return QMeasure(qubit=self.qubits[q_start], target=self.targets[self.args[i]])
+        if opcode == OP_ALLOC:
+            return QAlloc(start_index=self.qubits[q_start], count=self.args[i])
+        return QEnd()
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+    @overload
+    def __getitem__(self, index: int) -> QInstr: ...
+    @overload
+    def __getitem__(self, index: slice) -> List[QInstr]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[QInstr, List[QInstr]]:
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("instruction index out of range")
+        return self._materialize(index)
+
+    def __iter__(self) -> Iterator[QInstr]:
+        for i in range(len(self.opcodes)):
+            yield self._materialize(i)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (InstructionTable, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"InstructionTable({len(self)} instructions, {self.nbytes()} bytes)"
+
+    # --- Column access for fast consumers ---
+
+    def gate_count(self) -> int:
+        return self.opcodes.tobytes().count(bytes((OP_GATE,)))
+
+    def operands(self, i: int) -> Tuple[int, ...]:
+        """Qubit operands of instruction ``i``, without materialising it."""
+        return tuple(self.qubits[self.qubit_offsets[i]:self.qubit_offsets[i + 1]])
+
+    def gate_params(self, i: int) -> List[ParamValue]:
+        """Parameters of instruction ``i``, with symbolic entries restored."""
+        start, end = self.param_offsets[i], self.param_offsets[i + 1]
+        values: List[ParamValue] = self.params[start:end].tolist()
+        if self.symbolic:
+            for j in range(start, end):
+                expr = self.symbolic.get(j)
+                if expr is not None:
+                    values[j - start] = expr
+        return values
+
+    def bind(self, values: Mapping[str, float]) -> "InstructionTable":
+        """
+        Returns a table with symbolic parameters substituted. Columns are
+        copied (a C-level copy), except read-only memoryviews, which are shared.
+        """
+        def copy(column: Any) -> Any:
+            return array(column.typecode, column) if isinstance(column, array) else column
+
+        params = array("d", self.params)
+        symbolic: Dict[int, ParamExpr] = {}
+        for index, expr in self.symbolic.items():
+            bound = expr.bind(values)
+            if isinstance(bound, ParamExpr):
+                symbolic[index] = bound
+            else:
+                params[index] = bound
+        return InstructionTable.from_columns(
+            copy(self.opcodes), copy(self.args), copy(self.qubit_offsets), copy(self.qubits),
+            copy(self.param_offsets), params, self.gate_names, self.targets, symbolic,
+        )
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns (string tables excluded)."""
+        columns = (self.opcodes, self.args, self.qubit_offsets, self.qubits, self.param_offsets, self.params)
+        return sum(column.itemsize * len(column) for column in columns)
@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional, Union
 from hypercode.ast.nodes import (
     QuantumCircuitDecl, QGate as AstQGate, QMeasure as AstQMeasure,
     Expr, Literal, Variable, BinaryOp
@@ -6,17 +6,33 @@ from hypercode.ast.nodes import (
 from hypercode.ir.qir_nodes import (
     QModule, QInstr, QAlloc, QGate as IrQGate, QMeasure as IrQMeasure, QEnd
 )
+from hypercode.ir.columnar import InstructionTable
+from hypercode.ir.params import ParamRef, ParamValue
 import math
 
 class QuantumLowerer:
-    def __init__(self, constants: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        constants: Optional[Dict[str, Any]] = None,
+        columnar: bool = False,
+        symbolic: Union[bool, Iterable[str]] = False,
+    ):
         self.constants: Dict[str, Any] = constants or {}
+        # Store instructions in an array-backed InstructionTable instead of a list
+        self.columnar = columnar
+        # symbolic=True: unknown variables become parameters (ParamRef) bound at execution.
+        # An iterable of names: those variables stay symbolic even when they are constants.
+        self.symbolic_unknowns = symbolic is True
+        self.symbolic_names = frozenset() if isinstance(symbolic, bool) else frozenset(symbolic)
         # Default constants
         if 'PI' not in self.constants:
             self.constants['PI'] = math.pi
             self.constants['pi'] = math.pi
 
     def lower(self, node: QuantumCircuitDecl) -> QModule:
+        if self.columnar:
+            return self._lower_columnar(node)
+
         instrs: List[QInstr] = []
         
         # 1. Allocate qubits
@@ -26,9 +42,8 @@ class QuantumLowerer:
         # 2. Lower operations
         for op in node.ops:
             if isinstance(op, AstQGate):
-                # Evaluate parameters to floats
-                # In a real compiler, we might keep them as symbolic if they are runtime variables
-                # For this v0, we try to resolve to constant floats.
+                # Evaluate parameters to floats; in symbolic mode runtime variables
+                # stay as ParamExpr and are bound by the backend at execution time.
                 resolved_params = []
                 for p in op.params:
                     val = self.evaluate_const_expr(p)
@@ -51,12 +66,28 @@ class QuantumLowerer:
         
         return QModule(name=node.name, instructions=instrs)
 
-    def evaluate_const_expr(self, expr: Expr) -> float:
+    def _lower_columnar(self, node: QuantumCircuitDecl) -> QModule:
+        # Same steps as lower(), appending straight into the columns
+        table = InstructionTable()
+        table.append_alloc(0, node.qubits)
+        for op in node.ops:
+            if isinstance(op, AstQGate):
+                table.append_gate(op.name, op.qubits, [self.evaluate_const_expr(p) for p in op.params])
+            elif isinstance(op, AstQMeasure):
+                table.append_measure(op.qubit, op.target if op.target is not None else f"c{op.qubit}")
+        table.append_end()
+        return QModule(name=node.name, instructions=table)
+
+    def evaluate_const_expr(self, expr: Expr) -> ParamValue:
         if isinstance(expr, Literal):
             return float(expr.value)
         elif isinstance(expr, Variable):
+            if expr.name in self.symbolic_names:
+                return ParamRef(expr.name)
             if expr.name in self.constants:
                 return float(self.constants[expr.name])
+            if self.symbolic_unknowns:
+                return ParamRef(expr.name)
             raise ValueError(f"Unknown constant variable '{expr.name}' during IR lowering. (Runtime variables not yet supported in gate params for v0 IR)")
         elif isinstance(expr, BinaryOp):
             left = self.evaluate_const_expr(expr.left)
@@ -69,6 +100,11 @@ class QuantumLowerer:
         else:
             raise ValueError(f"Unsupported expression type '{type(expr)}' in gate parameter")
 
-def lower_circuit(circuit: QuantumCircuitDecl, constants: Optional[Dict[str, Any]] = None) -> QModule:
-    lowerer = QuantumLowerer(constants)
+def lower_circuit(
+    circuit: QuantumCircuitDecl,
+    constants: Optional[Dict[str, Any]] = None,
+    columnar: bool = False,
+    symbolic: Union[bool, Iterable[str]] = False,
+) -> QModule:
+    lowerer = QuantumLowerer(constants, columnar=columnar, symbolic=symbolic)
     return lowerer.lower(circuit)
@@ -0,0 +1,162 @@
+"""
+Peephole optimisation of quantum IR.
+
+Runs over ``QModule.instructions`` before any backend sees them, so every
+backend simulates the reduced circuit:
+
+- adjacent self-inverse pairs cancel (H·H, X·X, CX·CX, CZ·CZ, ...),
+- consecutive rotations about the same axis merge (RZ(a)·RZ(b) -> RZ(a+b)),
+- rotations by a multiple of 2π are dropped (identity up to global phase).
+
+Symbolic angles (``ParamExpr``) merge into a symbolic sum and are never
+treated as zero, since their value is only known at execution time.
+
+"Adjacent" means adjacent on the gate's qubits: gates acting on disjoint
+qubits commute, so ``H q0; X q1; H q0`` still cancels the two H gates.
+Removing a pair exposes the gates before it, so nested pairs such as
+``H X X H`` cancel completely. Measurements block their qubit, and
+``QAlloc``/``QEnd`` act as barriers across all qubits.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from hypercode.ir.columnar import InstructionTable
+from hypercode.ir.params import ParamExpr, ParamValue
+from hypercode.ir.qir_nodes import QAlloc, QEnd, QGate, QInstr, QMeasure, QModule, QIR
+
+# Gates that are their own inverse
+SELF_INVERSE_GATES = {"H", "X", "Y", "Z", "CX", "CZ"}
+
+# Gates whose qubit operands can be swapped without changing the operation
+SYMMETRIC_GATES = {"CZ"}
+
+# Single-parameter rotations that merge by adding angles
+ROTATION_GATES = {"RX", "RY", "RZ"}
+
+# Angles closer than this to a multiple of 2π count as zero
+ANGLE_TOLERANCE = 1e-12
+
+
+@dataclass
+class OptimizationStats:
+    """Gate counts before and after optimisation, and what was removed."""
+    gates_before: int = 0
+    gates_after: int = 0
+    cancelled: int = 0  # Gates removed as self-inverse pairs
+    merged: int = 0  # Rotations folded into a preceding rotation
+    dropped: int = 0  # Zero-angle rotations removed
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "gates_before": self.gates_before,
+            "gates_after": self.gates_after,
+            "cancelled": self.cancelled,
+            "merged": self.merged,
+            "dropped": self.dropped,
+        }
+
+
+def _is_zero_angle(angle: ParamValue) -> bool:
+    if isinstance(angle, ParamExpr):
+        return False
+    return abs(math.remainder(angle, 2 * math.pi)) < ANGLE_TOLERANCE
+
+
+def _same_operands(a: QGate, b: QGate, name: str) -> bool:
+    if a.qubits == b.qubits:
+        return True
+    return name in SYMMETRIC_GATES and sorted(a.qubits) == sorted(b.qubits)
+
+
+def optimize_module(module: QModule) -> Tuple[QModule, OptimizationStats]:
+    """
+    Returns an optimised copy of ``module`` and statistics about the pass.
+
+    The input module is not modified. Runs in a single pass, linear in the
+    number of instructions. Columnar modules stay columnar.
+    """
+    stats = OptimizationStats()
+    out: List[Optional[QInstr]] = []
+    # qubit -> indices into ``out`` of live instructions touching it, oldest first
+    frontier: Dict[int, List[int]] = {}
+
+    def push(instr: QInstr, qubits: List[int]) -> None:
+        index = len(out)
+        out.append(instr)
+        for q in qubits:
+            frontier.setdefault(q, []).append(index)
+
+    def remove(index: int, qubits: List[int]) -> None:
+        out[index] = None
+        for q in qubits:
+            frontier[q].pop()
+
+    for instr in module.instructions:
+        if isinstance(instr, (QAlloc, QEnd)):
+            frontier.clear()
+            out.append(instr)
+            continue
+        if isinstance(instr, QMeasure):
+            push(instr, [instr.qubit])
+            continue
+        if not isinstance(instr, QGate):
+            frontier.clear()  # Unknown instruction: treat as a barrier
+            out.append(instr)
+            continue
+
+        stats.gates_before += 1
+        name = instr.name.upper()
+        qubits = list(instr.qubits)
+
+        if name in ROTATION_GATES and len(instr.params) == 1 and _is_zero_angle(instr.params[0]):
+            stats.dropped += 1
+            continue
+
+        # The previous instruction on these qubits, if it is the same one on all of them
+        previous: Optional[int] = None
+        if qubits and all(frontier.get(q) for q in qubits):
+            tops = {frontier[q][-1] for q in qubits}
+            if len(tops) == 1:
+                previous = tops.pop()
+
+        prev_instr = out[previous] if previous is not None else None
+        if (
+            isinstance(prev_instr, QGate)
+            and prev_instr.name.upper() == name
+            and _same_operands(prev_instr, instr, name)
+        ):
+            if name in SELF_INVERSE_GATES and not instr.params:
+                remove(previous, qubits)
+                stats.cancelled += 2
+                continue
+            if name in ROTATION_GATES and len(instr.params) == 1 and len(prev_instr.params) == 1:
+                angle = prev_instr.params[0] + instr.params[0]
+                stats.merged += 1
+                if _is_zero_angle(angle):
+                    remove(previous, qubits)
+                    stats.dropped += 1
+                else:
+                    out[previous] = QGate(name=prev_instr.name, qubits=list(prev_instr.qubits), params=[angle])
+                continue
+
+        push(QGate(name=instr.name, qubits=qubits, params=list(instr.params)), qubits)
+
+    instructions = [instr for instr in out if instr is not None]
+    stats.gates_after = sum(1 for instr in instructions if isinstance(instr, QGate))
+    if isinstance(module.instructions, InstructionTable):
+        return QModule(name=module.name, instructions=InstructionTable(instructions)), stats
+    return QModule(name=module.name, instructions=instructions), stats
+
+
+def optimize_qir(qir: QIR) -> Tuple[QIR, Dict[str, OptimizationStats]]:
+    """Optimises every module of a QIR; returns the new QIR and per-module statistics."""
+    optimized = QIR(metadata=dict(qir.metadata))
+    all_stats: Dict[str, OptimizationStats] = {}
+    for name, module in qir.modules.items():
+        new_module, stats = optimize_module(module)
+        optimized.add_module(new_module)
+        all_stats[name] = stats
+    optimized.metadata["optimization"] = {name: s.as_dict() for name, s in all_stats.items()}
+    return optimized, all_stats
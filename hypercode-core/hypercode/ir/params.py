@@ -0,0 +1,168 @@
+"""
+Symbolic gate parameters for late binding.
+
+A gate parameter in the IR is either a ``float`` or a ``ParamExpr``: a
+reference to a named parameter (``ParamRef``) or arithmetic over such
+references and constants (``ParamBinOp``). Lowering with ``symbolic=True``
+keeps runtime variables as references, so a module can be lowered (and
+transpiled) once and executed for many parameter values; backends bind the
+values at execution time via :meth:`QModule.bind` or natively (Qiskit
+``Parameter``).
+"""
+
+import ast
+import math
+import operator
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Mapping, Optional, Union
+
+ParamValue = Union[float, "ParamExpr"]
+
+_OPS: Dict[str, Callable[[float, float], float]] = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+}
+
+
+class ParamExpr:
+    """Base class for symbolic parameter expressions; supports + - * / with numbers."""
+
+    def bind(self, values: Mapping[str, float]) -> ParamValue:
+        """Substitutes ``values``; returns a float once every parameter is bound."""
+        raise NotImplementedError
+
+    def free_parameters(self) -> FrozenSet[str]:
+        raise NotImplementedError
+
+    def _combine(self, op: str, other: ParamValue, reverse: bool = False) -> "ParamExpr":
+        if not isinstance(other, (ParamExpr, int, float)):
+            return NotImplemented
+        other = other if isinstance(other, ParamExpr) else float(other)
+        return ParamBinOp(op, other, self) if reverse else ParamBinOp(op, self, other)
+
+    def __add__(self, other): return self._combine("+", other)
+    def __radd__(self, other): return self._combine("+", other, reverse=True)
+    def __sub__(self, other): return self._combine("-", other)
+    def __rsub__(self, other): return self._combine("-", other, reverse=True)
+    def __mul__(self, other): return self._combine("*", other)
+    def __rmul__(self, other): return self._combine("*", other, reverse=True)
+    def __truediv__(self, other): return self._combine("/", other)
+    def __rtruediv__(self, other): return self._combine("/", other, reverse=True)
+    def __neg__(self): return ParamBinOp("*", -1.0, self)
+
+
+@dataclass(frozen=True, eq=True)
+class ParamRef(ParamExpr):
+    """A named parameter, bound at execution time."""
+    name: str
+
+    def bind(self, values: Mapping[str, float]) -> ParamValue:
+        if self.name in values:
+            return float(values[self.name])
+        return self
+
+    def free_parameters(self) -> FrozenSet[str]:
+        return frozenset((self.name,))
+
+    def __str__(self) -> str:
+        return self.name
+
+
+@dataclass(frozen=True, eq=True)
+class ParamBinOp(ParamExpr):
+    """``left <op> right`` where either side may be symbolic."""
+    op: str
+    left: ParamValue
+    right: ParamValue
+
+    def bind(self, values: Mapping[str, float]) -> ParamValue:
+        left = bind_value(self.left, values)
+        right = bind_value(self.right, values)
+        if isinstance(left, ParamExpr) or isinstance(right, ParamExpr):
+            return ParamBinOp(self.op, left, right)
+        return _OPS[self.op](left, right)
+
+    def free_parameters(self) -> FrozenSet[str]:
+        return free_parameters(self.left) | free_parameters(self.right)
+
+    def __str__(self) -> str:
+        return f"({_format(self.left)} {self.op} {_format(self.right)})"
+
+
+def _format(value: ParamValue) -> str:
+    return str(value) if isinstance(value, ParamExpr) else repr(float(value))
+
+
+def is_symbolic(value: object) -> bool:
+    return isinstance(value, ParamExpr)
+
+
+def bind_value(value: ParamValue, values: Mapping[str, float]) -> ParamValue:
+    """Binds ``value`` if it is symbolic; numbers pass through as floats."""
+    return value.bind(values) if isinstance(value, ParamExpr) else float(value)
+
+
+def free_parameters(value: ParamValue) -> FrozenSet[str]:
+    return value.free_parameters() if isinstance(value, ParamExpr) else frozenset()
+
+
+def map_param(value: ParamValue, leaf: Callable[[str], Any]) -> Any:
+    """
+    Rebuilds ``value`` with each ``ParamRef`` replaced by ``leaf(name)`` and the
+    arithmetic re-applied, e.g. to turn an expression into a Qiskit ``ParameterExpression``.
+    """
+    if isinstance(value, ParamRef):
+        return leaf(value.name)
+    if isinstance(value, ParamBinOp):
+        return _OPS[value.op](map_param(value.left, leaf), map_param(value.right, leaf))
+    return float(value)
+
+
+def format_param(value: ParamValue) -> str:
+    """Renders a parameter so that :func:`parse_param` reads it back exactly."""
+    return _format(value)
+
+
+def parse_param(text: str, constants: Optional[Mapping[str, float]] = None) -> ParamValue:
+    """
+    Parses a parameter expression written by :func:`format_param` (or by hand).
+
+    Names found in ``constants`` are substituted; any other name becomes a
+    ``ParamRef``. Only numbers, names, unary +/- and + - * / are accepted.
+
+    Raises:
+        ValueError: For anything else.
+    """
+    constants = constants or {}
+
+    def visit(node: ast.AST) -> ParamValue:
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return float(node.value)
+        if isinstance(node, ast.Name):
+            if node.id in constants:
+                return float(constants[node.id])
+            return ParamRef(node.id)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            value = visit(node.operand)
+            return -value if isinstance(node.op, ast.USub) else value
+        if isinstance(node, ast.BinOp):
+            symbol = {ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/"}.get(type(node.op))
+            if symbol is not None:
+                left, right = visit(node.left), visit(node.right)
+                if isinstance(left, ParamExpr) or isinstance(right, ParamExpr):
+                    return ParamBinOp(symbol, left, right)
+                return _OPS[symbol](left, right)
+            if isinstance(node.op, ast.Pow):
+                left, right = visit(node.left), visit(node.right)
+                if isinstance(left, ParamExpr) or isinstance(right, ParamExpr):
+                    raise ValueError(f"Powers of symbolic parameters are not supported: '{text}'")
+                return math.pow(left, right)
+        raise ValueError(f"Unsupported parameter expression '{text}'")
+
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid parameter expression '{text}'") from e
+    return visit(tree.body)
@@ -0,0 +1,377 @@
+"""
+Dependency-free OpenQASM 2.0 / 3.0 export and import for ``QModule``.
+
+Both directions stream: the emitter yields one line per instruction and the
+parser consumes an iterable of text chunks (a file object, a socket reader,
+...) statement by statement, so very large circuits never need to be held in
+memory as a single string. No qiskit import is involved.
+
+Only the gate set of the IR (H, X, Y, Z, CX, CZ, RX, RY, RZ) plus ``measure``
+is supported. Each measurement target becomes its own single-bit classical
+register, which keeps HyperCode target names intact across a round trip.
+Gate parameters are written as ``repr`` floats so they survive exactly.
+Symbolic parameters become OpenQASM 3 ``input float[64]`` declarations.
+"""
+
+import math
+import re
+from typing import Collection, Dict, Iterable, Iterator, List, Sequence, Set, TextIO, Tuple, Union
+
+from hypercode.ir.columnar import OP_ALLOC, OP_GATE, OP_MEASURE, InstructionTable
+from hypercode.ir.params import ParamValue, format_param, free_parameters, parse_param
+from hypercode.ir.qir_nodes import QAlloc, QEnd, QGate, QInstr, QMeasure, QModule
+
+SUPPORTED_GATES = {"h", "x", "y", "z", "cx", "cz", "rx", "ry", "rz"}
+
+# OpenQASM 2 has no 'bit' declarations; the qelib1 gate names match ours
+_QASM2_HEADER = ['OPENQASM 2.0;', 'include "qelib1.inc";']
+_QASM3_HEADER = ['OPENQASM 3.0;', 'include "stdgates.inc";']
+
+
+# --- Export ---
+
+def _collect_registers(module: QModule) -> Tuple[int, List[str]]:
+    num_qubits = 0
+    targets: Dict[str, None] = {}
+    table = module.instructions
+    if isinstance(table, InstructionTable):
+        for i, opcode in enumerate(table.opcodes):
+            if opcode == OP_ALLOC:
+                num_qubits = max(num_qubits, table.qubits[table.qubit_offsets[i]] + table.args[i])
+            elif opcode == OP_MEASURE:
+                targets.setdefault(table.targets[table.args[i]], None)
+        return num_qubits, list(targets)
+    for instr in module.instructions:
+        if isinstance(instr, QAlloc):
+            num_qubits = max(num_qubits, instr.start_index + instr.count)
+        elif isinstance(instr, QMeasure):
+            targets.setdefault(instr.target, None)
+    return num_qubits, list(targets)
+
+
+def iter_qasm(module: QModule, version: int = 3) -> Iterator[str]:
+    """
+    Yields the OpenQASM program for ``module`` one line at a time (no newlines).
+
+    Makes two passes over the instructions: one to size the registers, one to
+    emit. ``InstructionTable`` modules are read straight from their columns.
+
+    Raises:
+        ValueError: For an unsupported version, gate or measurement target name.
+    """
+    if version not in (2, 3):
+        raise ValueError(f"Unsupported OpenQASM version {version} (expected 2 or 3)")
+    num_qubits, targets = _collect_registers(module)
+    for target in targets:
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", target):
+            raise ValueError(f"Measurement target '{target}' is not a valid OpenQASM identifier")
+
+    parameters = module.parameters()
+    if parameters and version == 2:
+        raise ValueError("Symbolic parameters need OpenQASM 3 (input declarations); bind them first")
+
+    yield f"// HyperCode module {' '.join(module.name.split())}"
+    if version == 2:
+        yield from _QASM2_HEADER
+        yield f"qreg q[{num_qubits}];"
+        for target in targets:
+            yield f"creg {target}[1];"
+    else:
+        yield from _QASM3_HEADER
+        yield f"qubit[{num_qubits}] q;"
+        for target in targets:
+            yield f"bit {target};"
+        for name in parameters:
+            yield f"input float[64] {name};"
+
+    instructions = module.instructions
+    if isinstance(instructions, InstructionTable):
+        yield from _iter_table_lines(instructions, version)
+        return
+    for instr in instructions:
+        if isinstance(instr, QGate):
+            yield _gate_line(instr.name, instr.qubits, instr.params)
+        elif isinstance(instr, QMeasure):
+            yield _measure_line(instr.qubit, instr.target, version)
+
+
+def _gate_line(name: str, qubits: Sequence[int], params: Sequence[ParamValue]) -> str:
+    lowered = name.lower()
+    if lowered not in SUPPORTED_GATES:
+        raise ValueError(f"Gate '{name}' cannot be exported to OpenQASM")
+    operands = ", ".join(f"q[{q}]" for q in qubits)
+    if params:
+        return f"{lowered}({', '.join(format_param(p) for p in params)}) {operands};"
+    return f"{lowered} {operands};"
+
+
+def _measure_line(qubit: int, target: str, version: int) -> str:
+    if version == 2:
+        return f"measure q[{qubit}] -> {target}[0];"
+    return f"{target} = measure q[{qubit}];"
+
+
+def _iter_table_lines(table: InstructionTable, version: int) -> Iterator[str]:
+    # Reads the columns directly instead of materialising QGate objects
+    opcodes, args = table.opcodes, table.args
+    qubit_offsets, qubits = table.qubit_offsets, table.qubits
+    param_offsets, params = table.param_offsets, table.params
+    symbolic = bool(table.symbolic)
+    for i in range(len(opcodes)):
+        opcode = opcodes[i]
+        if opcode == OP_GATE:
+            yield _gate_line(
+                table.gate_names[args[i]],
+                qubits[qubit_offsets[i]:qubit_offsets[i + 1]],
+                table.gate_params(i) if symbolic else params[param_offsets[i]:param_offsets[i + 1]],
+            )
+        elif opcode == OP_MEASURE:
+            yield _measure_line(qubits[qubit_offsets[i]], table.targets[args[i]], version)
+
+
+def dumps_qasm(module: QModule, version: int = 3) -> str:
+    """Returns the OpenQASM program for ``module`` as a string."""
+    return "\n".join(iter_qasm(module, version)) + "\n"
+
+
+def dump_qasm(module: QModule, fp: TextIO, version: int = 3) -> None:
+    """Writes the OpenQASM program for ``module`` to a text stream, line by line."""
+    for line in iter_qasm(module, version):
+        fp.write(line)
+        fp.write("\n")
+
+
+# --- Import ---
+
+_CONSTANTS = {"pi": math.pi, "tau": math.tau, "euler": math.e}
+
+
+def _eval_param(text: str, inputs: Collection[str] = ()) -> ParamValue:
+    """
+    Evaluates a gate parameter such as ``pi/2`` or ``-3*pi/4`` without ``eval``.
+    Names declared as ``input`` become symbolic parameters.
+    """
+    try:
+        return float(text)  # Fast path: plain literals, as written by iter_qasm
+    except ValueError:
+        pass
+    # OpenQASM 2 writes powers as '^'; OpenQASM 3 uses '**' like Python
+    value = parse_param(text.replace("π", "pi").replace("^", "**"), _CONSTANTS)
+    unknown = free_parameters(value) - set(inputs)
+    if unknown:
+        raise ValueError(f"Unknown identifier(s) {sorted(unknown)} in parameter expression '{text}'")
+    return value
+
+
+_SPECIAL = re.compile(r";|//|/\*")
+
+
+class _StatementSplitter:
+    """Turns streamed text chunks into ';'-terminated statements, dropping comments."""
+
+    def __init__(self) -> None:
+        self._pending: List[str] = []
+        self._carry = ""
+        self._in_line_comment = False
+        self._in_block_comment = False
+
+    def feed(self, chunk: str) -> Iterator[str]:
+        text = self._carry + chunk
+        # Hold back a trailing '/' or '*' in case a comment marker is split across chunks
+        if text[-1:] in ("/", "*"):
+            text, self._carry = text[:-1], text[-1]
+        else:
+            self._carry = ""
+        yield from self._scan(text)
+
+    def finish(self) -> Iterator[str]:
+        yield from self._scan(self._carry)
+        self._carry = ""
+        leftover = " ".join("".join(self._pending).split())
+        if leftover:
+            raise ValueError(f"Unterminated OpenQASM statement: '{leftover}'")
+
+    def _scan(self, text: str) -> Iterator[str]:
+        i = 0
+        while i < len(text):
+            if self._in_line_comment or self._in_block_comment:
+                end_marker = "\n" if self._in_line_comment else "*/"
+                end = text.find(end_marker, i)
+                if end < 0:
+                    return
+                self._in_line_comment = self._in_block_comment = False
+                self._pending.append(" ")
+                i = end + len(end_marker)
+                continue
+            match = _SPECIAL.search(text, i)
+            if match is None:
+                self._pending.append(text[i:])
+                return
+            self._pending.append(text[i:match.start()])
+            i = match.end()
+            if match.group() == ";":
+                statement = " ".join("".join(self._pending).split())
+                self._pending.clear()
+                if statement:
+                    yield statement
+            elif match.group() == "//":
+                self._in_line_comment = True
+            else:
+                self._in_block_comment = True
+
+
+_KEYWORD_RE = re.compile(r"[A-Za-z_0-9]*")
+_GATE_RE = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)\s*(?:\((.*)\))?\s*(.*)$")
+_OPERAND_RE = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)\s*(?:\[\s*(\d+)\s*\])?$")
+_QREG_RE = re.compile(r"^qreg\s+([A-Za-z_][A-Za-z0-9_]*)\s*\[\s*(\d+)\s*\]$")
+_CREG_RE = re.compile(r"^creg\s+([A-Za-z_][A-Za-z0-9_]*)\s*\[\s*(\d+)\s*\]$")
+_QUBIT_RE = re.compile(r"^qubit\s*(?:\[\s*(\d+)\s*\])?\s+([A-Za-z_][A-Za-z0-9_]*)$")
+_BIT_RE = re.compile(r"^bit\s*(?:\[\s*(\d+)\s*\])?\s+([A-Za-z_][A-Za-z0-9_]*)$")
+_INPUT_RE = re.compile(r"^input\s+(?:float|angle)\s*(?:\[\s*\d+\s*\])?\s+([A-Za-z_][A-Za-z0-9_]*)$")
+_MEASURE2_RE = re.compile(r"^measure\s+(.+?)\s*->\s*(.+)$")
+_MEASURE3_RE = re.compile(r"^(.+?)\s*=\s*measure\s+(.+)$")
+
+
+class _QasmReader:
+    """Builds QIR instructions from OpenQASM statements."""
+
+    def __init__(self, instructions: Union[List[QInstr], InstructionTable]):
+        self.instructions = instructions
+        if isinstance(instructions, InstructionTable):
+            self._append_gate = instructions.append_gate
+        else:
+            self._append_gate = lambda name, qubits, params: instructions.append(QGate(name, qubits, params))
+        self.qregs: Dict[str, Tuple[int, int]] = {}  # name -> (first qubit, size)
+        self.cregs: Dict[str, int] = {}  # name -> size
+        self.inputs: Set[str] = set()  # OpenQASM 3 'input' parameters
+        self.num_qubits = 0
+
+    def _qubits(self, operand: str) -> List[int]:
+        match = _OPERAND_RE.match(operand.strip())
+        if match is None or match.group(1) not in self.qregs:
+            raise ValueError(f"Unknown qubit operand '{operand}'")
+        start, size = self.qregs[match.group(1)]
+        if match.group(2) is None:
+            return list(range(start, start + size))
+        index = int(match.group(2))
+        if index >= size:
+            raise ValueError(f"Qubit index out of range in '{operand}'")
+        return [start + index]
+
+    def _bits(self, operand: str) -> List[str]:
+        # Single-bit registers keep their name; bit i of a wider register 'c' becomes 'c<i>'
+        match = _OPERAND_RE.match(operand.strip())
+        if match is None or match.group(1) not in self.cregs:
+            raise ValueError(f"Unknown classical operand '{operand}'")
+        name, size = match.group(1), self.cregs[match.group(1)]
+        if match.group(2) is None:
+            return [name] if size == 1 else [f"{name}{i}" for i in range(size)]
+        index = int(match.group(2))
+        if index >= size:
+            raise ValueError(f"Bit index out of range in '{operand}'")
+        return [name] if size == 1 else [f"{name}{index}"]
+
+    def _add_qreg(self, name: str, size: int) -> None:
+        self.qregs[name] = (self.num_qubits, size)
+        self.instructions.append(QAlloc(start_index=self.num_qubits, count=size))
+        self.num_qubits += size
+
+    def _measure(self, qubit_operand: str, bit_operand: str) -> None:
+        qubits, bits = self._qubits(qubit_operand), self._bits(bit_operand)
+        if len(qubits) != len(bits):
+            raise ValueError(f"Register size mismatch in measurement of '{qubit_operand}'")
+        for qubit, bit in zip(qubits, bits):
+            self.instructions.append(QMeasure(qubit=qubit, target=bit))
+
+    def statement(self, stmt: str) -> None:
+        keyword = _KEYWORD_RE.match(stmt).group()
+        if keyword == "OPENQASM":
+            version = stmt.split()[1] if len(stmt.split()) > 1 else ""
+            if version.split(".")[0] not in ("2", "3"):
+                raise ValueError(f"Unsupported OpenQASM version '{version}'")
+            return
+        if keyword in ("include", "barrier"):
+            return
+        if keyword == "input":
+            match = _INPUT_RE.match(stmt)
+            if match is None:
+                raise ValueError(f"Unsupported input declaration: '{stmt}'")
+            self.inputs.add(match.group(1))
+            return
+        if keyword in ("qreg", "qubit", "creg", "bit"):
+            for pattern, handler in (
+                (_QREG_RE, lambda m: self._add_qreg(m.group(1), int(m.group(2)))),
+                (_QUBIT_RE, lambda m: self._add_qreg(m.group(2), int(m.group(1) or 1))),
+                (_CREG_RE, lambda m: self.cregs.__setitem__(m.group(1), int(m.group(2)))),
+                (_BIT_RE, lambda m: self.cregs.__setitem__(m.group(2), int(m.group(1) or 1))),
+            ):
+                match = pattern.match(stmt)
+                if match is not None:
+                    handler(match)
+                    return
+            raise ValueError(f"Unsupported OpenQASM declaration: '{stmt}'")
+        if keyword == "measure":
+            match = _MEASURE2_RE.match(stmt)
+            if match is None:
+                raise ValueError(f"Invalid measurement: '{stmt}'")
+            self._measure(match.group(1), match.group(2))
+            return
+        if "=" in stmt:
+            match = _MEASURE3_RE.match(stmt)
+            if match is None:
+                raise ValueError(f"Unsupported OpenQASM statement: '{stmt}'")
+            self._measure(match.group(2), match.group(1))
+            return
+        self._gate(stmt)
+
+    def _gate(self, stmt: str) -> None:
+        match = _GATE_RE.match(stmt)
+        if match is None or match.group(1).lower() not in SUPPORTED_GATES:
+            raise ValueError(f"Unsupported OpenQASM statement: '{stmt}'")
+        name = match.group(1).upper()
+        params = [_eval_param(p, self.inputs) for p in match.group(2).split(",")] if match.group(2) else []
+        operands = [self._qubits(o) for o in match.group(3).split(",")]
+        # Whole-register operands broadcast; single qubits repeat against them
+        width = max(len(o) for o in operands)
+        if any(len(o) not in (1, width) for o in operands):
+            raise ValueError(f"Register size mismatch in '{stmt}'")
+        for i in range(width):
+            qubits = [o[0] if len(o) == 1 else o[i] for o in operands]
+            self._append_gate(name, qubits, list(params))
+
+
+def parse_qasm(
+    source: Union[str, Iterable[str]],
+    name: str = "circuit",
+    columnar: bool = False,
+) -> QModule:
+    """
+    Parses an OpenQASM 2.0 or 3.0 program into a ``QModule``.
+
+    Args:
+        source: The program text, or any iterable of text chunks (e.g. an
+            open file), which is consumed incrementally.
+        name: Name of the resulting module.
+        columnar: Store instructions in an ``InstructionTable``, which keeps
+            very large imported circuits compact.
+
+    Raises:
+        ValueError: On syntax this subset does not support.
+    """
+    if isinstance(source, str):
+        source = (source,)
+    instructions: Union[List[QInstr], InstructionTable] = InstructionTable() if columnar else []
+    reader = _QasmReader(instructions)
+    splitter = _StatementSplitter()
+    for chunk in source:
+        for stmt in splitter.feed(chunk):
+            reader.statement(stmt)
+    for stmt in splitter.finish():
+        reader.statement(stmt)
+    instructions.append(QEnd())
+    return QModule(name=name, instructions=instructions)
+
+
+def load_qasm(fp: TextIO, name: str = "circuit", columnar: bool = False) -> QModule:
+    """Parses an OpenQASM program from a text stream, reading it in chunks."""
+    return parse_qasm(iter(lambda: fp.read(1 << 16), ""), name=name, columnar=columnar)
@@ -1,5 +1,7 @@
 from dataclasses import dataclass, field
-from typing import List, Union, Optional, Dict, Any
+from typing import List, Mapping, Sequence, Union, Optional, Dict, Any
+
+from hypercode.ir.params import ParamExpr, ParamValue, bind_value
 
 @dataclass
 class QInstr:
@@ -17,7 +19,8 @@ class QAlloc(QInstr):
 class QGate(QInstr):
     name: str
     qubits: List[int]
-    params: List[float]
+    # Floats, or ParamExpr for parameters bound at execution time
+    params: List[ParamValue]
     
     def __str__(self):
         qubits_str = ", ".join([f"q{q}" for q in self.qubits])
@@ -42,8 +45,36 @@ class QEnd(QInstr):
 @dataclass
 class QModule:
     name: str
-    instructions: List[QInstr]
+    # A list, or an array-backed InstructionTable (see hypercode.ir.columnar)
+    instructions: Sequence[QInstr]
     
+    def parameters(self) -> List[str]:
+        """Names of the symbolic parameters this module needs bound, sorted."""
+        symbolic = getattr(self.instructions, "symbolic", None)
+        if symbolic is not None:  # InstructionTable keeps symbolic params in a side table
+            exprs = symbolic.values()
+        else:
+            exprs = (
+                p for instr in self.instructions if isinstance(instr, QGate)
+                for p in instr.params if isinstance(p, ParamExpr)
+            )
+        names = set()
+        for expr in exprs:
+            names |= expr.free_parameters()
+        return sorted(names)
+
+    def bind(self, values: Mapping[str, float]) -> "QModule":
+        """Returns a copy with the given parameters substituted (others stay symbolic)."""
+        bind_table = getattr(self.instructions, "bind", None)
+        if bind_table is not None:
+            return QModule(name=self.name, instructions=bind_table(values))
+        instructions: List[QInstr] = []
+        for instr in self.instructions:
+            if isinstance(instr, QGate) and any(isinstance(p, ParamExpr) for p in instr.params):
+                instr = QGate(instr.name, list(instr.qubits), [bind_value(p, values) for p in instr.params])
+            instructions.append(instr)
+        return QModule(name=self.name, instructions=instructions)
+
     def __str__(self):
         lines = [f"module {self.name}:"]
         for instr in self.instructions:
@@ -65,6 +96,17 @@ class QIR:
     def add_module(self, module: QModule) -> None:
         """Add a QModule to the QIR."""
         self.modules[module.name] = module
+
+    def save(self, path: str) -> None:
+        """Write the QIR to ``path`` in the binary .hqir format (see hypercode.ir.binary)."""
+        from hypercode.ir.binary import save_qir
+        save_qir(self, path)
+
+    @classmethod
+    def load(cls, path: str, use_mmap: bool = True) -> "QIR":
+        """Load a QIR saved with :meth:`save`, memory-mapping the file by default."""
+        from hypercode.ir.binary import load_qir
+        return load_qir(path, use_mmap=use_mmap)
     
     def __str__(self) -> str:
         return "\n\n".join(str(module) for module in self.modules.values())
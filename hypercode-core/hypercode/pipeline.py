@@ -0,0 +1,204 @@
+"""
+Compiles HyperFlow graphs into executable Python pipelines.
+
+``compile_flow`` emits HyperCode text for humans; this module emits a
+self-contained Python module that calls the simulator's node functions
+(``simulate_pcr``, ``simulate_crispr``, ...) directly, in topological order.
+The generated module has no graph walking or type dispatch left in it, and
+is cached by a hash of the graph so saved designs are only compiled once.
+"""
+
+import hashlib
+import json
+import linecache
+import math
+import threading
+import types
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+from hypercode.flow_graph import FlowGraph, as_flow_graph
+
+# Maximum number of compiled pipelines kept in memory
+PIPELINE_CACHE_SIZE = 128
+
+_PIPELINE_CACHE: "OrderedDict[str, types.ModuleType]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+# node type -> simulator function called by the generated code
+_NODE_FUNCTIONS = {
+    "sequence": "simulate_sequence",
+    "pcr": "simulate_pcr",
+    "crispr": "simulate_crispr",
+    "goldengate": "simulate_goldengate",
+}
+
+
+def graph_hash(flow: Union[FlowGraph, Dict[str, Any]]) -> str:
+    """
+    Returns a stable hash of everything that affects simulation.
+
+    Node positions and other editor-only fields are ignored, so moving nodes
+    around the canvas does not invalidate a cached pipeline.
+    """
+    graph = as_flow_graph(flow)
+    canonical = {
+        "nodes": [[node["id"], node["type"], node.get("data", {})] for node in graph.nodes],
+        "edges": [[edge["source"], edge["target"]] for edge in graph.edges],
+    }
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _literal(value: Any) -> str:
+    """Renders a JSON-like value as a Python literal."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return f"float({str(value)!r})"
+    if isinstance(value, dict):
+        items = ", ".join(f"{_literal(k)}: {_literal(v)}" for k, v in value.items())
+        return "{" + items + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_literal(v) for v in value) + "]"
+    return repr(value)
+
+
+def generate_pipeline(flow: Union[FlowGraph, Dict[str, Any]]) -> str:
+    """
+    Generates the Python source of a pipeline module for a HyperFlow graph.
+
+    The module exposes ``GRAPH_HASH`` and ``run()``; ``run()`` returns the
+    same dictionary as ``simulate_flow`` for the graph.
+
+    Args:
+        flow: The JSON representation of the flow graph, or a FlowGraph.
+
+    Returns:
+        Python source code as a string.
+    """
+    graph = as_flow_graph(flow)
+    digest = graph_hash(graph)
+
+    constants: List[str] = []
+    body: List[str] = []
+    var_for: Dict[str, str] = {}  # node ID -> local variable holding its result
+
+    for node_id in graph.topological_order():
+        node = graph.nodes_by_id[node_id]
+        node_type = node["type"]
+        func = _NODE_FUNCTIONS.get(node_type)
+        if func is None:
+            continue
+
+        index = len(var_for)
+        var = f"r{index}"
+        data_name = f"_DATA_{index}"
+        var_for[node_id] = var
+        constants.append(f"{data_name} = {_literal(node['data'])}")
+
+        body.append(f"    # {node_type}: {_literal(node_id)}")
+        if node_type == "sequence":
+            body.append(f"    {var} = {func}({data_name}, {_literal(node_id)})")
+        elif node_type == "goldengate":
+            upstream = [var_for[sid] for sid in graph.sources(node_id) if sid in var_for]
+            if upstream:
+                candidates = ", ".join(upstream) + ("," if len(upstream) == 1 else "")
+                inputs = f"[r for r in ({candidates}) if r is not None]"
+            else:
+                inputs = "[]"
+            body.append(f"    {var} = {func}({data_name}, {inputs})")
+        else:
+            source_id = graph.source(node_id)
+            upstream_var = var_for.get(source_id, "None") if source_id is not None else "None"
+            body.append(f"    {var} = {func}({data_name}, {upstream_var})")
+        body.append(f"    if {var} is not None:")
+        body.append(f"        results[{_literal(node_id)}] = {var}")
+
+    used = sorted({_NODE_FUNCTIONS[graph.nodes_by_id[nid]["type"]] for nid in var_for})
+    lines = [
+        f'"""HyperFlow pipeline generated by hypercode.pipeline (graph {digest[:16]})."""',
+        "",
+    ]
+    if used:
+        lines.append(f"from hypercode.simulator import {', '.join(used)}")
+        lines.append("")
+    lines.append(f"GRAPH_HASH = {digest!r}")
+    lines.append("")
+    lines.extend(constants)
+    lines.append("")
+    lines.append("")
+    lines.append("def run():")
+    lines.append('    """Simulates the graph and returns node ID -> result, like simulate_flow."""')
+    lines.append("    results = {}")
+    lines.extend(body)
+    lines.append("    return results")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def _source_filename(digest: str) -> str:
+    return f"<hypercode-pipeline {digest[:16]}>"
+
+
+def _build_module(source: str, digest: str) -> types.ModuleType:
+    name = f"hypercode_pipeline_{digest[:16]}"
+    filename = _source_filename(digest)
+    # Register the source so tracebacks from generated code show real lines
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    module = types.ModuleType(name)
+    exec(compile(source, filename, "exec"), module.__dict__)
+    return module
+
+
+def load_pipeline(flow: Union[FlowGraph, Dict[str, Any]]) -> types.ModuleType:
+    """
+    Returns the compiled pipeline module for a graph, compiling it on first use.
+
+    Modules are kept in an in-process LRU cache keyed by :func:`graph_hash`.
+    """
+    graph = as_flow_graph(flow)
+    digest = graph_hash(graph)
+    with _CACHE_LOCK:
+        module = _PIPELINE_CACHE.get(digest)
+        if module is not None:
+            _PIPELINE_CACHE.move_to_end(digest)
+            return module
+
+    module = _build_module(generate_pipeline(graph), digest)
+    with _CACHE_LOCK:
+        _PIPELINE_CACHE[digest] = module
+        while len(_PIPELINE_CACHE) > PIPELINE_CACHE_SIZE:
+            evicted, _ = _PIPELINE_CACHE.popitem(last=False)
+            linecache.cache.pop(_source_filename(evicted), None)
+    return module
+
+
+def run_pipeline(flow: Union[FlowGraph, Dict[str, Any]]) -> Dict[str, Any]:
+    """Simulates a graph through its cached pipeline; equivalent to ``simulate_flow``."""
+    return load_pipeline(flow).run()
+
+
+def write_pipeline(flow: Union[FlowGraph, Dict[str, Any]], directory: Union[str, Path]) -> Path:
+    """
+    Writes the pipeline for a graph as an importable ``hf_<hash>.py`` module.
+
+    An existing file for the same graph hash is reused rather than rewritten.
+
+    Returns:
+        The path of the module file.
+    """
+    graph = as_flow_graph(flow)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"hf_{graph_hash(graph)[:16]}.py"
+    if not path.exists():
+        path.write_text(generate_pipeline(graph), encoding="utf-8")
+    return path
+
+
+def clear_pipeline_cache() -> None:
+    """Drops every cached pipeline module."""
+    with _CACHE_LOCK:
+        for digest in _PIPELINE_CACHE:
+            linecache.cache.pop(_source_filename(digest), None)
+        _PIPELINE_CACHE.clear()
@@ -2,8 +2,8 @@
 Data structures for holding the results of a HyperCode execution.
 """
 
-from dataclasses import dataclass
-from typing import Any, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
 
 from hypercode.ast.nodes import Node
 from hypercode.ir.qir_nodes import QIR
@@ -17,10 +17,13 @@ class ExecutionResult:
     Attributes:
         result: The final computed result from the evaluator.
         ast: The root of the Abstract Syntax Tree generated by the parser.
-        qir: The Quantum Intermediate Representation, if generated.
+        qir: The Quantum Intermediate Representation of every circuit in the program, if any.
         error: Any error message produced during execution.
+        metadata: Execution details, e.g. ``metadata["routing"][<circuit>]`` with the
+            backend the "auto" backend chose for each circuit and why.
     """
     result: Any
     ast: Node
     qir: Optional[QIR] = None
     error: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
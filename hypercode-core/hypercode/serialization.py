@@ -0,0 +1,231 @@
+"""
+Compact, content-addressed encoding of simulation results for the backend API.
+
+``simulate_flow`` results embed every DNA sequence inline, and Golden Gate
+nodes repeat the same sequence as ``assemblyResult`` and inside ``parts``.
+The compact format moves each distinct sequence into a single table keyed by
+its content hash and leaves ``...Ref`` fields pointing at it.
+
+MessagePack and CBOR are used when the optional ``msgpack``/``cbor2`` packages
+are installed; zstd compression needs the optional ``zstandard`` package.
+"""
+
+import gzip
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+# Optional encoders
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import cbor2
+    CBOR_AVAILABLE = True
+except ImportError:
+    CBOR_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+COMPACT_FORMAT = "hypercode.compact/1"
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+CBOR_MEDIA_TYPE = "application/cbor"
+
+# Accepted spellings -> canonical media type
+_MEDIA_ALIASES = {
+    "application/json": JSON_MEDIA_TYPE,
+    "application/msgpack": MSGPACK_MEDIA_TYPE,
+    "application/x-msgpack": MSGPACK_MEDIA_TYPE,
+    "application/vnd.msgpack": MSGPACK_MEDIA_TYPE,
+    "application/cbor": CBOR_MEDIA_TYPE,
+}
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 1024
+
+# Result fields holding full sequences, and their reference names
+_RESULT_SEQUENCE_FIELDS = {"sequence": "sequenceRef", "assemblyResult": "assemblyResultRef"}
+_PART_SEQUENCE_FIELDS = {"seq": "seqRef"}
+
+
+def sequence_id(sequence: str) -> str:
+    """Returns the content address used for ``sequence`` in the compact table."""
+    return hashlib.blake2b(sequence.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class _SequenceTable:
+    """Interns sequences by content hash."""
+
+    def __init__(self) -> None:
+        self.sequences: Dict[str, str] = {}
+
+    def intern(self, sequence: str) -> str:
+        seq_id = sequence_id(sequence)
+        existing = self.sequences.setdefault(seq_id, sequence)
+        if existing != sequence:
+            raise ValueError(f"Sequence hash collision on id '{seq_id}'")
+        return seq_id
+
+
+def _replace_fields(record: Dict[str, Any], fields: Dict[str, str], table: _SequenceTable) -> Dict[str, Any]:
+    out = {}
+    for key, value in record.items():
+        ref_key = fields.get(key)
+        if ref_key is not None and isinstance(value, str):
+            out[ref_key] = table.intern(value)
+        else:
+            out[key] = value
+    return out
+
+
+def compact_results(results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converts ``simulate_flow`` output into the compact, deduplicated format.
+
+    Args:
+        results: Node ID -> simulation result, as returned by ``simulate_flow``.
+
+    Returns:
+        A dictionary with ``format``, a ``sequences`` table (id -> sequence) and
+        ``results`` whose sequence fields are replaced by ``...Ref`` ids.
+    """
+    table = _SequenceTable()
+    compact: Dict[str, Any] = {}
+    for node_id, result in results.items():
+        node = _replace_fields(result, _RESULT_SEQUENCE_FIELDS, table)
+        if isinstance(node.get("parts"), list):
+            node["parts"] = [
+                _replace_fields(part, _PART_SEQUENCE_FIELDS, table) if isinstance(part, dict) else part
+                for part in node["parts"]
+            ]
+        compact[node_id] = node
+    return {"format": COMPACT_FORMAT, "sequences": table.sequences, "results": compact}
+
+
+def _restore_fields(record: Dict[str, Any], fields: Dict[str, str], sequences: Dict[str, str]) -> Dict[str, Any]:
+    refs = {ref: key for key, ref in fields.items()}
+    out = {}
+    for key, value in record.items():
+        original = refs.get(key)
+        if original is not None:
+            out[original] = sequences[value]
+        else:
+            out[key] = value
+    return out
+
+
+def expand_results(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of :func:`compact_results`."""
+    if payload.get("format") != COMPACT_FORMAT:
+        raise ValueError(f"Unsupported compact payload format: {payload.get('format')!r}")
+    sequences = payload["sequences"]
+    results: Dict[str, Any] = {}
+    for node_id, node in payload["results"].items():
+        result = _restore_fields(node, _RESULT_SEQUENCE_FIELDS, sequences)
+        if isinstance(result.get("parts"), list):
+            result["parts"] = [
+                _restore_fields(part, _PART_SEQUENCE_FIELDS, sequences) if isinstance(part, dict) else part
+                for part in result["parts"]
+            ]
+        results[node_id] = result
+    return results
+
+
+def _parse_header_list(header: Optional[str]) -> List[Tuple[str, float]]:
+    """Parses an Accept-style header into (value, q) pairs, best first."""
+    items = []
+    for position, raw in enumerate((header or "").split(",")):
+        parts = [p.strip() for p in raw.split(";")]
+        if not parts[0]:
+            continue
+        q = 1.0
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            items.append((parts[0].lower(), q, position))
+    items.sort(key=lambda item: (-item[1], item[2]))
+    return [(value, q) for value, q, _ in items]
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """
+    Picks the response encoding from an ``Accept`` header.
+
+    Binary encodings are only chosen when their optional package is installed;
+    anything else falls back to JSON.
+    """
+    for value, _ in _parse_header_list(accept):
+        media_type = _MEDIA_ALIASES.get(value)
+        if media_type == MSGPACK_MEDIA_TYPE and MSGPACK_AVAILABLE:
+            return media_type
+        if media_type == CBOR_MEDIA_TYPE and CBOR_AVAILABLE:
+            return media_type
+        if media_type == JSON_MEDIA_TYPE:
+            return media_type
+    return JSON_MEDIA_TYPE
+
+
+def negotiate_content_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Picks ``zstd`` or ``gzip`` from an ``Accept-Encoding`` header, or None."""
+    for value, _ in _parse_header_list(accept_encoding):
+        if value == "zstd" and ZSTD_AVAILABLE:
+            return "zstd"
+        if value == "gzip":
+            return "gzip"
+    return None
+
+
+def encode_payload(payload: Any, media_type: str = JSON_MEDIA_TYPE) -> bytes:
+    """Serializes ``payload`` using a media type returned by :func:`negotiate_media_type`."""
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb(payload, use_bin_type=True)
+    if media_type == CBOR_MEDIA_TYPE:
+        return cbor2.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def compress(body: bytes, content_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """
+    Compresses ``body`` with the negotiated content encoding.
+
+    Returns:
+        The (possibly unchanged) body and the Content-Encoding actually applied.
+    """
+    if content_encoding is None or len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+    if content_encoding == "zstd":
+        return zstandard.ZstdCompressor().compress(body), "zstd"
+    if content_encoding == "gzip":
+        return gzip.compress(body, compresslevel=5), "gzip"
+    return body, None
+
+
+def encode_response(
+    payload: Any,
+    accept: Optional[str] = None,
+    accept_encoding: Optional[str] = None,
+) -> Tuple[bytes, str, Optional[str]]:
+    """
+    Negotiates, serializes and compresses a response payload.
+
+    Returns:
+        A (body, media_type, content_encoding) tuple; content_encoding is None
+        when the body was left uncompressed.
+    """
+    media_type = negotiate_media_type(accept)
+    body = encode_payload(payload, media_type)
+    body, content_encoding = compress(body, negotiate_content_encoding(accept_encoding))
+    return body, media_type, content_encoding
@@ -1,10 +1,24 @@
-from fastapi import FastAPI, HTTPException
+import time
+
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 
 from hypercode.compiler import compile_flow
-from hypercode.simulator import simulate_flow
+from hypercode.flow_graph import FlowGraph
+from hypercode.metrics import (
+    FLOW_EDGES, FLOW_NODES, PHASE_SECONDS, REGISTRY, REQUEST_SECONDS, REQUESTS, RESPONSE_BYTES,
+    profile_call,
+)
+from hypercode.pipeline import run_pipeline
+from hypercode.serialization import compact_results, encode_response
+
+# Prometheus text exposition format
+METRICS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Paths reported individually in request metrics; anything else is "other"
+_INSTRUMENTED_PATHS = {"/compile", "/simulate", "/run"}
 
 app = FastAPI(title="HyperCode Backend API")
 
@@ -22,33 +36,122 @@ class FlowRequest(BaseModel):
     edges: List[Dict[str, Any]]
     viewport: Optional[Dict[str, Any]] = None
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Counts every request and times it end to end, including error responses."""
+    endpoint = request.url.path if request.url.path in _INSTRUMENTED_PATHS else "other"
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        REQUEST_SECONDS.observe(time.perf_counter() - start, endpoint=endpoint)
+        REQUESTS.inc(endpoint=endpoint, status=str(status))
+
+def _build_graph(flow: FlowRequest) -> FlowGraph:
+    """Validates and indexes the request graph once, mapping bad graphs to HTTP 400."""
+    with PHASE_SECONDS.time(phase="validation"):
+        try:
+            graph = FlowGraph.from_dict(flow.model_dump())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+    FLOW_NODES.observe(len(graph.nodes))
+    FLOW_EDGES.observe(len(graph.edges))
+    return graph
+
+def _process(flow: FlowRequest, compile_code: bool, simulate: bool, compact: bool) -> Dict[str, Any]:
+    """Runs the requested passes over one validated graph, timing each phase."""
+    graph = _build_graph(flow)
+    payload: Dict[str, Any] = {"success": True}
+    try:
+        if compile_code:
+            with PHASE_SECONDS.time(phase="compile"):
+                try:
+                    payload["code"] = compile_flow(graph)
+                except ValueError as e:
+                    # e.g. a cycle: the graph cannot be compiled, a client error like any malformed graph
+                    raise HTTPException(status_code=400, detail=str(e)) from e
+        if simulate:
+            with PHASE_SECONDS.time(phase="simulate"):
+                simulation_results = run_pipeline(graph)
+            if compact:
+                with PHASE_SECONDS.time(phase="compact"):
+                    simulation_results = compact_results(simulation_results)
+            payload["simulation"] = simulation_results
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    return payload
+
+def _process_maybe_profiled(profile: bool, *args: Any) -> Dict[str, Any]:
+    """Calls _process, attaching a cProfile report to the payload when ``profile`` is set."""
+    if not profile:
+        return _process(*args)
+    payload, report = profile_call(_process, *args)
+    payload["profile"] = report
+    return payload
+
+def _respond(request: Request, payload: Dict[str, Any]) -> Response:
+    """Encodes a payload as negotiated by the Accept / Accept-Encoding headers."""
+    with PHASE_SECONDS.time(phase="encode"):
+        body, media_type, content_encoding = encode_response(
+            payload,
+            accept=request.headers.get("accept"),
+            accept_encoding=request.headers.get("accept-encoding"),
+        )
+    RESPONSE_BYTES.observe(len(body), endpoint=request.url.path)
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if content_encoding:
+        headers["Content-Encoding"] = content_encoding
+    return Response(content=body, media_type=media_type, headers=headers)
+
 @app.get("/")
 async def root():
     return {"message": "HyperCode Backend Online", "status": "ready"}
 
+@app.get("/metrics")
+async def metrics_endpoint():
+    """
+    Exposes request, phase and per-node-type timings in Prometheus text format.
+    """
+    return Response(content=REGISTRY.render(), media_type=METRICS_MEDIA_TYPE)
+
 @app.post("/compile")
-async def compile_endpoint(flow: FlowRequest):
+async def compile_endpoint(flow: FlowRequest, profile: bool = False):
     """
-    Compiles a Visual Flow into HyperCode source text.
+    Compiles a Visual Flow into HyperCode source text (no simulation).
+    With ``?profile=1`` the response includes a cProfile report for the request.
     """
-    try:
-        # Convert Pydantic model to dict
-        flow_data = flow.model_dump()
-        
-        # Generate Code
-        source_code = compile_flow(flow_data)
-        
-        # Run Simulation
-        simulation_results = simulate_flow(flow_data)
-        
-        return {
-            "success": True,
-            "code": source_code,
-            "simulation": simulation_results,
-            "message": "Compilation and Simulation successful"
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) from e
+    payload = _process_maybe_profiled(profile, flow, True, False, False)
+    payload["message"] = "Compilation successful"
+    return payload
+
+@app.post("/simulate")
+async def simulate_endpoint(flow: FlowRequest, request: Request, compact: bool = False, profile: bool = False):
+    """
+    Simulates a Visual Flow without generating HyperCode source.
+    Runs through the cached Python pipeline for the graph (see hypercode.pipeline).
+
+    With ``?compact=true`` sequences are deduplicated into a content-addressed
+    table; the encoding follows the Accept / Accept-Encoding headers.
+    With ``?profile=1`` the response includes a cProfile report for the request.
+    """
+    payload = _process_maybe_profiled(profile, flow, False, True, compact)
+    payload["message"] = "Simulation successful"
+    return _respond(request, payload)
+
+@app.post("/run")
+async def run_endpoint(flow: FlowRequest, request: Request, compact: bool = False, profile: bool = False):
+    """
+    Compiles and simulates a Visual Flow, sharing one validated graph between both passes.
+    Supports the same ``compact``, ``profile`` and content negotiation options as /simulate.
+    """
+    payload = _process_maybe_profiled(profile, flow, True, True, compact)
+    payload["message"] = "Compilation and Simulation successful"
+    return _respond(request, payload)
 
 if __name__ == "__main__":
     import uvicorn
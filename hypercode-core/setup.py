@@ -9,6 +9,7 @@ setup(
     ],
     extras_require={
         'qiskit': ['qiskit>=1.0.0', 'qiskit-aer>=0.13.0'],
+        'binary': ['msgpack>=1.0', 'cbor2>=5.4', 'zstandard>=0.21'],
     },
     python_requires='>=3.8',
     entry_points={
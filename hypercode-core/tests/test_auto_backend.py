@@ -0,0 +1,85 @@
+import math
+
+from hypercode.api import execute
+from hypercode.backends import get_backend
+from hypercode.backends.auto_backend import AutoBackend, analyze_module
+from hypercode.backends.statevector_backend import StatevectorBackend
+from hypercode.interpreter.evaluator import Evaluator
+from hypercode.ir.qir_nodes import QAlloc, QEnd, QGate, QMeasure, QModule
+from hypercode.parser.parser import parse
+
+def rotation(theta: float) -> QModule:
+    return QModule("Rot", [QAlloc(0, 1), QGate("RY", [0], [theta]), QMeasure(0, "c0"), QEnd()])
+
+def test_statevector_matches_rotation_probabilities():
+    counts = StatevectorBackend().execute(rotation(2 * math.asin(math.sqrt(0.25))), shots=4000, seed=5)
+    assert 800 < counts["1"] < 1200
+    # A measured qubit reused by a later gate goes through per-shot simulation
+    module = QModule("Mid", [
+        QAlloc(0, 1), QGate("H", [0], []), QMeasure(0, "a"), QGate("X", [0], []), QMeasure(0, "b"), QEnd(),
+    ])
+    assert set(StatevectorBackend().execute(module, shots=200, seed=1)) == {"10", "01"}
+
+def test_analysis_reports_depth_and_gate_set():
+    module = QModule("M", [
+        QAlloc(0, 3), QGate("H", [0], []), QGate("CX", [0, 1], []), QGate("RZ", [2], [0.1]),
+        QMeasure(0, "c0"), QEnd(),
+    ])
+    profile = analyze_module(module)
+    assert (profile.num_qubits, profile.num_gates, profile.depth) == (3, 3, 3)
+    assert profile.gate_counts == {"H": 1, "CX": 1, "RZ": 1}
+    assert not profile.clifford and profile.terminal_measurements
+
+def test_routes_each_circuit_and_caches_seeded_results():
+    clifford = QModule("Bell", [
+        QAlloc(0, 2), QGate("H", [0], []), QGate("CX", [0, 1], []), QMeasure(0, "c0"), QMeasure(1, "c1"), QEnd(),
+    ])
+    backend = get_backend("auto")
+    results = backend.execute_batch([clifford, rotation(0.4)], shots=100, seed=3)
+    assert set(results[0]) == {"00", "11"}
+    assert [d.backend for d in backend.last_decisions] == ["stabilizer", "statevector"]
+
+    again = backend.execute(rotation(0.4), shots=100, seed=3)
+    assert again == results[1]
+    assert backend.last_decisions[0].cached
+    backend.execute(rotation(0.4), shots=100, seed=None)
+    assert not backend.last_decisions[0].cached
+
+def test_routing_decisions_reach_execution_result():
+    code = """
+    @quantum Bell qubits 2
+    H q0
+    CX q0 q1
+    MEASURE q0 -> c0
+    MEASURE q1 -> c1
+    @end
+    """
+    result = execute(code, backend_name="auto", shots=50, seed=1)
+    assert result.error is None
+    routing = result.metadata["routing"]["Bell"]
+    assert routing["backend"] == "stabilizer"
+    assert routing["profile"]["clifford"] is True
+    assert set(result.result["Bell_results"]) == {"00", "11"}
+
+def test_sharded_auto_routes_before_sharding():
+    code = """
+    @quantum Bell qubits 2
+    H q0
+    CX q0 q1
+    MEASURE q0 -> c0
+    MEASURE q1 -> c1
+    @end
+    @quantum Rot qubits 1
+    RY(0.4) q0
+    MEASURE q0 -> c0
+    @end
+    """
+    evaluator = Evaluator(backend_name="auto", shots=100, seed=2, workers=2)
+    try:
+        evaluator.evaluate(parse(code))
+    finally:
+        evaluator.close()
+    routing = evaluator.metadata["routing"]
+    assert (routing["Bell"]["backend"], routing["Rot"]["backend"]) == ("stabilizer", "statevector")
+    assert set(evaluator.variables["Bell_results"]) == {"00", "11"}
+    assert sum(evaluator.variables["Rot_results"].values()) == 100
@@ -0,0 +1,64 @@
+import pytest
+from hypercode.compiler import compile_flow, _sanitize_name
+
+def _statements(code):
+    return [line for line in code.splitlines() if line and not line.startswith("#")]
+
+def test_chain_emitted_in_dependency_order():
+    """PCR -> CRISPR -> PCR must reference variables that are already declared."""
+    flow = {
+        "nodes": [
+            {"id": "pcr2", "type": "pcr", "data": {"label": "Final"}},
+            {"id": "cr", "type": "crispr", "data": {"label": "Edit", "guideRNA": "AAAA"}},
+            {"id": "pcr1", "type": "pcr", "data": {"label": "First"}},
+            {"id": "s", "type": "sequence", "data": {"label": "Template", "sequence": "ATGC"}},
+        ],
+        "edges": [
+            {"source": "cr", "target": "pcr2"},
+            {"source": "pcr1", "target": "cr"},
+            {"source": "s", "target": "pcr1"},
+        ],
+    }
+    lines = _statements(compile_flow(flow))
+    assert lines == [
+        'dna template = "ATGC"',
+        'dna first = pcr(template, fwd="", rev="")',
+        'dna edit = crispr(first, gRNA="AAAA", pam="")',
+        'dna final = pcr(edit, fwd="", rev="")',
+    ]
+
+def test_colliding_labels_get_unique_names():
+    flow = {
+        "nodes": [
+            {"id": "a", "type": "sequence", "data": {"label": "Part A", "sequence": "AA"}},
+            {"id": "b", "type": "sequence", "data": {"label": "part-a", "sequence": "CC"}},
+            {"id": "c", "type": "sequence", "data": {"label": "Part (A)", "sequence": "GG"}},
+            {"id": "gg", "type": "goldengate", "data": {"label": "Part A"}},
+        ],
+        "edges": [
+            {"source": "a", "target": "gg"},
+            {"source": "b", "target": "gg"},
+            {"source": "c", "target": "gg"},
+        ],
+    }
+    lines = _statements(compile_flow(flow))
+    assert lines[:3] == ['dna part_a = "AA"', 'dna part_a_2 = "CC"', 'dna part_a_3 = "GG"']
+    assert lines[3] == 'dna part_a_4 = assembly([part_a, part_a_2, part_a_3], method="GoldenGate", enzyme="BsaI")'
+
+def test_sanitize_name_produces_identifiers():
+    assert _sanitize_name("RBS+GFP") == "rbs_gfp"
+    assert _sanitize_name("3' UTR v2.1") == "_3_utr_v21"
+
+def test_cycle_is_rejected():
+    flow = {
+        "nodes": [
+            {"id": "p1", "type": "pcr", "data": {}},
+            {"id": "p2", "type": "pcr", "data": {}},
+        ],
+        "edges": [
+            {"source": "p1", "target": "p2"},
+            {"source": "p2", "target": "p1"},
+        ],
+    }
+    with pytest.raises(ValueError, match="cycle"):
+        compile_flow(flow)
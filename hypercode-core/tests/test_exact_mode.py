@@ -0,0 +1,58 @@
+import math
+
+import pytest
+
+from hypercode.api import execute
+from hypercode.backends import get_backend, sample_counts
+from hypercode.backends.stabilizer_backend import StabilizerBackend
+from hypercode.backends.statevector_backend import StatevectorBackend
+from hypercode.ir.qir_nodes import QAlloc, QEnd, QGate, QMeasure, QModule
+
+def test_statevector_exact_probabilities():
+    theta = 2 * math.asin(math.sqrt(0.3))
+    module = QModule("Rot", [
+        QAlloc(0, 2), QGate("RY", [1], [theta]), QMeasure(1, "b"), QMeasure(0, "a"), QEnd(),
+    ])
+    probabilities = StatevectorBackend().execute(module, exact=True)
+    assert probabilities.keys() == {"00", "01"}
+    assert probabilities["01"] == pytest.approx(0.3)
+
+def test_mid_circuit_measurement_branches_exactly():
+    module = QModule("Mid", [
+        QAlloc(0, 1), QGate("H", [0], []), QMeasure(0, "a"), QGate("H", [0], []), QMeasure(0, "b"), QEnd(),
+    ])
+    probabilities = StatevectorBackend().execute(module, exact=True)
+    assert probabilities == pytest.approx({"00": 0.25, "01": 0.25, "10": 0.25, "11": 0.25})
+
+def test_stabilizer_exact_distribution_is_uniform_over_outcomes():
+    n = 40
+    module = QModule("GHZ", [QAlloc(0, n), QGate("H", [0], [])]
+                     + [QGate("CX", [i, i + 1], []) for i in range(n - 1)]
+                     + [QMeasure(i, f"c{i}") for i in range(n)] + [QEnd()])
+    assert StabilizerBackend().execute(module, exact=True) == {"0" * n: 0.5, "1" * n: 0.5}
+    plus = QModule("Plus", [QAlloc(0, 3)] + [QGate("H", [i], []) for i in range(3)]
+                   + [QMeasure(i, f"c{i}") for i in range(3)] + [QEnd()])
+    assert StabilizerBackend().execute(plus, exact=True) == {format(i, "03b"): 0.125 for i in range(8)}
+
+def test_sample_counts_draws_from_distribution():
+    counts = sample_counts({"0": 0.75, "1": 0.25}, shots=4000, seed=2)
+    assert sum(counts.values()) == 4000
+    assert 2800 < counts["0"] < 3200
+    assert counts == sample_counts({"0": 0.75, "1": 0.25}, shots=4000, seed=2)
+
+def test_exact_results_through_api():
+    code = """
+    @quantum Bell qubits 2
+    H q0
+    CX q0 q1
+    MEASURE q0 -> c0
+    MEASURE q1 -> c1
+    @end
+    """
+    result = execute(code, backend_name="auto", exact=True)
+    assert result.error is None
+    assert result.result["Bell_results"] == {"00": 0.5, "11": 0.5}
+    auto = get_backend("auto")
+    module = result.qir.modules["Bell"]
+    assert auto.execute(module, exact=True) == auto.execute(module, exact=True)
+    assert auto.last_decisions[0].cached
@@ -70,3 +70,51 @@ def test_evaluator_quantum_execution_integration() -> None:
     assert len(results) > 0
     total_shots = sum(results.values())
     assert total_shots == 1024 # default shots
+
+class _FakeResult:
+    def __init__(self, circuits):
+        self.circuits = circuits
+
+    def get_counts(self, i=None):
+        name = self.circuits[0 if i is None else i]
+        if name == "Free":
+            raise Exception(f'No counts for experiment "{i}"')
+        return {"0": 10}
+
+class _FakeSimulator:
+    def __init__(self, fail_batches=False):
+        self.fail_batches = fail_batches
+
+    def run(self, circuits, **options):
+        circuits = circuits if isinstance(circuits, list) else [circuits]
+        if self.fail_batches and len(circuits) > 1:
+            raise Exception("transpiler error")
+        job = MagicMock()
+        job.result.return_value = _FakeResult(circuits)
+        return job
+
+@pytest.mark.parametrize("fail_batches", [False, True])
+def test_qiskit_batch_isolates_failing_circuits(monkeypatch, fail_batches) -> None:
+    """A circuit without counts gets {} on its own; the rest of the batch keeps its results."""
+    from hypercode.backends import qiskit_backend
+    from hypercode.ir.qir_nodes import QAlloc, QEnd, QGate, QMeasure, QModule
+
+    monkeypatch.setattr(qiskit_backend, "QISKIT_AVAILABLE", True)
+    monkeypatch.setattr(qiskit_backend, "SIMULATOR_BACKEND", _FakeSimulator(fail_batches))
+    monkeypatch.setattr(qiskit_backend, "transpile", lambda circuits, backend: circuits, raising=False)
+    monkeypatch.setattr(qiskit_backend.QiskitBackend, "compile", lambda self, module: (module.name, {}))
+    measured = QModule("Measured", [QAlloc(0, 1), QGate("H", [0], []), QMeasure(0, "c0"), QEnd()])
+    free = QModule("Free", [QAlloc(0, 1), QGate("H", [0], []), QEnd()])
+
+    results = qiskit_backend.QiskitBackend().execute_batch([free, measured], shots=10, seed=1)
+    assert results == [{}, {"0": 10}]
+
+@pytest.mark.skipif(not QISKIT_PRESENT, reason="Qiskit not installed")
+def test_qiskit_batch_with_unmeasured_circuit() -> None:
+    from hypercode.backends.qiskit_backend import QiskitBackend
+    from hypercode.ir.qir_nodes import QAlloc, QEnd, QGate, QMeasure, QModule
+
+    measured = QModule("Measured", [QAlloc(0, 1), QGate("X", [0], []), QMeasure(0, "c0"), QEnd()])
+    free = QModule("Free", [QAlloc(0, 1), QGate("H", [0], []), QEnd()])
+    results = QiskitBackend().execute_batch([free, measured], shots=20, seed=1)
+    assert results[0] == {} and results[1] == {"1": 20}
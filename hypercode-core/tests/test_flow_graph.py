@@ -0,0 +1,46 @@
+import pytest
+from hypercode.flow_graph import FlowGraph
+from hypercode.compiler import compile_flow
+from hypercode.simulator import simulate_flow
+
+def _flow():
+    return {
+        "nodes": [
+            {"id": "seq1", "type": "sequence", "data": {"sequence": "ATGCGTACGTGC", "label": "Template"}},
+            {"id": "seq2", "type": "sequence", "data": {"sequence": "GGGG", "label": "Insert"}},
+            {"id": "pcr1", "type": "pcr", "data": {"label": "Amp"}},
+            {"id": "gg1", "type": "goldengate", "data": {"enzyme": "BsaI", "label": "Plasmid"}},
+        ],
+        "edges": [
+            {"source": "seq1", "target": "pcr1"},
+            {"source": "pcr1", "target": "gg1"},
+            {"source": "seq2", "target": "gg1"},
+        ],
+    }
+
+def test_indexes_built_once():
+    graph = FlowGraph.from_dict(_flow())
+    assert set(graph.nodes_by_id) == {"seq1", "seq2", "pcr1", "gg1"}
+    assert graph.source("pcr1") == "seq1"
+    assert graph.source("seq1") is None
+    assert graph.sources("gg1") == ["pcr1", "seq2"]  # edge order preserved
+    assert graph.targets("seq1") == ["pcr1"]
+
+def test_rejects_duplicate_node_ids():
+    flow = _flow()
+    flow["nodes"].append({"id": "seq1", "type": "sequence", "data": {}})
+    with pytest.raises(ValueError, match="Duplicate node id"):
+        FlowGraph.from_dict(flow)
+
+def test_rejects_dangling_edges():
+    flow = _flow()
+    flow["edges"].append({"source": "ghost", "target": "pcr1"})
+    with pytest.raises(ValueError, match="unknown source node 'ghost'"):
+        FlowGraph.from_dict(flow)
+
+def test_compiler_and_simulator_share_graph():
+    flow = _flow()
+    graph = FlowGraph.from_dict(flow)
+    assert compile_flow(graph) == compile_flow(flow)
+    assert simulate_flow(graph) == simulate_flow(flow)
+    assert simulate_flow(graph)["pcr1"]["sequence"] == "ATGCGTACGTGC"
@@ -0,0 +1,55 @@
+import pytest
+from hypercode.parser.parser import parse
+from hypercode.ir.binary import dumps_qir, loads_qir
+from hypercode.ir.columnar import InstructionTable
+from hypercode.ir.lower_quantum import lower_circuit
+from hypercode.ir.qir_nodes import QIR
+
+CODE = """
+@quantum Bell qubits 2
+H q0
+CX q0 q1
+MEASURE q0 -> c0
+MEASURE q1 -> c1
+@end
+@quantum Rot qubits 1
+RX(0.25) q0
+RZ(PI) q0
+MEASURE q0 -> c0
+@end
+"""
+
+def _qir(columnar=False):
+    qir = QIR(metadata={"source": "test.hc"})
+    for stmt in parse(CODE).statements:
+        qir.add_module(lower_circuit(stmt, columnar=columnar))
+    return qir
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_save_and_load_round_trip(tmp_path, use_mmap):
+    qir = _qir()
+    path = tmp_path / "prog.hqir"
+    qir.save(str(path))
+    loaded = QIR.load(str(path), use_mmap=use_mmap)
+    assert list(loaded.modules) == ["Bell", "Rot"]
+    assert loaded.metadata == {"source": "test.hc"}
+    for name, module in qir.modules.items():
+        assert loaded.modules[name] == module
+        assert str(loaded.modules[name]) == str(module)
+    assert isinstance(loaded.modules["Rot"].instructions, InstructionTable)
+
+def test_columnar_and_list_modules_serialize_identically():
+    assert dumps_qir(_qir()) == dumps_qir(_qir(columnar=True))
+
+def test_loaded_qir_can_be_saved_again():
+    data = dumps_qir(_qir())
+    assert dumps_qir(loads_qir(data)) == data
+
+def test_rejects_bad_data():
+    data = dumps_qir(_qir())
+    with pytest.raises(ValueError, match="magic"):
+        loads_qir(b"XXXX" + data[4:])
+    with pytest.raises(ValueError, match="version"):
+        loads_qir(data[:4] + b"\x63\x00" + data[6:])
+    with pytest.raises(ValueError):
+        loads_qir(data[:-16])
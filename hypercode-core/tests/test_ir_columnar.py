@@ -0,0 +1,56 @@
+from hypercode.parser.parser import parse
+from hypercode.ir.columnar import InstructionTable
+from hypercode.ir.lower_quantum import lower_circuit
+from hypercode.ir.optimize import optimize_module
+from hypercode.ir.qir_nodes import QModule, QAlloc, QGate, QMeasure, QEnd
+
+CODE = """
+@quantum Rot qubits 2
+H q0
+RZ(PI / 2) q1
+CX q0 q1
+MEASURE q0 -> c0
+MEASURE q1
+@end
+"""
+
+def test_round_trips_instructions():
+    instructions = [
+        QAlloc(0, 2),
+        QGate("H", [0], []),
+        QGate("RZ", [1], [0.5]),
+        QGate("CX", [0, 1], []),
+        QMeasure(1, "c1"),
+        QEnd(),
+    ]
+    table = InstructionTable(instructions)
+    assert len(table) == 6
+    assert list(table) == instructions
+    assert table == instructions
+    assert table[-1] == QEnd()
+    assert table[1:3] == instructions[1:3]
+    assert table.gate_count() == 3
+    assert table.operands(3) == (0, 1)
+    assert len(table.gate_names) == 3
+
+def test_columnar_lowering_matches_list_lowering():
+    circuit = parse(CODE).statements[0]
+    rows = lower_circuit(circuit)
+    columns = lower_circuit(circuit, columnar=True)
+    assert isinstance(columns.instructions, InstructionTable)
+    assert rows == columns
+    assert str(rows) == str(columns)
+
+def test_optimizer_keeps_modules_columnar():
+    module = QModule("M", InstructionTable([QAlloc(0, 1), QGate("X", [0], []), QGate("X", [0], []), QEnd()]))
+    optimized, stats = optimize_module(module)
+    assert isinstance(optimized.instructions, InstructionTable)
+    assert list(optimized.instructions) == [QAlloc(0, 1), QEnd()]
+    assert stats.gates_after == 0
+
+def test_columns_are_compact():
+    table = InstructionTable()
+    for i in range(1000):
+        table.append_gate("RZ", [i % 4], [0.1])
+    # 1 opcode + 4 arg + 4 qubit + 4 offset + 4 offset + 8 param bytes per gate
+    assert table.nbytes() < 26 * 1000 + 16
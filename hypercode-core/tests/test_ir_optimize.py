@@ -0,0 +1,61 @@
+import math
+from hypercode.ir.optimize import optimize_module
+from hypercode.ir.qir_nodes import QModule, QAlloc, QGate, QMeasure, QEnd
+
+def _module(*gates):
+    return QModule(name="M", instructions=[QAlloc(0, 3), *gates, QEnd()])
+
+def _gates(module):
+    return [(g.name, g.qubits, g.params) for g in module.instructions if isinstance(g, QGate)]
+
+def test_self_inverse_pairs_cancel_across_disjoint_qubits():
+    module = _module(
+        QGate("H", [0], []),
+        QGate("X", [1], []),
+        QGate("H", [0], []),
+        QGate("CX", [1, 2], []),
+        QGate("CX", [1, 2], []),
+    )
+    optimized, stats = optimize_module(module)
+    assert _gates(optimized) == [("X", [1], [])]
+    assert (stats.gates_before, stats.gates_after, stats.cancelled) == (5, 1, 4)
+    assert len(module.instructions) == 7  # Input is untouched
+
+def test_nested_pairs_cancel_completely():
+    optimized, stats = optimize_module(_module(
+        QGate("H", [0], []), QGate("X", [0], []), QGate("X", [0], []), QGate("H", [0], []),
+    ))
+    assert _gates(optimized) == []
+    assert stats.gates_after == 0
+
+def test_cx_does_not_cancel_with_reversed_operands_but_cz_does():
+    optimized, _ = optimize_module(_module(
+        QGate("CX", [0, 1], []), QGate("CX", [1, 0], []),
+        QGate("CZ", [0, 2], []), QGate("CZ", [2, 0], []),
+    ))
+    assert _gates(optimized) == [("CX", [0, 1], []), ("CX", [1, 0], [])]
+
+def test_rotations_merge_and_zero_angles_drop():
+    optimized, stats = optimize_module(_module(
+        QGate("RZ", [0], [0.25]),
+        QGate("H", [1], []),
+        QGate("RZ", [0], [0.5]),
+        QGate("RX", [1], [0.0]),
+        QGate("RY", [2], [math.pi]),
+        QGate("RY", [2], [math.pi]),
+    ))
+    assert _gates(optimized) == [("RZ", [0], [0.75]), ("H", [1], [])]
+    assert (stats.merged, stats.dropped) == (2, 2)
+
+def test_measurement_blocks_cancellation():
+    optimized, _ = optimize_module(_module(
+        QGate("X", [0], []), QMeasure(0, "c0"), QGate("X", [0], []),
+    ))
+    assert len(_gates(optimized)) == 2
+    assert isinstance(optimized.instructions[2], QMeasure)
+
+def test_entangling_gate_blocks_single_qubit_cancellation():
+    optimized, _ = optimize_module(_module(
+        QGate("H", [0], []), QGate("CX", [0, 1], []), QGate("H", [0], []),
+    ))
+    assert len(_gates(optimized)) == 3
@@ -0,0 +1,94 @@
+import io
+import math
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from hypercode.backends.base import BaseBackend
+from hypercode.interpreter.evaluator import Evaluator
+from hypercode.ir.binary import dumps_qir, loads_qir
+from hypercode.ir.columnar import InstructionTable
+from hypercode.ir.lower_quantum import lower_circuit
+from hypercode.ir.optimize import optimize_module
+from hypercode.ir.params import ParamBinOp, ParamRef, format_param, parse_param
+from hypercode.ir.qasm import dumps_qasm, load_qasm
+from hypercode.ir.qir_nodes import QIR, QAlloc, QEnd, QGate, QMeasure, QModule
+from hypercode.parser.parser import parse
+
+CODE = """
+@quantum Sweep qubits 1
+RX(theta / 2) q0
+RZ(phi) q0
+RZ(phi) q0
+MEASURE q0 -> c0
+@end
+"""
+
+def test_bind_and_format_round_trip():
+    expr = (ParamRef("theta") * 2.0 + 0.5) / ParamRef("phi")
+    assert expr.free_parameters() == {"theta", "phi"}
+    assert expr.bind({"theta": 1.0, "phi": 2.0}) == pytest.approx(1.25)
+    assert isinstance(expr.bind({"theta": 1.0}), ParamBinOp)
+    assert parse_param(format_param(expr)) == expr
+    assert parse_param("-pi / 2 + x", {"pi": math.pi}) == ParamBinOp("+", -math.pi / 2, ParamRef("x"))
+    with pytest.raises(ValueError):
+        parse_param("x ** 2")
+
+def test_symbolic_lowering_and_optimizer_merge():
+    circuit = parse(CODE).statements[0]
+    with pytest.raises(ValueError):
+        lower_circuit(circuit)
+    for columnar in (False, True):
+        module = lower_circuit(circuit, symbolic=True, columnar=columnar)
+        assert module.parameters() == ["phi", "theta"]
+        optimized, stats = optimize_module(module)
+        assert stats.merged == 1
+        bound = optimized.bind({"theta": 1.0, "phi": 0.25})
+        assert bound.parameters() == []
+        gates = [i for i in bound.instructions if isinstance(i, QGate)]
+        assert [(g.name, g.params) for g in gates] == [("RX", [0.5]), ("RZ", [0.5])]
+
+def test_symbolic_params_survive_binary_round_trip():
+    module = lower_circuit(parse(CODE).statements[0], symbolic=True, columnar=True)
+    qir = QIR()
+    qir.add_module(module)
+    loaded = loads_qir(dumps_qir(qir)).modules["Sweep"]
+    assert loaded.parameters() == ["phi", "theta"]
+    assert list(loaded.instructions) == list(module.instructions)
+    # Binding a loaded (memoryview-backed) table leaves the original untouched
+    assert loaded.bind({"theta": 2.0, "phi": 0.0}).parameters() == []
+    assert loaded.parameters() == ["phi", "theta"]
+
+def test_qasm3_input_declarations_round_trip():
+    module = QModule("P", [QAlloc(0, 1), QGate("RZ", [0], [ParamRef("t") * 2.0]), QMeasure(0, "c0"), QEnd()])
+    text = dumps_qasm(module)
+    assert "input float[64] t;" in text
+    parsed = load_qasm(io.StringIO(text), name="P")
+    assert parsed.parameters() == ["t"]
+    assert parsed == module
+    with pytest.raises(ValueError):
+        dumps_qasm(module, version=2)
+    with pytest.raises(ValueError):
+        load_qasm(io.StringIO(text.replace("input float[64] t;\n", "")))
+
+def test_bind_parameters_requires_every_value():
+    module = QModule("P", InstructionTable([QAlloc(0, 1), QGate("RY", [0], [ParamRef("a")]), QEnd()]))
+    with pytest.raises(ValueError, match="unbound parameters"):
+        BaseBackend.bind_parameters(module, {})
+    assert BaseBackend.bind_parameters(module, {"a": 0.3}).instructions[1] == QGate("RY", [0], [0.3])
+
+def test_evaluator_lowers_once_and_binds_at_execution():
+    circuit = parse(CODE).statements[0]
+    with patch('hypercode.interpreter.evaluator.get_backend') as mock_get_backend:
+        mock_backend = MagicMock()
+        mock_backend.execute.return_value = {"0": 1}
+        mock_get_backend.return_value = mock_backend
+
+        evaluator = Evaluator(shots=1, seed=1, batch=False, symbolic_params=True)
+        modules = []
+        for theta in (0.0, 1.0):
+            evaluator.variables.update(theta=theta, phi=0.5)
+            evaluator.execute(circuit)
+            modules.append(mock_backend.execute.call_args.args[0])
+            assert mock_backend.execute.call_args.kwargs["parameters"] == {"theta": theta, "phi": 0.5}
+        assert modules[0] is modules[1]
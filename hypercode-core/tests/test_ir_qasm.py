@@ -0,0 +1,82 @@
+import io
+import math
+import pytest
+from hypercode.parser.parser import parse
+from hypercode.ir.columnar import InstructionTable
+from hypercode.ir.lower_quantum import lower_circuit
+from hypercode.ir.qasm import dump_qasm, dumps_qasm, parse_qasm
+from hypercode.ir.qir_nodes import QAlloc, QGate, QMeasure, QEnd
+
+CODE = """
+@quantum Bell qubits 2
+H q0
+RZ(PI / 3) q1
+CX q0 q1
+MEASURE q0 -> c0
+MEASURE q1 -> result
+@end
+"""
+
+def _module(columnar=False):
+    return lower_circuit(parse(CODE).statements[0], columnar=columnar)
+
+def test_emits_openqasm3():
+    lines = dumps_qasm(_module()).splitlines()
+    assert lines[1:5] == ["OPENQASM 3.0;", 'include "stdgates.inc";', "qubit[2] q;", "bit c0;"]
+    assert "cx q[0], q[1];" in lines
+    assert "result = measure q[1];" in lines
+
+def test_emits_openqasm2():
+    text = dumps_qasm(_module(), version=2)
+    assert "qreg q[2];" in text and "creg result[1];" in text
+    assert "measure q[0] -> c0[0];" in text
+
+@pytest.mark.parametrize("version", [2, 3])
+@pytest.mark.parametrize("columnar", [False, True])
+def test_round_trip(version, columnar):
+    module = _module(columnar)
+    out = io.StringIO()
+    dump_qasm(module, out, version=version)
+    assert out.getvalue() == dumps_qasm(_module(), version=version)
+    parsed = parse_qasm(out.getvalue(), name="Bell", columnar=columnar)
+    assert parsed == _module()
+
+def test_parses_streamed_chunks_with_comments_and_broadcast():
+    source = """OPENQASM 2.0;
+include "qelib1.inc"; // standard gates
+qreg a[2]; qreg b[1];
+creg c[2];
+/* block
+   comment */ h a;
+rx(-pi/2) b[0];
+cx a[0], b[0];
+measure a -> c; // whole-register measurement
+"""
+    chunks = [source[i:i + 3] for i in range(0, len(source), 3)]
+    module = parse_qasm(chunks)
+    assert list(module.instructions) == [
+        QAlloc(0, 2),
+        QAlloc(2, 1),
+        QGate("H", [0], []),
+        QGate("H", [1], []),
+        QGate("RX", [2], [-math.pi / 2]),
+        QGate("CX", [0, 2], []),
+        QMeasure(0, "c0"),
+        QMeasure(1, "c1"),
+        QEnd(),
+    ]
+
+def test_columnar_import():
+    module = parse_qasm(dumps_qasm(_module()), columnar=True)
+    assert isinstance(module.instructions, InstructionTable)
+    assert module.instructions.gate_count() == 3
+
+@pytest.mark.parametrize("source", [
+    "qubit[1] q; reset q[0];",
+    "qubit[1] q; rz(__import__('os')) q[0];",
+    "qubit[1] q; h r[0];",
+    "qubit[1] q; h q[0]",
+])
+def test_rejects_unsupported_input(source):
+    with pytest.raises(ValueError):
+        parse_qasm(source)
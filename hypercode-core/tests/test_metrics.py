@@ -0,0 +1,50 @@
+from hypercode.metrics import Counter, Histogram, MetricsRegistry, NODE_SECONDS, profile_call
+from hypercode.simulator import simulate_flow
+
+def test_counter_and_histogram_render_prometheus_text():
+    registry = MetricsRegistry()
+    requests = registry.counter("req", "Requests.", ("endpoint",))
+    latency = registry.histogram("lat_seconds", "Latency.", buckets=(0.1, 1.0))
+    requests.inc(endpoint="/run")
+    requests.inc(2, endpoint="/run")
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(3)
+
+    text = registry.render()
+    assert "# TYPE req counter" in text
+    assert 'req_total{endpoint="/run"} 3' in text
+    assert 'lat_seconds_bucket{le="0.1"} 1' in text
+    assert 'lat_seconds_bucket{le="1"} 2' in text
+    assert 'lat_seconds_bucket{le="+Inf"} 3' in text
+    assert "lat_seconds_count 3" in text
+    assert latency.snapshot() == (3, 3.55)
+
+def test_label_values_are_escaped():
+    counter = Counter("c", "Doc.", ("name",))
+    counter.inc(name='a"b\\c')
+    assert counter.render() == ['c_total{name="a\\"b\\\\c"} 1']
+
+def test_histogram_time_context_manager():
+    histogram = Histogram("h", "Doc.", ("phase",))
+    with histogram.time(phase="compile"):
+        pass
+    count, total = histogram.snapshot(phase="compile")
+    assert count == 1 and total >= 0
+
+def test_simulation_is_timed_per_node_type():
+    before, _ = NODE_SECONDS.snapshot(node_type="pcr")
+    simulate_flow({
+        "nodes": [
+            {"id": "s", "type": "sequence", "data": {"sequence": "ATGCATGC"}},
+            {"id": "p", "type": "pcr", "data": {"forwardPrimer": "ATG", "reversePrimer": "GCA"}},
+        ],
+        "edges": [{"source": "s", "target": "p"}],
+    })
+    after, _ = NODE_SECONDS.snapshot(node_type="pcr")
+    assert after == before + 1
+
+def test_profile_call_reports_callees():
+    result, report = profile_call(sorted, [3, 1, 2])
+    assert result == [1, 2, 3]
+    assert "cumulative" in report
@@ -0,0 +1,58 @@
+import importlib.util
+
+from hypercode.simulator import simulate_flow
+from hypercode.pipeline import (
+    generate_pipeline, graph_hash, load_pipeline, run_pipeline, write_pipeline,
+)
+
+PROMOTER = "GGTCTCAGGAGTTGACAGCTAGCTCAGTCCTAGGTATAATGCTAGCTACTAGAGACC"
+RBS = "GGTCTCATACTAAAGAGGAGAAATACTAGATGCGTAAAGGAGAAGAACTTTTCACTGGAGTTGTCCAATAAAATGAGAGACC"
+
+def _flow():
+    return {
+        "nodes": [
+            {"id": "gg", "type": "goldengate", "data": {"enzyme": "BsaI"}},
+            {"id": "cr", "type": "crispr", "data": {"guideRNA": "TTGACAGCTAGCTCAGTCCT", "pam": "NGG"}},
+            {"id": "pcr", "type": "pcr", "data": {"forwardPrimer": "GGTCTC", "reversePrimer": "GAGACC"}},
+            {"id": "p1", "type": "sequence", "data": {"sequence": PROMOTER, "label": "Promoter"}},
+            {"id": "p2", "type": "sequence", "data": {"sequence": RBS, "label": "RBS+GFP"}},
+            {"id": "note", "type": "comment", "data": {"text": "ignored"}},
+            {"id": "orphan", "type": "pcr", "data": {}},
+        ],
+        "edges": [
+            {"source": "p1", "target": "pcr"},
+            {"source": "pcr", "target": "gg"},
+            {"source": "p2", "target": "gg"},
+            {"source": "p1", "target": "cr"},
+        ],
+    }
+
+def test_pipeline_matches_simulate_flow():
+    flow = _flow()
+    assert run_pipeline(flow) == simulate_flow(flow)
+
+def test_generated_code_has_no_graph_walking():
+    source = generate_pipeline(_flow())
+    assert "edges" not in source
+    assert "simulate_pcr(_DATA_" in source
+    assert "comment" not in source  # unknown node types are dropped at compile time
+
+def test_pipeline_cached_by_graph_hash():
+    flow = _flow()
+    moved = _flow()
+    moved["nodes"][0]["position"] = {"x": 10, "y": 20}  # editor-only change
+    assert graph_hash(flow) == graph_hash(moved)
+    assert load_pipeline(flow) is load_pipeline(moved)
+
+    changed = _flow()
+    changed["nodes"][2]["data"]["forwardPrimer"] = "GGAG"
+    assert load_pipeline(changed) is not load_pipeline(flow)
+
+def test_written_pipeline_is_importable(tmp_path):
+    flow = _flow()
+    path = write_pipeline(flow, tmp_path)
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    assert module.GRAPH_HASH == graph_hash(flow)
+    assert module.run() == simulate_flow(flow)
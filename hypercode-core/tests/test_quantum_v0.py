@@ -119,3 +119,125 @@ def test_evaluate_quantum_mock_backend() -> None:
         
         # Verify results stored
         assert evaluator.variables["MyCirc_results"] == mock_results
+
+def test_independent_circuits_are_submitted_as_one_batch() -> None:
+    """Several circuits run through a single execute_batch call; every module stays in the QIR."""
+    code = """
+    @quantum A qubits 1
+    H q0
+    MEASURE q0 -> c0
+    @end
+    @quantum B qubits 1
+    X q0
+    MEASURE q0 -> c0
+    @end
+    """
+    from unittest.mock import patch, MagicMock
+
+    with patch('hypercode.interpreter.evaluator.get_backend') as mock_get_backend:
+        mock_backend = MagicMock()
+        mock_backend.execute_batch.return_value = [{"0": 5, "1": 5}, {"1": 10}]
+        mock_get_backend.return_value = mock_backend
+
+        evaluator = Evaluator(use_quantum_sim=True, shots=10, seed=1)
+        evaluator.evaluate(parse(code))
+
+        mock_backend.execute.assert_not_called()
+        mock_backend.execute_batch.assert_called_once()
+        modules = mock_backend.execute_batch.call_args.args[0]
+        assert [m.name for m in modules] == ["A", "B"]
+        assert evaluator.variables["A_results"] == {"0": 5, "1": 5}
+        assert evaluator.variables["B_results"] == {"1": 10}
+        assert list(evaluator.qir.modules) == ["A", "B"]
+
+def test_results_lookup_flushes_pending_circuits() -> None:
+    """Reading <name>_results submits the circuits queued so far."""
+    code = """
+    @quantum A qubits 1
+    H q0
+    MEASURE q0 -> c0
+    @end
+    @print(A_results)
+    @quantum B qubits 1
+    X q0
+    MEASURE q0 -> c0
+    @end
+    """
+    from unittest.mock import patch, MagicMock
+
+    with patch('hypercode.interpreter.evaluator.get_backend') as mock_get_backend:
+        mock_backend = MagicMock()
+        mock_backend.execute.side_effect = [{"0": 1}, {"1": 1}]
+        mock_get_backend.return_value = mock_backend
+
+        evaluator = Evaluator(use_quantum_sim=True)
+        evaluator.evaluate(parse(code))
+
+        assert mock_backend.execute.call_count == 2
+        assert "{'0': 1}" in evaluator.output
+        assert evaluator.variables["B_results"] == {"1": 1}
+
+def test_batched_output_keeps_program_order() -> None:
+    """Batching does not move a circuit's results after later @print output."""
+    code = """
+    @quantum A qubits 1
+    H q0
+    MEASURE q0 -> c0
+    @end
+    @quantum B qubits 1
+    X q0
+    MEASURE q0 -> c0
+    @end
+    @print("after")
+    @quantum C qubits 1
+    MEASURE q0 -> c0
+    @end
+    """
+    from unittest.mock import patch, MagicMock
+
+    outputs = []
+    for batch in (True, False):
+        with patch('hypercode.interpreter.evaluator.get_backend') as mock_get_backend:
+            mock_backend = MagicMock()
+            mock_backend.execute.side_effect = lambda module, **kwargs: {module.name: 1}
+            mock_backend.execute_batch.side_effect = lambda modules, **kwargs: [{m.name: 1} for m in modules]
+            mock_get_backend.return_value = mock_backend
+
+            evaluator = Evaluator(use_quantum_sim=True, batch=batch)
+            evaluator.evaluate(parse(code))
+            outputs.append(evaluator.output)
+
+    assert outputs[0] == outputs[1] == [
+        "QuantumCircuit A: 1 qubits, 2 ops", "Results: A: 1",
+        "QuantumCircuit B: 1 qubits, 2 ops", "Results: B: 1",
+        "after",
+        "QuantumCircuit C: 1 qubits, 1 ops", "Results: C: 1",
+    ]
+
+def test_circuits_with_the_same_name_are_all_kept_in_qir() -> None:
+    """A redeclared circuit gets a suffixed QIR entry; <name>_results holds the latest run."""
+    code = """
+    @quantum A qubits 1
+    H q0
+    MEASURE q0 -> c0
+    @end
+    @quantum A qubits 1
+    X q0
+    MEASURE q0 -> c0
+    @end
+    """
+    from unittest.mock import patch, MagicMock
+    from hypercode.ir.binary import dumps_qir, loads_qir
+
+    with patch('hypercode.interpreter.evaluator.get_backend') as mock_get_backend:
+        mock_backend = MagicMock()
+        mock_backend.execute_batch.return_value = [{"0": 5, "1": 5}, {"1": 10}]
+        mock_get_backend.return_value = mock_backend
+
+        evaluator = Evaluator(use_quantum_sim=True, shots=10)
+        evaluator.evaluate(parse(code))
+
+    assert list(evaluator.qir.modules) == ["A", "A#2"]
+    assert evaluator.qir.modules["A#2"].instructions[1].name == "X"
+    assert evaluator.variables["A_results"] == {"1": 10}
+    assert list(loads_qir(dumps_qir(evaluator.qir)).modules) == ["A", "A#2"]
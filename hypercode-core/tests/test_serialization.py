@@ -0,0 +1,67 @@
+import gzip
+import json
+
+import pytest
+from hypercode.simulator import simulate_flow
+from hypercode.serialization import (
+    compact_results, expand_results, sequence_id, encode_response,
+    negotiate_media_type, JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, MIN_COMPRESS_BYTES,
+)
+
+PART = "GGTCTCA" + "AAAA" + "TTTT" * 300 + "AAAA" + "A" + "GAGACC"
+
+def _results():
+    flow = {
+        "nodes": [
+            {"id": "p1", "type": "sequence", "data": {"sequence": PART, "label": "Part"}},
+            {"id": "pcr1", "type": "pcr", "data": {}},
+            {"id": "gg", "type": "goldengate", "data": {"enzyme": "BsaI"}},
+        ],
+        "edges": [
+            {"source": "p1", "target": "pcr1"},
+            {"source": "pcr1", "target": "gg"},
+        ],
+    }
+    return simulate_flow(flow)
+
+def test_compact_deduplicates_sequences():
+    results = _results()
+    payload = compact_results(results)
+
+    # Source and pass-through PCR share one entry; the assembly and its only part share another
+    assert len(payload["sequences"]) == 2
+    gg = payload["results"]["gg"]
+    assert "sequence" not in gg and "assemblyResult" not in gg
+    assert gg["sequenceRef"] == gg["assemblyResultRef"] == gg["parts"][0]["seqRef"]
+    assert payload["results"]["p1"]["sequenceRef"] == sequence_id(PART)
+
+    assert len(json.dumps(payload)) < len(json.dumps(results)) / 2
+
+def test_compact_round_trip():
+    results = _results()
+    assert expand_results(compact_results(results)) == results
+
+def test_json_gzip_response():
+    payload = compact_results(_results())
+    body, media_type, encoding = encode_response(payload, accept="*/*", accept_encoding="gzip, deflate")
+    assert media_type == JSON_MEDIA_TYPE
+    assert len(json.dumps(payload)) >= MIN_COMPRESS_BYTES
+    assert encoding == "gzip"
+    assert json.loads(gzip.decompress(body)) == payload
+
+def test_small_bodies_stay_uncompressed():
+    body, _, encoding = encode_response({"ok": True}, accept_encoding="gzip")
+    assert encoding is None
+    assert json.loads(body) == {"ok": True}
+
+def test_accept_quality_ordering():
+    assert negotiate_media_type("application/cbor;q=0, application/json;q=0.5") == JSON_MEDIA_TYPE
+    assert negotiate_media_type(None) == JSON_MEDIA_TYPE
+
+def test_msgpack_response():
+    msgpack = pytest.importorskip("msgpack")
+    payload = compact_results(_results())
+    body, media_type, encoding = encode_response(payload, accept="application/x-msgpack")
+    assert media_type == MSGPACK_MEDIA_TYPE
+    assert encoding is None
+    assert msgpack.unpackb(body, raw=False) == payload
@@ -0,0 +1,64 @@
+import multiprocessing
+import pickle
+import random
+import pytest
+from hypercode.backends import BACKEND_REGISTRY
+from hypercode.backends.base import BaseBackend
+from hypercode.backends.sharding import ShardedBackend, derive_seed, merge_counts, split_shots
+from hypercode.ir.columnar import InstructionTable
+from hypercode.ir.binary import dumps_qir, loads_qir
+from hypercode.ir.qir_nodes import QIR, QModule, QAlloc, QGate, QMeasure, QEnd
+
+class SeededCoinBackend(BaseBackend):
+    """Measures three fair coins per shot using the given seed."""
+    def execute(self, ir_module, shots=1024, seed=None):
+        rng = random.Random(seed)
+        counts = {}
+        for _ in range(shots):
+            key = format(rng.getrandbits(3), "03b")
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+@pytest.fixture
+def coin_backend(monkeypatch):
+    monkeypatch.setitem(BACKEND_REGISTRY, "coin", SeededCoinBackend)
+    return "coin"
+
+MODULE = QModule("Coin", [QAlloc(0, 1), QGate("H", [0], []), QMeasure(0, "c0"), QEnd()])
+
+def test_split_shots():
+    assert split_shots(10, 3) == [4, 3, 3]
+    assert split_shots(2, 8) == [1, 1]
+    assert split_shots(0, 4) == []
+
+def test_derived_seeds_are_stable_and_distinct():
+    seeds = [derive_seed(42, i) for i in range(8)]
+    assert seeds == [derive_seed(42, i) for i in range(8)]
+    assert len(set(seeds)) == 8
+    assert seeds[0] != derive_seed(43, 0)
+
+def test_merge_counts():
+    assert merge_counts([{"0": 3, "1": 1}, {"1": 2}]) == {"0": 3, "1": 3}
+
+def test_sharded_run_is_reproducible(coin_backend):
+    backend = ShardedBackend(coin_backend, workers=1, shards=4)
+    counts = backend.execute(MODULE, shots=1000, seed=7)
+    assert sum(counts.values()) == 1000
+    assert counts == backend.execute(MODULE, shots=1000, seed=7)
+    assert counts != backend.execute(MODULE, shots=1000, seed=8)
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="registry patch needs fork")
+def test_worker_count_does_not_change_seeded_results(coin_backend):
+    inline = ShardedBackend(coin_backend, workers=1, shards=4).execute(MODULE, shots=1000, seed=7)
+    with ShardedBackend(coin_backend, workers=2, shards=4) as pooled:
+        assert pooled.execute(MODULE, shots=1000, seed=7) == inline
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="Unknown backend"):
+        ShardedBackend("nope")
+
+def test_mmap_loaded_tables_can_be_sent_to_workers():
+    qir = QIR()
+    qir.add_module(QModule("Coin", InstructionTable(MODULE.instructions)))
+    loaded = loads_qir(dumps_qir(qir)).modules["Coin"]
+    assert pickle.loads(pickle.dumps(loaded)) == MODULE
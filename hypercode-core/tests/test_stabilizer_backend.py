@@ -0,0 +1,66 @@
+import math
+
+import pytest
+
+from hypercode.backends import get_backend
+from hypercode.backends.stabilizer_backend import StabilizerBackend, is_clifford
+from hypercode.ir.lower_quantum import lower_circuit
+from hypercode.ir.qir_nodes import QAlloc, QEnd, QGate, QMeasure, QModule
+from hypercode.parser.parser import parse
+
+BELL = """
+@quantum Bell qubits 2
+H q0
+CX q0 q1
+MEASURE q0 -> c0
+MEASURE q1 -> c1
+@end
+"""
+
+def ghz(n: int) -> QModule:
+    instructions = [QAlloc(0, n), QGate("H", [0], [])]
+    instructions += [QGate("CX", [i, i + 1], []) for i in range(n - 1)]
+    instructions += [QMeasure(i, f"c{i}") for i in range(n)]
+    return QModule("GHZ", instructions + [QEnd()])
+
+def test_bell_pair_is_correlated():
+    module = lower_circuit(parse(BELL).statements[0])
+    assert is_clifford(module)
+    counts = get_backend("stabilizer").execute(module, shots=1000, seed=7)
+    assert set(counts) == {"00", "11"}
+    assert sum(counts.values()) == 1000
+    assert 400 < counts["00"] < 600
+    assert counts == StabilizerBackend().execute(module, shots=1000, seed=7)
+
+def test_deterministic_signs_and_clbit_order():
+    # Y.X = -iZ on |0>: q0 ends in |1>; RX(pi) flips q1; q2 stays |0>
+    module = QModule("Signs", [
+        QAlloc(0, 3),
+        QGate("X", [0], []), QGate("Y", [0], []), QGate("Y", [0], []),
+        QGate("RX", [1], [math.pi]),
+        QGate("H", [2], []), QGate("RZ", [2], [math.pi / 2]), QGate("RZ", [2], [-math.pi / 2]), QGate("H", [2], []),
+        QMeasure(2, "c"), QMeasure(1, "b"), QMeasure(0, "a"),
+        QEnd(),
+    ])
+    # Classical bit 0 (rightmost) is the first measured target, "c"
+    assert StabilizerBackend().execute(module, shots=10) == {"110": 10}
+
+def test_mid_circuit_measurement_collapses_state():
+    module = QModule("Mid", [
+        QAlloc(0, 2),
+        QGate("H", [0], []), QMeasure(0, "m"),
+        QGate("CX", [0, 1], []), QMeasure(1, "n"), QMeasure(0, "o"),
+        QEnd(),
+    ])
+    counts = StabilizerBackend().execute(module, shots=500, seed=3)
+    assert set(counts) == {"000", "111"}
+
+def test_handles_many_qubits():
+    counts = StabilizerBackend().execute(ghz(500), shots=200, seed=1)
+    assert set(counts) == {"0" * 500, "1" * 500}
+
+def test_non_clifford_circuits_fall_back():
+    module = QModule("T", [QAlloc(0, 1), QGate("RZ", [0], [0.3]), QMeasure(0, "c0"), QEnd()])
+    assert not is_clifford(module)
+    with pytest.raises(ValueError, match="not a Clifford circuit"):
+        StabilizerBackend(fallback=None).execute(module)
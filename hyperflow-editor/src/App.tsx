@@ -369,7 +369,7 @@ function App() {
       setSimulationResults(null);
       setIsCompilerOpen(true);
 
-      const response = await fetch('http://localhost:8000/compile', {
+      const response = await fetch('http://localhost:8000/run', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
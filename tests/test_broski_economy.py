@@ -0,0 +1,291 @@
+import asyncio
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from broski_economy import (
+    _MISSING, INSERT_TRANSACTION_AT, LEADERBOARDS, SCHEMA_VERSION, SELECT_EARNED_SINCE,
+    AsyncBroskiDB, BroskiDB, RecordCache, compute_reward, next_streak,
+)
+
+
+def test_connection_is_shared_and_in_wal_mode(tmp_path):
+    db = BroskiDB(str(tmp_path / "economy.db"))
+    conn = db.connect()
+    assert db.connect() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    db.close()
+
+def test_add_broski_updates_balance_and_audit_trail(tmp_path):
+    db = BroskiDB(str(tmp_path / "economy.db"))
+    user = db.get_user("123456")
+    assert user[:7] == ("123456", "User3456", 0, 0, 1, 0, 0)
+    db.add_broski("123456", 40, "Task completion: doc", "doc")
+    db.add_broski("123456", 10, "Task completion: code", "code")
+    assert db.get_user("123456")[2:4] == (50, 50)
+    rows = db.connect().execute("SELECT amount, task_type FROM transactions ORDER BY id").fetchall()
+    assert rows == [(40, "doc"), (10, "code")]
+
+def test_streaks_and_reward_multipliers():
+    now = datetime(2025, 1, 10, 12)
+    assert next_streak(None, now) == (1, 1)
+    assert next_streak(("u", 3, 5, now - timedelta(days=1)), now) == (4, 5)
+    assert next_streak(("u", 3, 5, now), now) == (3, 5)
+    assert next_streak(("u", 9, 9, now - timedelta(days=3)), now) == (1, 9)
+    final, breakdown = compute_reward(40, 2.0, "doc", 15)
+    assert final == 132  # 40 * 1.5 quality * 2.0 streak cap * 1.1 variety
+    assert breakdown["streak_mult"] == 2.0
+
+def test_async_facade_runs_on_one_db_thread(tmp_path):
+    economy = AsyncBroskiDB(str(tmp_path / "economy.db"))
+    threads = set()
+
+    def record(user_id):
+        threads.add(threading.get_ident())
+        return economy.db.get_user(user_id)
+
+    async def main():
+        await economy.init_db()
+        await asyncio.gather(*(economy.run(record, str(i)) for i in range(20)))
+        await asyncio.gather(*(economy.add_broski(str(i % 4), 5, "test") for i in range(40)))
+        return await economy.leaderboard("balance", 3)
+
+    top = asyncio.run(main())
+    economy.close()
+    assert threads and threading.get_ident() not in threads and len(threads) == 1
+    assert [value for _, _, value in top] == [50, 50, 50]
+
+def test_complete_task_is_one_atomic_reward(tmp_path):
+    db = BroskiDB(str(tmp_path / "economy.db"))
+    day = datetime(2025, 1, 10, 9)
+    assert db.complete_task("42", 40, 1.0, "doc", now=day)[0] == 44  # First login: no streak bonus
+    final, breakdown, streak = db.complete_task("42", 50, 1.0, "code", now=day + timedelta(days=1))
+    assert (final, breakdown["streak_mult"], streak) == (55, 1.1, 2)
+    assert db.get_user("42")[2:4] == (99, 99)
+    assert db.get_streak("42") == (2, 2)
+
+def test_concurrent_completes_lose_no_rewards(tmp_path):
+    path = str(tmp_path / "economy.db")
+    economy = AsyncBroskiDB(path)
+    others = [BroskiDB(path) for _ in range(4)]  # Separate connections race for the write lock
+    users = [str(1000 + i) for i in range(10)]
+    earned = []
+
+    def hammer(db, count):
+        for i in range(count):
+            earned.append(db.complete_task(users[i % len(users)], 30, 1.0, "community")[0])
+
+    async def main():
+        await economy.init_db()
+        loop = asyncio.get_running_loop()
+        workers = [loop.run_in_executor(None, hammer, db, 50) for db in others]
+        results = await asyncio.gather(*(economy.complete_task(users[i % len(users)], 50, 1.0, "code")
+                                         for i in range(300)))
+        await asyncio.gather(*workers)
+        return [final for final, _, _ in results]
+
+    earned += asyncio.run(main())
+    assert len(earned) == 500
+    conn = economy.db.connect()
+    assert conn.execute("SELECT SUM(broski_balance), SUM(task_count) FROM users").fetchone() == (sum(earned), 500)
+    assert conn.execute("SELECT COUNT(*), SUM(amount) FROM transactions").fetchone() == (500, sum(earned))
+    economy.close()
+    for db in others:
+        db.close()
+
+def test_write_behind_batches_rewards_and_reads_own_writes(tmp_path):
+    path = str(tmp_path / "economy.db")
+    db = BroskiDB(path, batch_rows=5, flush_interval=60)
+    for _ in range(3):
+        db.complete_task("7", 50, 1.0, "code")
+    observer = BroskiDB(path, cache_size=0)  # Sees only committed rows
+    assert observer.get_user("7")[2] == 0  # Nothing committed yet
+    assert db.get_user("7")[2:4] == (160, 160)  # 50, then 55 twice with a 1-day streak and db.get_user("7")[6] == 3
+    assert db.get_streak("7") == (1, 1)
+    db.add_broski("7", 10, "bonus")
+    db.add_broski("8", 10, "bonus")  # Fifth entry triggers a flush
+    assert observer.get_user("7")[2] == 170
+    assert observer.connect().execute("SELECT COUNT(*) FROM transactions").fetchone() == (5,)
+    db.complete_task("8", 30, 1.0, "community")
+    db.close()  # Durable on shutdown
+    assert observer.get_user("8")[2:4] == (43, 43)
+    assert observer.get_streak("8") == (1, 1)
+    assert not open(db.journal).read()
+    observer.close()
+
+def test_write_behind_journal_replays_after_crash(tmp_path):
+    path = str(tmp_path / "economy.db")
+    crashed = BroskiDB(path, batch_rows=100, flush_interval=60)
+    crashed.complete_task("9", 40, 1.0, "doc")
+    crashed.flush()
+    committed = open(crashed.journal).read()  # Empty: flushed entries leave the journal
+    crashed.complete_task("9", 40, 1.0, "doc")
+    crashed.add_broski("9", 5, "bonus")
+    journal = open(crashed.journal).read()
+    crashed._conn.close()  # Simulate a crash: no flush
+    assert committed == ""
+
+    # A committed entry still in the journal (crash before truncation) is not applied twice
+    with open(crashed.journal, "w") as f:
+        f.write('{"seq": 1, "user_id": "9", "amount": 44}\n' + journal + '{"seq": 99, "user')
+    recovered = BroskiDB(path, batch_rows=100, flush_interval=60)
+    assert recovered.get_user("9")[2] == 97  # 44 + 48 (streak 1) + 5
+    assert recovered.connect().execute("SELECT COUNT(*) FROM transactions").fetchone() == (3,)
+    recovered.close()
+
+def test_size_triggered_flush_leaves_rewards_buffered_while_locked(tmp_path):
+    path = str(tmp_path / "economy.db")
+    db = BroskiDB(path, timeout=0.05, batch_rows=2, flush_interval=60)
+    db.init_db()
+    writer = sqlite3.connect(path)
+    writer.execute("BEGIN IMMEDIATE")  # Another process holds the write lock
+    for _ in range(3):
+        db.add_broski("5", 10, "reward")  # The second and third fill the batch and retry the flush
+    assert len(db._buffer) == 3
+    writer.rollback()
+    writer.close()
+    assert db.get_user("5")[2] == 30
+    assert db.flush() == 3
+    db.close()
+    reopened = BroskiDB(path, batch_rows=2, flush_interval=60)
+    assert reopened.get_user("5")[2] == 30  # Paid once, not replayed again from the journal
+    reopened.close()
+
+def test_flusher_survives_unexpected_errors(tmp_path, monkeypatch, capsys):
+    db = BroskiDB(str(tmp_path / "economy.db"), batch_rows=100, flush_interval=0.01)
+    db.add_broski("6", 10, "reward")
+    flush, failures = db.flush, []
+
+    def failing_flush():
+        if not failures:
+            failures.append(1)
+            raise sqlite3.DatabaseError("database disk image is malformed")
+        return flush()
+
+    monkeypatch.setattr(db, "flush", failing_flush)
+    for _ in range(200):
+        if failures and not db._buffer:
+            break
+        threading.Event().wait(0.01)
+    assert failures and not db._buffer and db._flusher.is_alive()
+    assert "write-behind flush failed" in capsys.readouterr().err
+    db.close()
+
+def test_fairness_metrics_stay_incremental_and_match_scan(tmp_path):
+    path = str(tmp_path / "economy.db")
+    db = BroskiDB(path, batch_rows=7, flush_interval=60)
+    other = BroskiDB(path)
+    for i in range(40):
+        db.complete_task(str(100 + i % 9), 30 + i, 1.0, "code")
+        if i % 10 == 0:
+            other.add_broski(str(100 + i % 4), 500, "airdrop")  # Written behind db's back
+        assert db.get_fairness_metrics() == db.scan_fairness_metrics()
+    stats = db.economy_stats()
+    db.add_broski("100", -50, "refund")
+    assert db.economy_stats() is stats  # Own writes update it in place
+    assert db.get_fairness_metrics() == db.scan_fairness_metrics()
+    db.close()
+    other.close()
+
+def test_leaderboard_cache_rank_and_indexes(tmp_path):
+    path = str(tmp_path / "economy.db")
+    db = BroskiDB(path)
+    for i, amount in enumerate([30, 90, 60, 90, 10]):
+        db.add_broski(str(i), amount, "seed")
+        db.update_streak(str(i))
+    top = db.leaderboard("balance", 3)
+    assert [value for _, _, value in top] == [90, 90, 60]
+    assert db.leaderboard("balance", 3) is not top  # Slices of the cached rows
+    cached = db._leaderboards["balance"]
+    assert db.leaderboard("balance", 2) == top[:2] and db._leaderboards["balance"] is cached
+
+    db.add_broski("4", 100, "reward")  # The reward pipeline drops cached leaderboards
+    assert db.leaderboard("balance", 1)[0][0] == "4"
+    other = BroskiDB(path)
+    other.add_broski("0", 500, "reward")  # So does a write from another connection
+    assert db.leaderboard("balance", 1)[0][0] == "0"
+
+    assert [db.rank(str(i)) for i in range(5)] == [1, 3, 5, 3, 2]  # 530, 90, 60, 90, 110
+    assert db.rank("new-user") == 6
+    assert db.rank("1", "lifetime") == 3 and db.rank("1", "streak") == 1
+    plan = " ".join(row[-1] for row in db.connect().execute("EXPLAIN QUERY PLAN " + LEADERBOARDS["lifetime"], (10,)))
+    assert "idx_users_lifetime" in plan
+    db.close()
+    other.close()
+
+def test_legacy_database_migrates_in_place(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE users (id TEXT PRIMARY KEY, username TEXT, broski_balance INTEGER DEFAULT 0,
+            lifetime_earned INTEGER DEFAULT 0, level INTEGER DEFAULT 1, hyperfocus_hours FLOAT DEFAULT 0,
+            task_count INTEGER DEFAULT 0, created_at DATETIME DEFAULT CURRENT_TIMESTAMP);
+        CREATE TABLE transactions (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT, amount INTEGER,
+            reason TEXT, task_type TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP);
+        INSERT INTO users (id, username, broski_balance) VALUES ('1', 'Old', 75);
+    """)
+    conn.close()
+    db = BroskiDB(path)
+    assert db.connect().execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert db.get_user("1")[1:3] == ("Old", 75)
+    assert db.init_db() == SCHEMA_VERSION  # Idempotent
+    db.connect().execute("PRAGMA user_version = 99")
+    with pytest.raises(RuntimeError, match="schema version 99"):
+        db.init_db()
+    db.close()
+
+def test_archive_folds_old_transactions_into_summaries(tmp_path):
+    db = BroskiDB(str(tmp_path / "economy.db"))
+    conn = db.connect()
+    conn.executemany(INSERT_TRANSACTION_AT, [
+        ("1", 50, "old", "code", "2024-01-05 10:00:00"),
+        ("1", 30, "old", "code", "2024-01-20 10:00:00"),
+        ("1", 40, "old", "doc", "2024-02-01 10:00:00"),
+        ("2", 10, "new", "art", "2024-06-01 10:00:00"),
+    ])
+    now = datetime(2024, 6, 2)
+    assert db.earned_since("1", datetime(2024, 1, 10)) == 70
+    plan = " ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + SELECT_EARNED_SINCE, ("1", "")))
+    assert "COVERING INDEX idx_transactions_user_time" in plan
+    assert db.archive_transactions(older_than_days=90, now=now) == 3
+    assert db.archive_transactions(older_than_days=90, now=now) == 0
+    assert conn.execute("SELECT user_id, amount FROM transactions").fetchall() == [("2", 10)]
+    summaries = conn.execute("SELECT * FROM transaction_summaries ORDER BY period, task_type").fetchall()
+    assert summaries == [("1", "2024-01", "code", 2, 80), ("1", "2024-02", "doc", 1, 40)]
+    assert set(db.maintenance()) == {"pages_before", "pages_after"}
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0  # ANALYZE ran
+    db.close()
+
+def test_record_cache_lru_ttl_and_hit_rate():
+    cache = RecordCache(maxsize=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", None)
+    assert cache.get("b") is None and cache.get("a") == 1
+    cache.put("c", 3)  # Evicts "b", the least recently used
+    assert cache.get("b") is _MISSING
+    cache.update("a", lambda v: v + 1)
+    cache.update("b", lambda v: 0)  # Not cached: nothing to write through
+    assert cache.get("a") == 2 and len(cache) == 2
+    assert cache.stats() == {'size': 2, 'maxsize': 2, 'hits': 3, 'misses': 1, 'evictions': 1, 'hit_rate': 0.75}
+    expiring = RecordCache(ttl=0)
+    expiring.put("a", 1)
+    assert expiring.get("a") is _MISSING and len(expiring) == 0
+
+def test_user_and_streak_reads_hit_the_cache_with_write_through(tmp_path):
+    db = BroskiDB(str(tmp_path / "economy.db"))
+    db.get_user("5")
+    db.get_streak("5")
+    db.add_broski("5", 20, "bonus")
+    db.update_streak("5")
+    db.complete_task("5", 50, 1.0, "code")
+    queries = []
+    db.connect().set_trace_callback(queries.append)
+    assert db.get_user("5")[2:4] == (75, 75) and db.get_user("5")[6] == 2
+    assert db.get_streak("5") == (1, 1)
+    assert db.calculate_reward(50, 1.0, "code", "5")[0] == 55
+    assert queries == []  # Served from the cache, and still current
+    stats = db.cache_stats()
+    assert stats["users"]["hits"] == 2 and stats["streaks"]["hits"] >= 2
+    db.close()
@@ -0,0 +1,37 @@
+import asyncio
+
+from broski_loadtest import EmbedSink, FakeAuthor, FakeContext, LoadTestConfig, load_bot, main, percentile, run_load_test
+from broski_shards import ShardRouter
+
+
+def test_percentile_nearest_rank():
+    samples = [float(i) for i in range(1, 101)]
+    assert (percentile(samples, 50), percentile(samples, 95), percentile(samples, 99)) == (50.0, 95.0, 99.0)
+    assert percentile([], 99) == 0.0
+
+def test_fake_context_collects_bot_embeds(tmp_path):
+    bot = load_bot()
+    sink = EmbedSink()
+    ctx = FakeContext(FakeAuthor(1234, "tester"), sink)
+    callback = getattr(bot.stats, "callback", bot.stats)
+    previous = bot.router
+    bot.router = ShardRouter(database=str(tmp_path / "economy.db"))
+    try:
+        asyncio.run(callback(ctx))  # Empty economy
+    finally:
+        bot.router.close()
+        bot.router = previous
+    assert sink.count == 1 and sink.last.title == "📊 BROski$ Economy Stats"
+
+def test_load_test_reports_percentiles_and_contention():
+    report = run_load_test(LoadTestConfig(ops=300, concurrency=30, users=20, writers=1, seed=3))
+    assert report["messages"] == 300
+    assert sum(row["count"] for row in report["commands"].values()) == 300
+    for row in report["commands"].values():
+        assert row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"] <= row["max_ms"]
+    assert set(report["contention"]) >= {"lock_waits", "busy_waits", "busy_wait_s", "queue_wait_max_ms"}
+    assert main(["--ops", "50", "--mix", "complete=1", "--max-p99-ms", "100000", "--json"]) == 0
+
+def test_load_test_across_guild_shards():
+    report = run_load_test(LoadTestConfig(ops=200, concurrency=20, users=30, guilds=3, seed=4))
+    assert report["messages"] == 200 and report["contention"]["shards"] == 4  # 3 guilds + the default
@@ -0,0 +1,116 @@
+import asyncio
+import os
+import time
+
+from broski_economy import BroskiDB, fairness_from_balances
+from broski_shards import ShardRouter
+
+
+def test_guilds_get_their_own_databases(tmp_path):
+    router = ShardRouter(str(tmp_path / "shards"), str(tmp_path / "default.db"))
+    assert router.path_for(None) == str(tmp_path / "default.db")
+    unsharded = ShardRouter(database=str(tmp_path / "default.db"))
+    assert unsharded.path_for(1) == unsharded.path_for(2) == str(tmp_path / "default.db")
+
+    async def main():
+        guild_1, guild_2 = await router.shard(1), await router.shard(2)
+        assert guild_1 is await router.shard(1) and guild_1 is not guild_2
+        await guild_1.complete_task("42", 50, 1.0, "code")
+        await guild_2.add_broski("42", 7, "bonus")
+        return await guild_1.get_user("42"), await guild_2.get_user("42")
+
+    in_guild_1, in_guild_2 = asyncio.run(main())
+    assert (in_guild_1[2], in_guild_2[2]) == (50, 7)
+    assert router.guild_ids() == [1, 2]
+    router.close()
+    unsharded.close()
+
+def test_least_recently_used_shards_are_closed(tmp_path):
+    router = ShardRouter(str(tmp_path), str(tmp_path / "default.db"), max_open=2, batch_rows=100, flush_interval=60)
+
+    async def main():
+        for guild_id in range(5):
+            await (await router.shard(guild_id)).add_broski("1", guild_id + 1, "seed")
+
+    asyncio.run(main())
+    assert len(router.open_shards()) == 2
+    router.close()
+    reopened = ShardRouter(str(tmp_path), str(tmp_path / "default.db"))
+
+    async def balances():
+        return [(await (await reopened.shard(g)).get_user("1"))[2] for g in range(5)]
+
+    # Evicted shards flushed their write-behind rewards when they were closed
+    assert asyncio.run(balances()) == [1, 2, 3, 4, 5]
+    reopened.close()
+
+def test_reopening_waits_for_the_evicted_shard(tmp_path, monkeypatch):
+    close = BroskiDB.close
+
+    def slow_close(self):
+        time.sleep(0.05)
+        close(self)
+
+    monkeypatch.setattr(BroskiDB, "close", slow_close)
+    router = ShardRouter(str(tmp_path), str(tmp_path / "default.db"), max_open=1, batch_rows=100_000, flush_interval=60)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        for _ in range(20):
+            await (await router.shard(1)).add_broski("1", 10, "reward")
+            await (await router.shard(2)).get_user("1")  # Evicts guild 1 while its rewards are still journaled
+        user = await (await router.shard(1)).get_user("1")
+        ticking.cancel()
+        return user, ticks
+
+    user, ticks = asyncio.run(main())
+    assert user[2] == 200
+    assert ticks > 20  # The event loop kept running while evicted shards closed
+    router.close()
+    assert not os.path.getsize(str(tmp_path / "guild_1.db") + ".writebehind")
+    reopened = BroskiDB(str(tmp_path / "guild_1.db"))
+    assert reopened.get_user("1")[2] == 200
+    reopened.close()
+
+def test_default_shard_is_never_evicted(tmp_path):
+    router = ShardRouter(str(tmp_path), str(tmp_path / "default.db"), max_open=1)
+    default = router.default
+
+    async def main():
+        for guild_id in range(3):
+            await router.shard(guild_id)
+        assert await router.shard(None) is default
+        await default.init_db()
+
+    asyncio.run(main())
+    assert len(router.open_shards()) == 2
+    router.close()
+
+def test_cross_guild_aggregates(tmp_path):
+    router = ShardRouter(str(tmp_path / "shards"), str(tmp_path / "default.db"), batch_rows=50, flush_interval=60)
+    balances = {1: {"a": 10, "b": 40}, 2: {"a": 5, "c": 100}, None: {"d": 1, "a": 2}}
+
+    async def main():
+        for guild_id, users in balances.items():
+            for user_id, amount in users.items():
+                await (await router.shard(guild_id)).add_broski(user_id, amount, "seed")
+        # Buffered (write-behind) rewards are flushed before the scans
+        return (await router.global_stats(), await router.global_leaderboard("balance", 3),
+                await router.user_totals("a"), await router.global_totals())
+
+    stats, top, user_a, totals = asyncio.run(main())
+    expected = fairness_from_balances([b for users in balances.values() for b in users.values()])
+    assert stats == dict(expected, guilds=2)  # The default database is not a guild
+    assert [(guild, user, value) for guild, user, _, value in top] == [(2, "c", 100), (1, "b", 40), (1, "a", 10)]
+    assert user_a == {"broski_balance": 17, "lifetime_earned": 17, "task_count": 3, "guilds": 2}
+    assert totals == {None: (2, 3), 1: (2, 50), 2: (2, 105)}
+    router.close()
+    assert sorted(os.listdir(tmp_path / "shards"))[0] == "guild_1.db"
@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+from broski_economy import fairness_from_balances
+from broski_stats import EconomyStats, OrderStatisticTree
+
+
+def test_order_statistic_tree_matches_sorted_list():
+    rng = random.Random(5)
+    tree, values = OrderStatisticTree(seed=1), []
+    for _ in range(2000):
+        if values and rng.random() < 0.4:
+            value = rng.choice(values)
+            values.remove(value)
+            tree.remove(value)
+        else:
+            value = rng.randint(1, 50)
+            values.append(value)
+            tree.insert(value)
+    values.sort()
+    assert len(tree) == len(values) and tree.total == sum(values)
+    assert [tree.select(i) for i in range(len(values))] == values
+    for key in (0, 1, 25, 50, 51):
+        below = [v for v in values if v < key]
+        upto = [v for v in values if v <= key]
+        assert tree.prefix(key) == (len(below), sum(below))
+        assert tree.prefix(key, inclusive=True) == (len(upto), sum(upto))
+    with pytest.raises(KeyError):
+        tree.remove(1000)
+
+def test_economy_stats_match_full_scan_oracle():
+    rng = random.Random(11)
+    stats, balances = EconomyStats(), {}
+    assert stats.metrics() == fairness_from_balances([])
+    for _ in range(3000):
+        user_id = str(rng.randint(1, 60))
+        delta = rng.choice([-40, -5, 10, 33, 44, 55, 100])
+        balances[user_id] = balances.get(user_id, 0) + delta
+        stats.apply(user_id, delta)
+        assert stats.metrics() == fairness_from_balances([b for b in balances.values() if b > 0])